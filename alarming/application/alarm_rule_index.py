@@ -0,0 +1,156 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, ContextManager, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from alarming.domain.model.aggregate import AlarmDefinition
+from alarming.domain.model.alarm_state import AlarmStateTracker, AlarmTransition
+from alarming.domain.model.rolling_window import SeriesWindows
+from alarming.domain.model.value_object import AlarmTypeBase, AlarmTypeFactory
+from alarming.infra.repository import AlarmDefinitionRepository
+
+
+@dataclass(frozen=True)
+class AlarmRule:
+    definition: AlarmDefinition
+    evaluator: AlarmTypeBase
+
+
+@dataclass(frozen=True)
+class TriggeredAlarm:
+    definition: AlarmDefinition
+    measure_value: float
+
+
+@dataclass(frozen=True)
+class AlarmEvaluation:
+    raised: List[TriggeredAlarm]
+    cleared: List[TriggeredAlarm]
+
+
+class AlarmRuleSet:
+    """
+    Immutable snapshot of the enabled rules: by series for single lookups, and as
+    arrays (series, raise and clear thresholds) grouped by alarm type for a whole
+    poll cycle at once.
+    """
+
+    def __init__(self, rules: List[AlarmRule]):
+        self.by_series: Dict[Tuple[str, str], List[AlarmRule]] = {}
+        for rule in rules:
+            self.by_series.setdefault(_series_key(rule.definition.measure_type, rule.definition.measure_detail), []).append(rule)
+
+        grouped: Dict[str, List[AlarmRule]] = defaultdict(list)
+        for rule in rules:
+            grouped[_key(rule.definition.alarm_type)].append(rule)
+        # Un evaluador por tipo de alarma, con todos sus umbrales en arrays
+        self._groups = []
+        for group in grouped.values():
+            evaluator = group[0].evaluator
+            thresholds = np.array([r.definition.config_value for r in group], dtype=float)
+            bands = np.array([r.definition.hysteresis or 0.0 for r in group], dtype=float)
+            self._groups.append((
+                evaluator,
+                group,
+                [_series_key(r.definition.measure_type, r.definition.measure_detail) for r in group],
+                thresholds,
+                evaluator.clear_threshold(thresholds, bands),
+            ))
+
+    @property
+    def sound_paths(self) -> List[str]:
+        return sorted({rule.definition.sound_path for rules in self.by_series.values() for rule in rules if rule.definition.sound_path})
+
+    def evaluate(
+            self,
+            measure_history: SeriesWindows,
+            series: Iterable[Tuple[str, Optional[str]]],
+            states: AlarmStateTracker,
+            now: float
+        ) -> AlarmEvaluation:
+        """
+        Rules of the series read in this cycle (`series`) checked against their windows;
+        only raise/clear transitions of `states` are returned.
+        """
+        read = {_series_key(measure_type, detail) for measure_type, detail in series}
+        raised, cleared = [], []
+        for evaluator, rules, keys, thresholds, clear_thresholds in self._groups:
+            windows = [measure_history.get(*key) if key in read else None for key in keys]
+            if not any(windows):
+                continue
+            stats = np.array(
+                [(w.last, w.min, w.max) if w else (np.nan, np.nan, np.nan) for w in windows],
+                dtype=float
+            )
+            last, low, high = stats[:, 0], stats[:, 1], stats[:, 2]
+            raising = evaluator.check_many(thresholds, last, low, high)
+            holding = evaluator.check_many(clear_thresholds, last, low, high)
+            # Sin ventana (serie no leida) su estado no cambia
+            for i in np.flatnonzero(~np.isnan(last)):
+                definition = rules[i].definition
+                transition = states.transition(definition, raising=bool(raising[i]), holding=bool(holding[i]), now=now)
+                if transition is AlarmTransition.RAISED:
+                    raised.append(TriggeredAlarm(definition=definition, measure_value=float(last[i])))
+                elif transition is AlarmTransition.CLEARED:
+                    cleared.append(TriggeredAlarm(definition=definition, measure_value=float(last[i])))
+        return AlarmEvaluation(raised=raised, cleared=cleared)
+
+
+class AlarmRuleIndex:
+    """
+    Enabled alarm definitions by (measure_type, detail) with their evaluators already
+    built. The definition commands rebuild it after each commit, so the worker never
+    reads alarm_definitions while polling.
+    """
+
+    def __init__(self, repo: AlarmDefinitionRepository, db_session: Callable[[], ContextManager[Session]]):
+        self.repo = repo
+        self.db_session = db_session
+        self._rule_set: Optional[AlarmRuleSet] = None
+        self._lock = Lock()
+
+    def get_rules(self, measure_type: str, detail: Optional[str]) -> List[AlarmRule]:
+        return self.get_rule_set().by_series.get(_series_key(measure_type, detail), [])
+
+    def get_rule_set(self) -> AlarmRuleSet:
+        rule_set = self._rule_set
+        if rule_set is not None:
+            return rule_set
+
+        with self._lock:
+            if self._rule_set is None:
+                self._rule_set = self._load()
+            return self._rule_set
+
+    def refresh(self):
+        # Se construye aparte y se reemplaza de una vez: los lectores ven el indice viejo o el nuevo
+        rule_set = self._load()
+        with self._lock:
+            self._rule_set = rule_set
+
+    def _load(self) -> AlarmRuleSet:
+        with self.db_session() as session:
+            definitions = self.repo.get_all(session=session).order_by(AlarmDefinition.id).all()
+
+        # Una instancia de evaluador por tipo: no guardan estado
+        evaluators: Dict[str, AlarmTypeBase] = {}
+        rules = []
+        for definition in definitions:
+            if not definition.enabled:
+                continue
+            alarm_type = _key(definition.alarm_type)
+            if alarm_type not in evaluators:
+                evaluators[alarm_type] = AlarmTypeFactory.get_alarm(alarm_type=definition.alarm_type)
+            rules.append(AlarmRule(definition=definition, evaluator=evaluators[alarm_type]))
+        return AlarmRuleSet(rules)
+
+
+def _key(value) -> str:
+    return getattr(value, "value", value)
+
+
+def _series_key(measure_type, detail: Optional[str]) -> Tuple[str, str]:
+    return _key(measure_type), detail or ""
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Callable, ContextManager
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from alarming.domain.model.aggregate import AlarmBacktest, AlarmDefinition
+from alarming.domain.model.backtest import replay
+from alarming.domain.model.services import BacktestAlarmRequest
+from alarming.domain.model.value_object import AlarmTypeFactory
+from alarming.infra.repository import AlarmDefinitionRepository
+from measurement.infra.repository import MeasurementRepository
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class AlarmBacktestUseCase:
+    """
+    Replays stored measures through an alarm rule without writing anything: same
+    evaluators, hysteresis and cooldown as the worker, over one continuous window.
+    """
+
+    def __init__(
+            self,
+            repo: AlarmDefinitionRepository,
+            measurement_repo: MeasurementRepository,
+            db_session: Callable[[], ContextManager[Session]],
+            window_size: int = 500
+        ):
+        self.repo = repo
+        self.measurement_repo = measurement_repo
+        self.db_session = db_session
+        self.window_size = window_size
+
+    def execute(self, request: BacktestAlarmRequest) -> AlarmBacktest:
+        with self.db_session() as session:
+            definition = self._resolve(request, session)
+            timestamps, values = self._load(session, request, definition)
+
+        window = request.window or self.window_size
+        result = replay(
+            evaluator=AlarmTypeFactory.get_alarm(alarm_type=definition["alarm_type"]),
+            config_value=definition["config_value"],
+            hysteresis=definition["hysteresis"],
+            cooldown=definition["cooldown"] * 1000,
+            timestamps=timestamps,
+            values=values,
+            window=window
+        )
+        shown = result.trigger_indexes[:request.max_triggers]
+        return AlarmBacktest(
+            **definition,
+            window=window,
+            samples=result.samples,
+            triggers=result.triggers,
+            clears=result.clears,
+            trigger_times=[_EPOCH + timedelta(milliseconds=int(ms)) for ms in timestamps[shown]],
+            trigger_values=values[shown].tolist()
+        )
+
+    def _resolve(self, request: BacktestAlarmRequest, session: Session) -> dict:
+        stored: AlarmDefinition = None
+        if request.id is not None:
+            stored = self.repo.get_by_id(session=session, entity_id=request.id)
+            if not stored:
+                raise ValueError("Alarm definition not found")
+
+        def pick(name: str, stored_name: str, default=None):
+            value = getattr(request, name)
+            if value is None and stored is not None:
+                value = getattr(stored, stored_name)
+            return default if value is None else value
+
+        definition = dict(
+            measure_type=pick("measure_type", "measure_type"),
+            measure_detail=pick("measure_detail", "measure_detail", ""),
+            alarm_type=pick("alarm_type", "alarm_type"),
+            config_value=pick("config_value", "config_value"),
+            hysteresis=pick("hysteresis", "hysteresis", 0.0),
+            cooldown=pick("cooldown", "cooldown", 0),
+        )
+        missing = [name for name in ("measure_type", "alarm_type", "config_value") if definition[name] is None]
+        if missing:
+            raise ValueError(f"Missing {', '.join(missing)} (or an alarm definition id)")
+        return definition
+
+    def _load(self, session: Session, request: BacktestAlarmRequest, definition: dict):
+        # fromiter sobre las tuplas planas: np.asarray con Rows es cien veces mas lento
+        batches = [
+            np.fromiter(chain.from_iterable(batch), dtype=float, count=2 * len(batch)).reshape(-1, 2)
+            for batch in self.measurement_repo.stream_epoch_values(
+                session=session,
+                measure_type=definition["measure_type"],
+                detail=definition["measure_detail"],
+                start_date=request.start_date,
+                end_date=request.end_date
+            )
+        ]
+        rows = np.concatenate(batches) if batches else np.empty((0, 2))
+        # Los milisegundos desde 1970 entran exactos en un float64
+        return rows[:, 0].astype(np.int64), rows[:, 1]
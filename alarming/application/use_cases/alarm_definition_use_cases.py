@@ -2,6 +2,7 @@ from typing import Callable, ContextManager, List
 
 from sqlalchemy.orm import Session
 
+from alarming.application.alarm_rule_index import AlarmRule, AlarmRuleIndex, AlarmRuleSet
 from alarming.domain.model.aggregate import  AlarmDefinition
 from alarming.domain.model.services import (
     AlarmDefinitionService,
@@ -11,13 +12,25 @@ from alarming.domain.model.services import (
 )
 from alarming.infra.repository import AlarmDefinitionRepository
 from measurement.domain.model.value_object import MeasureType
+from shared_kernel.infra.revision import Revision
 
 
 class AlarmDefinitionQueryUseCase:
-    def __init__(self, repo: AlarmDefinitionRepository, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(
+            self,
+            repo: AlarmDefinitionRepository,
+            revision: Revision,
+            rule_index: AlarmRuleIndex,
+            db_session: Callable[[], ContextManager[Session]]
+        ):
         self.repo = repo
+        self.revision = revision
+        self.rule_index = rule_index
         self.db_session = db_session
 
+    def get_revision(self) -> int:
+        return self.revision.value
+
     def get_alarms_definition(self) -> List[AlarmDefinition]:
         with self.db_session() as session:
             alarms_def: List[AlarmDefinition] = list(
@@ -40,37 +53,74 @@ class AlarmDefinitionQueryUseCase:
             )
             return alarms_def
 
+    def get_alarm_rules(self, measure_type: MeasureType, measure_detail: str) -> List[AlarmRule]:
+        # Desde memoria: solo definiciones habilitadas, con su evaluador ya creado
+        return self.rule_index.get_rules(measure_type=measure_type, detail=measure_detail)
+
+    def get_alarm_rule_set(self) -> AlarmRuleSet:
+        return self.rule_index.get_rule_set()
+
 
 class CreateAlarmDefinitionCommand:
-    def __init__(self, service: AlarmDefinitionService, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(
+            self,
+            service: AlarmDefinitionService,
+            revision: Revision,
+            rule_index: AlarmRuleIndex,
+            db_session: Callable[[], ContextManager[Session]]
+        ):
         self.service = service
+        self.revision = revision
+        self.rule_index = rule_index
         self.db_session = db_session
 
     def execute(self, request: RegisterAlarmDefinitionRequest) -> AlarmDefinition:
         with self.db_session() as session:
             alarm_definition = self.service.create_alarm_definition(request, session)
             session.commit()
-            return alarm_definition
+        self.rule_index.refresh()
+        self.revision.bump()
+        return alarm_definition
 
 
 class UpdateAlarmDefinitionCommand:
-    def __init__(self, service: AlarmDefinitionService, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(
+            self,
+            service: AlarmDefinitionService,
+            revision: Revision,
+            rule_index: AlarmRuleIndex,
+            db_session: Callable[[], ContextManager[Session]]
+        ):
         self.service = service
+        self.revision = revision
+        self.rule_index = rule_index
         self.db_session = db_session
 
     def execute(self, request: UpdateAlarmDefinitionRequest) -> AlarmDefinition:
         with self.db_session() as session:
             alarm_definition = self.service.update_alarm_definition(request, session)
             session.commit()
-            return alarm_definition
+        self.rule_index.refresh()
+        self.revision.bump()
+        return alarm_definition
 
 
 class DeleteAlarmDefinitionCommand:
-    def __init__(self, service: AlarmDefinitionService, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(
+            self,
+            service: AlarmDefinitionService,
+            revision: Revision,
+            rule_index: AlarmRuleIndex,
+            db_session: Callable[[], ContextManager[Session]]
+        ):
         self.service = service
+        self.revision = revision
+        self.rule_index = rule_index
         self.db_session = db_session
 
     def execute(self, request: GetAlarmDefinitionRequest) -> None:
         with self.db_session() as session:
             self.service.delete_alarm_definition(request, session)
             session.commit()
+        self.rule_index.refresh()
+        self.revision.bump()
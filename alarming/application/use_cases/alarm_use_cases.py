@@ -1,15 +1,19 @@
-from typing import Callable, ContextManager, List
+from datetime import datetime
+from typing import Callable, ContextManager, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
-from alarming.domain.model.aggregate import Alarm, AlarmDefinition
+from alarming.domain.model.aggregate import Alarm, AlarmCount, AlarmDefinition
 from alarming.domain.model.services import (
     AlarmDefinitionService, AlarmService,
     # Requests
     RegisterAlarmDefinitionRequest, RegisterAlarmRequest,
+    GetAlarmHistoryRequest, GetAlarmCountRequest,
     UpdateAlarmDefinitionRequest, GetAlarmDefinitionRequest,
 )
 from alarming.infra.repository import AlarmRepository
+from shared_kernel.infra.database.connection import after_commit
+from shared_kernel.infra.live_feed import LiveFeed
 
 
 class AlarmQueryUseCase:
@@ -29,17 +33,81 @@ class AlarmQueryUseCase:
             alarms: List[Alarm] = session.query(Alarm).order_by(Alarm.created_at.desc()).limit(n).all()
             return alarms
 
+    def get_alarm_history(self, request: GetAlarmHistoryRequest) -> Tuple[List[Alarm], Optional[Tuple[datetime, int]]]:
+        with self.db_session() as session:
+            alarms: List[Alarm] = self.repo.find_page(
+                session=session,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                measure_type=request.measure_type,
+                alarm_type=request.alarm_type,
+                limit=request.limit + 1,
+                before=request.before
+            )
+        # Se pide una fila extra solo para saber si existe una pagina siguiente
+        if len(alarms) <= request.limit:
+            return alarms, None
+        page = alarms[:request.limit]
+        return page, (page[-1].created_at, page[-1].id)
+
+    def count_alarms(self, request: GetAlarmCountRequest) -> List[AlarmCount]:
+        with self.db_session() as session:
+            rows = self.repo.count_by_bucket(
+                session=session,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                bucket=request.bucket,
+                measure_type=request.measure_type,
+                alarm_type=request.alarm_type
+            )
+        return [
+            AlarmCount(bucket=datetime.fromisoformat(row.bucket), alarm_type=row.alarm_type, count=row.count)
+            for row in rows
+        ]
+
 
 class CreateAlarmCommand:
-    def __init__(self, service: AlarmService, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(self, service: AlarmService, feed: LiveFeed, db_session: Callable[[], ContextManager[Session]]):
         self.service = service
+        self.feed = feed
         self.db_session = db_session
 
     def execute(self, request: RegisterAlarmRequest) -> Alarm:
         with self.db_session() as session:
             alarm = self.service.create_alarm(request, session)
             session.commit()
-            return alarm
+        after_commit(lambda: publish_alarms(self.feed, [alarm]))
+        return alarm
+
+
+class CreateAlarmListCommand:
+    def __init__(self, service: AlarmService, feed: LiveFeed, db_session: Callable[[], ContextManager[Session]]):
+        self.service = service
+        self.feed = feed
+        self.db_session = db_session
+
+    def execute(self, requests: List[RegisterAlarmRequest]) -> List[Alarm]:
+        if not requests:
+            return []
+        # Todas las alarmas del ciclo en una sola transaccion
+        with self.db_session() as session:
+            alarms = self.service.create_alarms(requests, session)
+            session.commit()
+        # Con una unidad de trabajo abierta se publican cuando el ciclo confirma
+        after_commit(lambda: publish_alarms(self.feed, alarms))
+        return alarms
+
+
+def publish_alarms(feed: LiveFeed, alarms: List[Alarm]):
+    for alarm in alarms:
+        feed.publish("alarm", alarm.measure_type, None, {
+            "id": alarm.id,
+            "measure_type": alarm.measure_type,
+            "alarm_type": alarm.alarm_type,
+            "measure_value": alarm.measure_value,
+            "config_value": alarm.config_value,
+            "created_at": alarm.created_at.isoformat(),
+        })
 
 
 class CreateAlarmDefinitionCommand:
@@ -4,6 +4,7 @@ from alarming.domain.model.value_object import AlarmType
 from measurement.domain.model.value_object import MeasureType
 from dataclasses import dataclass
 from datetime import datetime
+from typing import List, Optional
 
 dataclass(eq=False)
 class AlarmDefinition(AggregateRoot):
@@ -13,6 +14,8 @@ class AlarmDefinition(AggregateRoot):
     created_at: datetime
     updated_at: datetime
     enabled: bool
+    hysteresis: float
+    cooldown: int
     # TODO: We are referencing value objects from another context (Measurement)
     measure_type: MeasureType
     measure_detail: str
@@ -27,6 +30,8 @@ class AlarmDefinition(AggregateRoot):
         measure_type: str,
         measure_detail: str,
         alarm_type: str,
+        hysteresis: float = 0.0,
+        cooldown: int = 0,
     ) -> AlarmDefinition:
         # Action
         return cls(
@@ -36,7 +41,9 @@ class AlarmDefinition(AggregateRoot):
             measure_detail=measure_detail,
             alarm_type= AlarmType(alarm_type),
             created_at= datetime.now(),
-            enabled = True
+            enabled = True,
+            hysteresis = hysteresis,
+            cooldown = cooldown
         )
 
     def update(
@@ -44,13 +51,19 @@ class AlarmDefinition(AggregateRoot):
             config_value: float,
             alarm_type: str,
             sound_path: str,
-            enabled: bool
+            enabled: bool,
+            hysteresis: Optional[float] = None,
+            cooldown: Optional[int] = None
         ) -> None:
         self.config_value = config_value
         self.alarm_type = alarm_type
         self.sound_path = sound_path
         self.updated_at = datetime.now()
         self.enabled = enabled
+        if hysteresis is not None:
+            self.hysteresis = hysteresis
+        if cooldown is not None:
+            self.cooldown = cooldown
 
 
 dataclass(eq=False)
@@ -79,4 +92,27 @@ class Alarm(AggregateRoot):
             measure_type = MeasureType(measure_type),
             alarm_type= AlarmType(alarm_type),
             created_at= datetime.now()
-        )
\ No newline at end of file
+        )
+
+
+@dataclass(frozen=True)
+class AlarmCount:
+    bucket: datetime
+    alarm_type: AlarmType
+    count: int
+
+
+@dataclass(frozen=True)
+class AlarmBacktest:
+    measure_type: MeasureType
+    measure_detail: str
+    alarm_type: AlarmType
+    config_value: float
+    hysteresis: float
+    cooldown: int
+    window: int
+    samples: int
+    triggers: int
+    clears: int
+    trigger_times: List[datetime]
+    trigger_values: List[float]
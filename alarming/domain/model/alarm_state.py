@@ -0,0 +1,47 @@
+import enum
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional
+
+from alarming.domain.model.aggregate import AlarmDefinition
+
+
+class AlarmTransition(str, enum.Enum):
+    RAISED = "RAISED"
+    CLEARED = "CLEARED"
+
+
+@dataclass
+class AlarmState:
+    active: bool = False
+    raised_at: Optional[float] = None
+
+
+class AlarmStateTracker:
+    """
+    Active/cleared state of each alarm definition (one series per definition).
+    An alarm raises once, stays active while its value is still past the threshold
+    relaxed by the hysteresis band, and cannot raise again until `cooldown` seconds
+    after the previous raise. Only transitions are reported.
+    """
+
+    def __init__(self):
+        self._states: Dict[int, AlarmState] = {}
+        self._lock = Lock()
+
+    def transition(self, definition: AlarmDefinition, raising: bool, holding: bool, now: float) -> Optional[AlarmTransition]:
+        with self._lock:
+            state = self._states.setdefault(definition.id, AlarmState())
+            if state.active:
+                if holding:
+                    return None
+                state.active = False
+                return AlarmTransition.CLEARED
+
+            if not raising:
+                return None
+            if state.raised_at is not None and now - state.raised_at < (definition.cooldown or 0):
+                return None
+            state.active = True
+            state.raised_at = now
+            return AlarmTransition.RAISED
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from alarming.domain.model.value_object import AlarmTypeBase
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    samples: int
+    triggers: int
+    clears: int
+    # Posiciones (en la serie recorrida) de cada disparo
+    trigger_indexes: np.ndarray
+
+
+def rolling_min_max(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Min and max of the last `window` values ending at each position (fewer at the
+    start), in O(n) with the van Herk/Gil-Werman block prefix/suffix scans.
+    """
+    n = len(values)
+    if n == 0:
+        return values.copy(), values.copy()
+    window = max(1, min(window, n))
+
+    # Repetir el primer valor no cambia el min/max de las ventanas incompletas
+    padded = np.concatenate([np.full(window - 1, values[0]), values])
+    blocks = -(-len(padded) // window)
+    tail = np.full(blocks * window - len(padded), padded[-1])
+    grid = np.concatenate([padded, tail]).reshape(blocks, window)
+
+    def scan(ufunc) -> np.ndarray:
+        prefix = ufunc.accumulate(grid, axis=1).ravel()
+        suffix = ufunc.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+        return ufunc(suffix[:n], prefix[window - 1:window - 1 + n])
+
+    return scan(np.minimum), scan(np.maximum)
+
+
+def replay(
+        evaluator: AlarmTypeBase,
+        config_value: float,
+        hysteresis: float,
+        cooldown: float,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        window: int
+    ) -> BacktestResult:
+    """
+    Runs one series through `evaluator` the way the worker does (rolling window,
+    hysteresis band, cooldown in the units of `timestamps`) and returns the raises.
+    """
+    n = len(values)
+    if n == 0:
+        return BacktestResult(samples=0, triggers=0, clears=0, trigger_indexes=np.empty(0, dtype=np.int64))
+
+    low, high = rolling_min_max(values, window)
+    raising = evaluator.check_many(config_value, values, low, high)
+    holding = evaluator.check_many(evaluator.clear_threshold(config_value, hysteresis), values, low, high)
+
+    # Enclavamiento: activa desde un disparo hasta que deja la banda de histeresis.
+    # Un disparo siempre cae dentro de la banda, asi que nunca coinciden ambos eventos.
+    positions = np.arange(n)
+    last_raise = np.maximum.accumulate(np.where(raising, positions, -1))
+    last_clear = np.maximum.accumulate(np.where(~holding, positions, -1))
+    active = last_raise > last_clear
+    previous = np.concatenate([[False], active[:-1]])
+    starts = np.flatnonzero(active & ~previous)
+    ends = np.flatnonzero(~active & previous)
+
+    if not cooldown:
+        return BacktestResult(samples=n, triggers=len(starts), clears=len(ends), trigger_indexes=starts)
+
+    # Con cooldown un episodio puede disparar mas tarde o no disparar: se recorren los episodios
+    ends = np.concatenate([ends, np.full(len(starts) - len(ends), n)])
+    raising_positions = np.flatnonzero(raising)
+    triggers: List[int] = []
+    clears = 0
+    for start, end in zip(starts, ends):
+        if triggers and timestamps[start] - timestamps[triggers[-1]] < cooldown:
+            candidates = raising_positions[np.searchsorted(raising_positions, start):np.searchsorted(raising_positions, end)]
+            allowed = np.searchsorted(timestamps[candidates], timestamps[triggers[-1]] + cooldown)
+            if allowed == len(candidates):
+                continue
+            start = candidates[allowed]
+        triggers.append(int(start))
+        clears += int(end < n)
+    return BacktestResult(samples=n, triggers=len(triggers), clears=clears, trigger_indexes=np.array(triggers, dtype=np.int64))
@@ -0,0 +1,101 @@
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+class RollingWindow:
+    """
+    Last `size` values of one series with min/max (monotonic queues) and
+    mean/variance (Welford) kept up to date on each push, all in O(1) amortized.
+    """
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("Window size must be at least 1")
+        self.size = size
+        self._values: Deque[float] = deque()
+        # Candidatos a minimo (crecientes) y a maximo (decrecientes)
+        self._min: Deque[float] = deque()
+        self._max: Deque[float] = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def push(self, value: float):
+        if len(self._values) == self.size:
+            self._evict(self._values.popleft())
+
+        self._values.append(value)
+        while self._min and self._min[-1] > value:
+            self._min.pop()
+        self._min.append(value)
+        while self._max and self._max[-1] < value:
+            self._max.pop()
+        self._max.append(value)
+
+        delta = value - self._mean
+        self._mean += delta / len(self._values)
+        self._m2 += delta * (value - self._mean)
+
+    @property
+    def last(self) -> Optional[float]:
+        return self._values[-1] if self._values else None
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._min[0] if self._min else None
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max[0] if self._max else None
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._mean if self._values else None
+
+    @property
+    def variance(self) -> Optional[float]:
+        # Poblacional; el redondeo puede dejar un negativo minusculo
+        return max(self._m2 / len(self._values), 0.0) if self._values else None
+
+    @property
+    def std(self) -> Optional[float]:
+        variance = self.variance
+        return variance ** 0.5 if variance is not None else None
+
+    def _evict(self, value: float):
+        if self._min[0] == value:
+            self._min.popleft()
+        if self._max[0] == value:
+            self._max.popleft()
+
+        count = len(self._values)
+        if count == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / count
+        self._m2 -= delta * (value - self._mean)
+
+
+class SeriesWindows:
+    """
+    One RollingWindow per (measure_type, detail), created on first push.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._windows: Dict[Tuple[str, str], RollingWindow] = {}
+
+    def push(self, measure_type, detail: Optional[str], value: float) -> RollingWindow:
+        key = (str(getattr(measure_type, "value", measure_type)), detail or "")
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = RollingWindow(self.size)
+        window.push(value)
+        return window
+
+    def get(self, measure_type, detail: Optional[str]) -> Optional[RollingWindow]:
+        return self._windows.get((str(getattr(measure_type, "value", measure_type)), detail or ""))
@@ -1,6 +1,9 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
 from sqlalchemy.orm import Session
 
-from alarming.domain.model.value_object import AlarmType
+from alarming.domain.model.value_object import AlarmCountBucket, AlarmType
 from measurement.domain.model.value_object import MeasureType
 
 from alarming.domain.model.aggregate import Alarm, AlarmDefinition
@@ -14,12 +17,47 @@ class RegisterAlarmRequest(BaseModel):
     measure_type: MeasureType
 
 
+class GetAlarmHistoryRequest(BaseModel):
+    start_date: datetime
+    end_date: datetime
+    measure_type: Optional[MeasureType] = None
+    alarm_type: Optional[AlarmType] = None
+    limit: int = 100
+    # (created_at, id) de la ultima alarma de la pagina anterior
+    before: Optional[Tuple[datetime, int]] = None
+
+
+class BacktestAlarmRequest(BaseModel):
+    start_date: datetime
+    end_date: datetime
+    # Una definicion existente, o la regla completa; lo indicado reemplaza a lo de la definicion
+    id: Optional[int] = None
+    measure_type: Optional[MeasureType] = None
+    measure_detail: Optional[str] = None
+    alarm_type: Optional[AlarmType] = None
+    config_value: Optional[float] = None
+    hysteresis: Optional[float] = None
+    cooldown: Optional[int] = None
+    window: Optional[int] = None
+    max_triggers: int = 1000
+
+
+class GetAlarmCountRequest(BaseModel):
+    start_date: datetime
+    end_date: datetime
+    bucket: AlarmCountBucket = AlarmCountBucket.HOUR
+    measure_type: Optional[MeasureType] = None
+    alarm_type: Optional[AlarmType] = None
+
+
 class UpdateAlarmDefinitionRequest(BaseModel):
     id: int
     new_value: float
     new_alarm_type: AlarmType
     new_sound_path: str
     enabled: bool
+    new_hysteresis: Optional[float] = None
+    new_cooldown: Optional[int] = None
 
 
 class GetAlarmDefinitionRequest(BaseModel):
@@ -32,6 +70,9 @@ class RegisterAlarmDefinitionRequest(BaseModel):
     measure_type: MeasureType
     measure_detail: str = ""
     sound_path: str
+    # Cuanto debe volver el valor para normalizar, y segundos minimos entre disparos
+    hysteresis: float = 0.0
+    cooldown: int = 0
 
 
 class AlarmService:
@@ -50,6 +91,9 @@ class AlarmService:
         self.repo.add(instance=alarm, session=session)
         return alarm
 
+    def create_alarms(self, requests: List[RegisterAlarmRequest], session: Session) -> List[Alarm]:
+        return [self.create_alarm(request, session) for request in requests]
+
 
 class AlarmDefinitionService:
 
@@ -63,7 +107,9 @@ class AlarmDefinitionService:
             sound_path= request.sound_path,
             measure_type= request.measure_type,
             measure_detail=request.measure_detail,
-            alarm_type= request.alarm_type
+            alarm_type= request.alarm_type,
+            hysteresis= request.hysteresis,
+            cooldown= request.cooldown
         )
         self.repo.add(instance=alarm_definition, session=session)
         return alarm_definition
@@ -73,7 +119,14 @@ class AlarmDefinitionService:
         alarm_definition: AlarmDefinition = self.repo.get_by_id(entity_id=request.id, session=session)
         if not alarm_definition:
             raise ValueError("Alarm definition not found")
-        alarm_definition.update(config_value= request.new_value, alarm_type= request.new_alarm_type, sound_path= request.new_sound_path, enabled= request.enabled)
+        alarm_definition.update(
+            config_value= request.new_value,
+            alarm_type= request.new_alarm_type,
+            sound_path= request.new_sound_path,
+            enabled= request.enabled,
+            hysteresis= request.new_hysteresis,
+            cooldown= request.new_cooldown
+        )
         self.repo.add(instance=alarm_definition, session=session)
         return alarm_definition
 
@@ -1,9 +1,10 @@
 import enum
-from typing import List
 from shared_kernel.domain.value_object import ValueObject
-from measurement.domain.model.aggregate import Measure
+from alarming.domain.model.rolling_window import RollingWindow
 import abc
 
+import numpy as np
+
 
 class AlarmType(ValueObject, str, enum.Enum):
     DESVEST = "DESVEST"
@@ -11,6 +12,18 @@ class AlarmType(ValueObject, str, enum.Enum):
     LOWER_THAN = "LOWER_THAN"
 
 
+class AlarmCountBucket(ValueObject, str, enum.Enum):
+    HOUR = "HOUR"
+    DAY = "DAY"
+
+    @property
+    def format(self) -> str:
+        # Formato de strftime de SQLite que trunca created_at al inicio del bucket
+        if self == AlarmCountBucket.HOUR:
+            return "%Y-%m-%d %H:00:00"
+        return "%Y-%m-%d 00:00:00"
+
+
 class AlarmTypeFactory:
     @staticmethod
     def get_alarm(alarm_type: AlarmType):
@@ -26,23 +39,55 @@ class AlarmTypeFactory:
 # ALARM TYPE
 class AlarmTypeBase(abc.ABC):
     @abc.abstractmethod
-    def check(self, parametrized_value: float, measures: List[Measure]) -> bool:
+    def check(self, parametrized_value: float, window: RollingWindow) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def check_many(
+            self,
+            parametrized_values: np.ndarray,
+            last: np.ndarray,
+            low: np.ndarray,
+            high: np.ndarray
+        ) -> np.ndarray:
+        """
+        Vectorized `check`: position i is one window given by its last, min and max
+        values. NaN (no data) never triggers.
+        """
         pass
 
+    def clear_threshold(self, parametrized_value, hysteresis):
+        """
+        Threshold an active alarm has to get back past to clear: the band is subtracted
+        for upper limits and added for lower ones.
+        """
+        return parametrized_value - hysteresis
+
 
 class LowerThanAlarmType(AlarmTypeBase):
-    def check(self, parametrized_value: float, measures: List[Measure]) -> bool:
-        latest_value = measures[-1]
-        return latest_value < parametrized_value
+    def check(self, parametrized_value: float, window: RollingWindow) -> bool:
+        return window.last < parametrized_value
+
+    def check_many(self, parametrized_values, last, low, high) -> np.ndarray:
+        return last < parametrized_values
+
+    def clear_threshold(self, parametrized_value, hysteresis):
+        return parametrized_value + hysteresis
 
 
 class GreaterThanAlarmType(AlarmTypeBase):
-    def check(self, parametrized_value: float, measures: List[Measure]) -> bool:
-        latest_value = measures[-1]
-        return latest_value > parametrized_value
+    def check(self, parametrized_value: float, window: RollingWindow) -> bool:
+        return window.last > parametrized_value
+
+    def check_many(self, parametrized_values, last, low, high) -> np.ndarray:
+        return last > parametrized_values
 
 
 class DesvestAlarmType(AlarmTypeBase):
-    def check(self, parametrized_value: float, measures: List[Measure]) -> bool:
-        last = measures[-1]
-        return any(x for x in measures if abs(last - x) > parametrized_value)
+    def check(self, parametrized_value: float, window: RollingWindow) -> bool:
+        # Algun valor de la ventana se aleja del ultimo mas que lo parametrizado
+        last = window.last
+        return max(window.max - last, last - window.min) > parametrized_value
+
+    def check_many(self, parametrized_values, last, low, high) -> np.ndarray:
+        return np.fmax(high - last, last - low) > parametrized_values
@@ -11,10 +11,18 @@ from alarming.application.use_cases.alarm_use_cases import (
     CreateAlarmCommand, AlarmQueryUseCase
 )
 
+from alarming.application.alarm_rule_index import AlarmRuleIndex
+from alarming.application.use_cases.alarm_backtest_use_case import AlarmBacktestUseCase
 from alarming.infra.repository import AlarmDefinitionRepository, AlarmRepository
 from alarming.domain.model.services import AlarmDefinitionService, AlarmService
 
+from measurement.infra.repository import MeasurementRepository
+
 from shared_kernel.infra.database.connection import get_db_session
+from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.infra.live_feed import LiveFeed
+from shared_kernel.infra.notification import NotificationDispatcher
+from shared_kernel.infra.revision import Revision
 
 class AlarmContainer(containers.DeclarativeContainer):
 
@@ -23,6 +31,7 @@ class AlarmContainer(containers.DeclarativeContainer):
     ###############################################################
     
     alarms_repo = providers.Factory(AlarmRepository)
+    live_feed = providers.Dependency(instance_of=LiveFeed)
     
     alarm_query = providers.Factory(
         AlarmQueryUseCase,
@@ -38,18 +47,37 @@ class AlarmContainer(containers.DeclarativeContainer):
     create_alarm_command = providers.Factory(
         CreateAlarmCommand,
         service=alarm_service,
+        feed=live_feed,
         db_session=get_db_session
     )
 
+    # Un hilo por receptor (sonido, log, webhook) para todo el proceso
+    notification_dispatcher = providers.Singleton(
+        NotificationDispatcher.with_default_sinks,
+        webhook_url=settings.NOTIFICATION_WEBHOOK_URL,
+    )
+
     ###############################################################
     #                      ALARM DEFINITION                       #
     ###############################################################
 
     alarms_definition_repo = providers.Factory(AlarmDefinitionRepository)
 
+    # Cambia con cada alta, edicion o baja de una definicion
+    alarm_definition_revision = providers.Singleton(Revision)
+
+    # Reglas habilitadas en memoria para el worker, reconstruidas por los comandos
+    alarm_rule_index = providers.Singleton(
+        AlarmRuleIndex,
+        repo=alarms_definition_repo,
+        db_session=get_db_session,
+    )
+
     alarm_definition_query = providers.Factory(
         AlarmDefinitionQueryUseCase,
         repo=alarms_definition_repo,
+        revision=alarm_definition_revision,
+        rule_index=alarm_rule_index,
         db_session=get_db_session,
     )
 
@@ -61,17 +89,33 @@ class AlarmContainer(containers.DeclarativeContainer):
     create_alarm_definition_command = providers.Factory(
         CreateAlarmDefinitionCommand,
         service=alarm_definition_service,
+        revision=alarm_definition_revision,
+        rule_index=alarm_rule_index,
         db_session=get_db_session
     )
 
     update_alarm_definition_command = providers.Factory(
         UpdateAlarmDefinitionCommand,
         service=alarm_definition_service,
+        revision=alarm_definition_revision,
+        rule_index=alarm_rule_index,
         db_session=get_db_session
     )
 
     delete_alarm_definition_command = providers.Factory(
         DeleteAlarmDefinitionCommand,
         service=alarm_definition_service,
+        revision=alarm_definition_revision,
+        rule_index=alarm_rule_index,
         db_session=get_db_session
-    )
\ No newline at end of file
+    )
+
+    # Solo lectura: repasa medidas guardadas con una regla, sin escribir alarmas
+    measurement_repo = providers.Factory(MeasurementRepository)
+    alarm_backtest = providers.Factory(
+        AlarmBacktestUseCase,
+        repo=alarms_definition_repo,
+        measurement_repo=measurement_repo,
+        db_session=get_db_session,
+        window_size=settings.ALARM_WINDOW_SIZE,
+    )
@@ -1,9 +1,14 @@
+from datetime import datetime
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Query, Session
-from typing import List
+from typing import List, Optional, Tuple
 
 from alarming.domain.model.aggregate import AlarmDefinition, Alarm
+from alarming.domain.model.value_object import AlarmCountBucket, AlarmType
 from measurement.domain.model.value_object import MeasureType
 from shared_kernel.infra.database.repository import  RDBRepository
+from shared_kernel.infra.database.orm import alarms_table
 
 class AlarmRepository(RDBRepository):
    
@@ -33,6 +38,55 @@ class AlarmRepository(RDBRepository):
         return session.query(Alarm)
 
 
+    @staticmethod
+    def find_page(
+            session: Session,
+            start_date: datetime,
+            end_date: datetime,
+            measure_type: Optional[MeasureType],
+            alarm_type: Optional[AlarmType],
+            limit: int,
+            before: Optional[Tuple[datetime, int]] = None
+        ) -> List[Alarm]:
+        # De la mas nueva a la mas vieja; con measure_type usa ix_alarms_measure_type_created_at
+        query = session.query(Alarm).filter(
+            Alarm.created_at >= start_date,
+            Alarm.created_at < end_date,
+        )
+        if measure_type is not None:
+            query = query.filter(Alarm.measure_type == measure_type)
+        if alarm_type is not None:
+            query = query.filter(Alarm.alarm_type == alarm_type)
+        if before:
+            query = query.filter(tuple_(Alarm.created_at, Alarm.id) < tuple(before))
+
+        return query.order_by(Alarm.created_at.desc(), Alarm.id.desc()).limit(limit).all()
+
+
+    @staticmethod
+    def count_by_bucket(
+            session: Session,
+            start_date: datetime,
+            end_date: datetime,
+            bucket: AlarmCountBucket,
+            measure_type: Optional[MeasureType],
+            alarm_type: Optional[AlarmType]
+        ) -> List[Row]:
+        columns = alarms_table.c
+        bucket_start = func.strftime(bucket.format, columns.created_at).label("bucket")
+        statement = select(bucket_start, columns.alarm_type, func.count().label("count")).where(
+            columns.created_at >= start_date,
+            columns.created_at < end_date,
+        )
+        if measure_type is not None:
+            statement = statement.where(columns.measure_type == measure_type.value)
+        if alarm_type is not None:
+            statement = statement.where(columns.alarm_type == alarm_type.value)
+
+        statement = statement.group_by(bucket_start, columns.alarm_type).order_by(bucket_start, columns.alarm_type)
+        return session.execute(statement).all()
+
+
     @staticmethod
     def get_by_id(session: Session, entity_id: int):
         return session.query(Alarm).get(entity_id)
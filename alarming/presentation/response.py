@@ -24,6 +24,25 @@ class AlarmResponse(BaseResponse):
     result: List[AlarmSchema]
 
 
+class AlarmPageResponse(BaseResponse):
+    result: List[AlarmSchema]
+    next_cursor: Optional[str] = None
+
+
+class AlarmCountSchema(BaseModel):
+    bucket: datetime
+    alarm_type: AlarmType
+    count: int
+
+    class Config:
+        orm_mode = True
+        from_attributes=True
+
+
+class AlarmCountResponse(BaseResponse):
+    result: List[AlarmCountSchema]
+
+
 class AlarmDefinitionSchema(BaseModel):
     id: int
     config_value: float
@@ -34,6 +53,8 @@ class AlarmDefinitionSchema(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
     enabled: bool
+    hysteresis: float
+    cooldown: int
 
     class Config:
         orm_mode = True
@@ -41,4 +62,26 @@ class AlarmDefinitionSchema(BaseModel):
 
 
 class AlarmDefinitionResponse(BaseResponse):
-    result: List[AlarmDefinitionSchema]
\ No newline at end of file
+    result: List[AlarmDefinitionSchema]
+
+class AlarmBacktestSchema(BaseModel):
+    measure_type: MeasureType
+    measure_detail: str
+    alarm_type: AlarmType
+    config_value: float
+    hysteresis: float
+    cooldown: int
+    window: int
+    samples: int
+    triggers: int
+    clears: int
+    trigger_times: List[datetime]
+    trigger_values: List[float]
+
+    class Config:
+        orm_mode = True
+        from_attributes=True
+
+
+class AlarmBacktestResponse(BaseResponse):
+    result: AlarmBacktestSchema
@@ -1,11 +1,12 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 
 from alarming.presentation.response import (
-    AlarmResponse, AlarmDefinitionResponse,
-    AlarmSchema, AlarmDefinitionSchema
+    AlarmResponse, AlarmPageResponse, AlarmCountResponse, AlarmDefinitionResponse, AlarmBacktestResponse,
+    AlarmSchema, AlarmCountSchema, AlarmDefinitionSchema, AlarmBacktestSchema
 )
 from alarming.application.use_cases.alarm_definition_use_cases import (
     AlarmDefinitionQueryUseCase,
@@ -17,11 +18,18 @@ from alarming.application.use_cases.alarm_definition_use_cases import (
 )
 
 from alarming.application.use_cases.alarm_use_cases import (
-    AlarmQueryUseCase, CreateAlarmCommand, RegisterAlarmRequest
+    AlarmQueryUseCase, CreateAlarmCommand, RegisterAlarmRequest,
+    GetAlarmHistoryRequest, GetAlarmCountRequest
 )
+from alarming.application.use_cases.alarm_backtest_use_case import AlarmBacktestUseCase
 
 from alarming.domain.model.aggregate import Alarm, AlarmDefinition
+from alarming.domain.model.services import BacktestAlarmRequest
+from alarming.domain.model.value_object import AlarmCountBucket, AlarmType
+from measurement.domain.model.value_object import MeasureType
 from shared_kernel.infra.container import AppContainer
+from shared_kernel.presentation.conditional import conditional_response, version_etag
+from shared_kernel.presentation.cursor import decode_cursor, encode_cursor
 
 router = APIRouter()
 
@@ -32,13 +40,18 @@ router = APIRouter()
 @router.get("/alarmDefinition", tags=['alarmDefinition'])
 @inject
 def get_alarms_definition(
+    if_none_match: Optional[str] = Header(None),
     query: AlarmDefinitionQueryUseCase = Depends(Provide[AppContainer.alarm.alarm_definition_query]),
 ) -> AlarmDefinitionResponse:
-    alarms_definitions: List[AlarmDefinition] = query.get_alarms_definition()
-    return AlarmDefinitionResponse(
-        detail="ok",
-        result=[AlarmDefinitionSchema.from_orm(ad) for ad in alarms_definitions]
-    )
+    def build():
+        alarms_definitions: List[AlarmDefinition] = query.get_alarms_definition()
+        return AlarmDefinitionResponse(
+            detail="ok",
+            result=[AlarmDefinitionSchema.from_orm(ad) for ad in alarms_definitions]
+        )
+
+    etag = version_etag("alarmDefinition", query.get_revision())
+    return conditional_response(if_none_match, build, etag=etag)
 
 @router.post("/alarmDefinition", tags=['alarmDefinition'])
 @inject
@@ -65,6 +78,44 @@ def delete_alarm_definition(
     command: DeleteAlarmDefinitionCommand = Depends(Provide[AppContainer.alarm.delete_alarm_definition_command])
 ) -> None:
     command.execute(request=request)
+
+
+@router.get("/alarmDefinition/backtest", tags=['alarmDefinition'])
+@inject
+def backtest_alarm_definition(
+    start_date: datetime,
+    end_date: datetime,
+    id: Optional[int] = None,
+    measure_type: Optional[MeasureType] = None,
+    measure_detail: Optional[str] = None,
+    alarm_type: Optional[AlarmType] = None,
+    config_value: Optional[float] = None,
+    hysteresis: Optional[float] = Query(None, ge=0),
+    cooldown: Optional[int] = Query(None, ge=0),
+    window: Optional[int] = Query(None, ge=1),
+    max_triggers: int = Query(1000, ge=0, le=100000),
+    use_case: AlarmBacktestUseCase = Depends(Provide[AppContainer.alarm.alarm_backtest]),
+) -> AlarmBacktestResponse:
+    request = BacktestAlarmRequest(
+        start_date=start_date,
+        end_date=end_date,
+        id=id,
+        measure_type=measure_type,
+        measure_detail=measure_detail,
+        alarm_type=alarm_type,
+        config_value=config_value,
+        hysteresis=hysteresis,
+        cooldown=cooldown,
+        window=window,
+        max_triggers=max_triggers
+    )
+    try:
+        backtest = use_case.execute(request=request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return AlarmBacktestResponse(detail="ok", result=AlarmBacktestSchema.from_orm(backtest))
+
+
 ###############################################################
 #                           ALARM                             #
 ###############################################################
@@ -82,6 +133,58 @@ def get_alarms(
     )
 
 
+@router.get("/alarm/history", tags=['alarm'])
+@inject
+def get_alarm_history(
+    start_date: datetime,
+    end_date: datetime,
+    measure_type: Optional[MeasureType] = None,
+    alarm_type: Optional[AlarmType] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    query: AlarmQueryUseCase = Depends(Provide[AppContainer.alarm.alarm_query]),
+) -> AlarmPageResponse:
+    request = GetAlarmHistoryRequest(
+        start_date=start_date,
+        end_date=end_date,
+        measure_type=measure_type,
+        alarm_type=alarm_type,
+        limit=limit,
+        before=decode_cursor(cursor) if cursor else None
+    )
+    alarms, next_key = query.get_alarm_history(request=request)
+    return AlarmPageResponse(
+        detail="ok",
+        result=[AlarmSchema.from_orm(a) for a in alarms],
+        next_cursor=encode_cursor(next_key) if next_key else None
+    )
+
+
+@router.get("/alarm/counts", tags=['alarm'])
+@inject
+def get_alarm_counts(
+    start_date: datetime,
+    end_date: datetime,
+    bucket: AlarmCountBucket = AlarmCountBucket.HOUR,
+    measure_type: Optional[MeasureType] = None,
+    alarm_type: Optional[AlarmType] = None,
+    query: AlarmQueryUseCase = Depends(Provide[AppContainer.alarm.alarm_query]),
+) -> AlarmCountResponse:
+    counts = query.count_alarms(
+        request=GetAlarmCountRequest(
+            start_date=start_date,
+            end_date=end_date,
+            bucket=bucket,
+            measure_type=measure_type,
+            alarm_type=alarm_type
+        )
+    )
+    return AlarmCountResponse(
+        detail="ok",
+        result=[AlarmCountSchema.from_orm(c) for c in counts]
+    )
+
+
 @router.post("/alarm", tags=['alarm'])
 @inject
 def post_alarm(
@@ -0,0 +1,156 @@
+"""
+Query latency on the measures table before and after the managed indexes.
+
+    python -m benchmarks.measures_index_benchmark --rows 10000000
+
+Builds a throw-away SQLite file with the measures/alarms tables from the ORM,
+fills it with synthetic polling data and times the repository queries with and
+without the indexes declared in shared_kernel/infra/database/orm.py.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from shared_kernel.infra.database.orm import EpochMillis, measures_table, series_table, alarms_table
+
+SERIES = [
+    ("PRESSURE", "Pi"), ("PRESSURE", "Pd"),
+    ("TEMPERATURE", "Ti"), ("TEMPERATURE", "Tm"),
+    ("VIBRATION", "X"), ("VIBRATION", "Z"),
+    ("TOOL_CURRENT", ""), ("TOOL_VOLTAGE", "Tm"),
+    ("RESISTANCE", "A-B"), ("RESISTANCE", "B-C"), ("RESISTANCE", "C-A"),
+    ("ISOLATION", ""), ("BATTERY", ""),
+]
+PERIOD_SECONDS = 25
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def build_database(path: str, rows: int) -> datetime:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        # Only the tables: the indexes are what is being measured
+        connection.execute(CreateTable(series_table))
+        connection.execute(CreateTable(measures_table))
+        connection.execute(CreateTable(alarms_table))
+    engine.dispose()
+
+    start = datetime(2020, 1, 1)
+    connection = sqlite3.connect(path)
+    connection.executemany(
+        "INSERT INTO series (id, measure_type, detail) VALUES (?, ?, ?)",
+        ((series_id, measure_type, detail) for series_id, (measure_type, detail) in enumerate(SERIES, start=1))
+    )
+
+    def measures():
+        for i in range(rows):
+            created_at = start + timedelta(seconds=(i // len(SERIES)) * PERIOD_SECONDS)
+            yield i % len(SERIES) + 1, to_millis(created_at), random.uniform(0, 100)
+
+    def alarms():
+        for i in range(max(rows // 100, 1)):
+            created_at = start + timedelta(seconds=i * PERIOD_SECONDS * 100)
+            yield 1, 0.0, "PRESSURE", "GREATER_THAN", created_at.strftime(DATE_FORMAT)
+
+    connection.executemany(
+        "INSERT INTO measures (series_id, created_at, value) VALUES (?, ?, ?)", measures()
+    )
+    connection.executemany(
+        "INSERT INTO alarms (measure_value, config_value, measure_type, alarm_type, created_at) VALUES (?, ?, ?, ?, ?)",
+        alarms()
+    )
+    connection.commit()
+    connection.close()
+
+    return start + timedelta(seconds=(rows // len(SERIES)) * PERIOD_SECONDS)
+
+
+def to_millis(value: datetime) -> int:
+    return EpochMillis().process_bind_param(value, None)
+
+
+def queries(end: datetime):
+    day_start = to_millis(end - timedelta(days=1))
+    day_end = to_millis(end)
+    hour_ago = to_millis(end - timedelta(hours=1))
+    measures = "FROM measures m JOIN series s ON s.id = m.series_id WHERE s.measure_type = ? AND s.detail = ?"
+    return {
+        "range (1 day, one series)": (
+            f"SELECT m.id, m.value, s.measure_type, s.detail, m.created_at {measures} "
+            "AND m.created_at >= ? AND m.created_at <= ?",
+            ("PRESSURE", "Pi", day_start, day_end),
+        ),
+        "time delta (newest before t)": (
+            f"SELECT m.id, m.value, s.measure_type, s.detail, m.created_at {measures} "
+            "AND m.created_at <= ? ORDER BY m.created_at DESC LIMIT 1",
+            ("RESISTANCE", "A-B", hour_ago),
+        ),
+        "latest value (one series)": (
+            f"SELECT MAX(m.created_at) {measures}",
+            ("TEMPERATURE", "Tm"),
+        ),
+        "last 15 alarms": (
+            "SELECT id, measure_value, created_at FROM alarms ORDER BY created_at DESC LIMIT 15",
+            (),
+        ),
+    }
+
+
+def time_queries(path: str, end: datetime, repeat: int):
+    connection = sqlite3.connect(path)
+    result = {}
+    for name, (sql, params) in queries(end).items():
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            connection.execute(sql, params).fetchall()
+            best = min(best, time.perf_counter() - started)
+        result[name] = best
+    connection.close()
+    return result
+
+
+def create_indexes(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        for table in (measures_table, alarms_table):
+            for index in table.indexes:
+                connection.execute(CreateIndex(index))
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.db")
+
+        started = time.perf_counter()
+        end = build_database(path, args.rows)
+        print(f"Built {args.rows} measures in {time.perf_counter() - started:.1f}s")
+
+        before = time_queries(path, end, args.repeat)
+
+        started = time.perf_counter()
+        create_indexes(path)
+        print(f"Created indexes in {time.perf_counter() - started:.1f}s")
+
+        after = time_queries(path, end, args.repeat)
+
+    print(f"{'query':<32}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<32}{before[name] * 1000:>14.2f}{after[name] * 1000:>14.2f}{speedup:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Latency of GET /measurement/ for large raw ranges: ORM + Pydantic vs Core rows.
+
+    python -m benchmarks.measures_read_benchmark --rows 100000
+
+Builds a throw-away SQLite file with one series of `rows` measures and times
+both read paths end to end (query + JSON body), checking that they produce
+the same document.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from measurement.domain.model.value_object import MeasureType
+from measurement.infra.repository import MeasurementRepository
+from measurement.presentation.response import MeasurementResponse, UnitSchema
+from measurement.presentation.rest import encode_measurement_rows, map_measurements_to_schema
+from shared_kernel.infra.database.orm import EpochMillis, init_orm_mappers, measures_table, series_table
+
+PERIOD_SECONDS = 1
+UNIT = "PSI"
+
+
+def build_database(path: str, rows: int) -> datetime:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(CreateTable(series_table))
+        connection.execute(CreateTable(measures_table))
+        for index in measures_table.indexes:
+            connection.execute(CreateIndex(index))
+    engine.dispose()
+
+    start = datetime(2020, 1, 1)
+    to_millis = EpochMillis().process_bind_param
+    connection = sqlite3.connect(path)
+    connection.execute("INSERT INTO series (id, measure_type, detail) VALUES (1, 'PRESSURE', 'Pi')")
+    connection.executemany(
+        "INSERT INTO measures (series_id, created_at, value) VALUES (?, ?, ?)",
+        (
+            (
+                1,
+                to_millis(start + timedelta(seconds=i * PERIOD_SECONDS, milliseconds=random.randint(1, 999)), None),
+                random.uniform(0, 100),
+            )
+            for i in range(rows)
+        )
+    )
+    connection.commit()
+    connection.close()
+    return start
+
+
+def orm_path(session, start: datetime, end: datetime) -> bytes:
+    measures = MeasurementRepository.find_by_sensor_type_detail_and_date_range(
+        session=session, measure_type=MeasureType.PRESSURE, start_date=start, end_date=end, detail="Pi"
+    )
+    unit = UnitSchema(name=UNIT, value=UNIT)
+    return MeasurementResponse(detail="ok", result=map_measurements_to_schema(measures, unit=unit)).model_dump_json().encode()
+
+
+def core_path(session, start: datetime, end: datetime) -> bytes:
+    rows = MeasurementRepository.find_rows_by_sensor_type_detail_and_date_range(
+        session=session, measure_type=MeasureType.PRESSURE, start_date=start, end_date=end, detail="Pi"
+    )
+    return encode_measurement_rows(rows, UNIT)
+
+
+def best_of(path, session_factory, start: datetime, end: datetime, repeat: int):
+    best, body = float("inf"), None
+    for _ in range(repeat):
+        with session_factory() as session:
+            started = time.perf_counter()
+            body = path(session, start, end)
+            best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_orm_mappers()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.db")
+        start = build_database(path, args.rows)
+        end = start + timedelta(seconds=args.rows * PERIOD_SECONDS)
+
+        engine = create_engine(f"sqlite:///{path}")
+        session_factory = sessionmaker(bind=engine)
+        orm_time, orm_body = best_of(orm_path, session_factory, start, end, args.repeat)
+        core_time, core_body = best_of(core_path, session_factory, start, end, args.repeat)
+        engine.dispose()
+
+    if json.loads(orm_body) != json.loads(core_body):
+        raise SystemExit("The two read paths returned different documents")
+
+    print(f"{'path':<20}{'time (ms)':>12}{'body (MB)':>12}")
+    print(f"{'ORM + Pydantic':<20}{orm_time * 1000:>12.1f}{len(orm_body) / 1e6:>12.1f}")
+    print(f"{'Core rows':<20}{core_time * 1000:>12.1f}{len(core_body) / 1e6:>12.1f}")
+    print(f"Speedup: {orm_time / core_time:.1f}x on {args.rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,12 @@ from configuration.application.use_case import (
 from configuration.domain.model.services import ConfigurationService
 
 from shared_kernel.infra.database.connection import get_db_session
+from shared_kernel.infra.notification import NotificationDispatcher
 
 
 class ConfigurationContainer(containers.DeclarativeContainer):
     repo = providers.Factory(ConfigurationRepository)
+    notification_dispatcher = providers.Dependency(instance_of=NotificationDispatcher)
 
     query = providers.Factory(
         ConfigurationQueryUseCase,
@@ -22,7 +22,7 @@ from configuration.application.use_case import (
 )
 from configuration.domain.model.aggregate import Configuration
 from shared_kernel.infra.container import AppContainer
-import pygame
+from shared_kernel.infra.notification import Notification, NotificationDispatcher
 
 
 router = APIRouter(prefix="/configuration", tags=['configuration'])
@@ -81,8 +81,8 @@ def setup(
 @inject
 def setup(
     configuration_query: ConfigurationQueryUseCase = Depends(Provide[AppContainer.configuration.query]),
+    notifier: NotificationDispatcher = Depends(Provide[AppContainer.configuration.notification_dispatcher]),
 ):
-    sound_path = configuration_query.get_configuration(request = GetConfigurationRequest(name='soundPath'))
-    pygame.mixer.init()
-    pygame.mixer.music.load(sound_path)
-    pygame.mixer.music.play()
+    sound_path = configuration_query.get_configuration(request = GetConfigurationRequest(name='soundPath'))[0].value
+    # Se encola y responde enseguida; el sonido se reproduce en el hilo del dispatcher
+    notifier.notify(Notification(title="Prueba de sonido", description=sound_path, sound_path=sound_path))
@@ -1,10 +1,40 @@
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    measure_type TEXT NOT NULL,
+    detail TEXT NOT NULL,
+    CONSTRAINT uix_series_key UNIQUE (measure_type, detail)
+);
+
+-- created_at: milisegundos desde 1970-01-01
 CREATE TABLE IF NOT EXISTS measures (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    series_id INTEGER NOT NULL,
+    created_at INTEGER NOT NULL,
     value REAL NOT NULL,
-    measure_type TEXT NOT NULL,
-    detail TEXT,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE (id)
+    FOREIGN KEY (series_id) REFERENCES series(id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_measures_series_created_at ON measures (series_id, created_at);
+
+CREATE TABLE IF NOT EXISTS latest_measures (
+    series_id INTEGER NOT NULL,
+    value REAL NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (series_id),
+    FOREIGN KEY (series_id) REFERENCES series(id)
+);
+
+CREATE TABLE IF NOT EXISTS measure_rollups (
+    resolution TEXT NOT NULL,
+    series_id INTEGER NOT NULL,
+    bucket_start DATETIME NOT NULL,
+    samples INTEGER NOT NULL,
+    min_value REAL NOT NULL,
+    max_value REAL NOT NULL,
+    sum_value REAL NOT NULL,
+    sum_squares REAL NOT NULL,
+    PRIMARY KEY (resolution, series_id, bucket_start),
+    FOREIGN KEY (series_id) REFERENCES series(id)
 );
 
 CREATE TABLE IF NOT EXISTS alarms (
@@ -17,6 +47,9 @@ CREATE TABLE IF NOT EXISTS alarms (
     UNIQUE (id)
 );
 
+CREATE INDEX IF NOT EXISTS ix_alarms_created_at ON alarms (created_at);
+CREATE INDEX IF NOT EXISTS ix_alarms_measure_type_created_at ON alarms (measure_type, created_at);
+
 CREATE TABLE IF NOT EXISTS alarm_definitions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     config_value REAL NOT NULL,
@@ -27,6 +60,8 @@ CREATE TABLE IF NOT EXISTS alarm_definitions (
     created_at DATETIME NOT NULL,
     updated_at DATETIME,
     enabled BOOLEAN,
+    hysteresis REAL NOT NULL DEFAULT 0,
+    cooldown INTEGER NOT NULL DEFAULT 0,
     UNIQUE (alarm_type, measure_type, measure_detail)
 );
 
@@ -79,7 +114,13 @@ CREATE TABLE IF NOT EXISTS events (
     title TEXT NOT NULL,
     description TEXT NOT NULL,
     measure_type TEXT,
-    alarm_type TEXT
+    alarm_type TEXT,
+    created_at DATETIME
+);
+
+CREATE TABLE IF NOT EXISTS event_cursor (
+    id INTEGER PRIMARY KEY,
+    acknowledged_id INTEGER NOT NULL
 );
 
 INSERT INTO configurations (name, value, treatment_as)
@@ -95,4 +136,7 @@ values
 ('THIRD',1,25,1,'WELL');
 
 INSERT INTO worker_flow_status (times_executed,"position") VALUES
-(1,'FIRST');
\ No newline at end of file
+(1,'FIRST');
+
+INSERT INTO event_cursor (id, acknowledged_id) VALUES
+(1, 0);
\ No newline at end of file
@@ -0,0 +1,193 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from queue import Empty, Queue
+from threading import Lock, Thread
+from typing import Callable, List, Optional, Union
+
+from measurement.application.use_cases.measurement_use_cases import CreateMeasurementListCommand
+from measurement.domain.model.services.measurement_service import CreateMeasurementRequest
+
+from shared_kernel.infra.database.connection import unit_of_work
+from shared_kernel.infra.logger import logger
+
+
+_STOP = object()
+
+Write = Union[CreateMeasurementRequest, Callable[[], None]]
+
+
+class MeasurementWriteError(Exception):
+    pass
+
+
+class _Group:
+    def __init__(self):
+        self.items: List[Write] = []
+
+
+_current_group: ContextVar[Optional[_Group]] = ContextVar("ingestion_group", default=None)
+
+
+class MeasurementIngestionQueue:
+    """
+    Write-behind buffer for measures: producers enqueue and a single writer thread
+    persists them in batches of `batch_size` rows or every `flush_interval` seconds,
+    one transaction per batch. `put` blocks while `max_size` items are pending.
+    Writes that must commit with the measures go through `defer`, and `group` keeps
+    a set of them (a poll cycle) in the same batch. A failed batch is retried
+    `max_retries` times; if it still fails the next put/defer/flush raises
+    MeasurementWriteError.
+    """
+
+    def __init__(
+            self,
+            command: CreateMeasurementListCommand,
+            batch_size: int = 200,
+            flush_interval: float = 0.5,
+            max_size: int = 10000,
+            max_retries: int = 3,
+            retry_delay: float = 1.0
+        ):
+        self.command = command
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.queue: Queue = Queue(maxsize=max_size)
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+        self._failure: Optional[Exception] = None
+
+    def put(self, request: CreateMeasurementRequest, timeout: Optional[float] = None):
+        # La fecha se fija al encolar para que la demora de escritura no la desplace
+        if request.date_time is None:
+            raise ValueError("Queued measures must carry their date_time")
+        self._enqueue(request, timeout)
+
+    def defer(self, work: Callable[[], None], timeout: Optional[float] = None):
+        """
+        Runs `work` on the writer thread, in the transaction of the measures enqueued
+        before it. It runs again if its batch is retried, so it must only write.
+        """
+        self._enqueue(work, timeout)
+
+    @contextmanager
+    def group(self, timeout: Optional[float] = None):
+        """
+        Everything put or deferred in this block (same thread or asyncio task) is
+        enqueued at its end as one item, so it is written in a single transaction.
+        Nothing is enqueued if the block raises.
+        """
+        if _current_group.get() is not None:
+            yield
+            return
+
+        group = _Group()
+        token = _current_group.set(group)
+        try:
+            yield
+        finally:
+            _current_group.reset(token)
+        if group.items:
+            self._enqueue(group, timeout)
+
+    def flush(self):
+        """
+        Blocks until every item enqueued so far has been written.
+        """
+        if self._thread is not None:
+            self.queue.join()
+        self._raise_failure()
+
+    def stop(self):
+        """
+        Writes every pending measure and stops the writer thread.
+        """
+        with self._lock:
+            if self._thread is None:
+                return
+            self.queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _enqueue(self, item, timeout: Optional[float]):
+        self._raise_failure()
+        group = _current_group.get()
+        if group is not None:
+            group.items.append(item)
+            return
+        self._ensure_started()
+        self.queue.put(item, timeout=timeout)
+
+    def _raise_failure(self):
+        with self._lock:
+            failure, self._failure = self._failure, None
+        if failure is not None:
+            raise MeasurementWriteError("A batch of queued writes could not be stored") from failure
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="measurement-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self.queue.get()
+            if item is _STOP:
+                stopping = True
+            else:
+                batch.append(item)
+
+            deadline = time.monotonic() + self.flush_interval
+            while not stopping and _size(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+
+            self._write(batch)
+            for _ in range(len(batch) + stopping):
+                self.queue.task_done()
+
+    def _write(self, batch: List[Union[Write, _Group]]):
+        writes = [w for item in batch for w in (item.items if isinstance(item, _Group) else [item])]
+        if not writes:
+            return
+        requests = [w for w in writes if isinstance(w, CreateMeasurementRequest)]
+        works = [w for w in writes if not isinstance(w, CreateMeasurementRequest)]
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                # Medidas y escrituras diferidas del lote: una sola transaccion
+                with unit_of_work():
+                    statuses = self.command.execute(requests) if requests else []
+                    for work in works:
+                        work()
+                break
+            except Exception as e:
+                logger.exception(f"Attempt {attempt} to write a batch of {len(requests)} measures failed")
+                if attempt == self.max_retries:
+                    logger.error(f"Dropping a batch of {len(requests)} measures and {len(works)} writes")
+                    with self._lock:
+                        self._failure = e
+                    return
+                time.sleep(self.retry_delay)
+
+        rejected = [status for status in statuses if not status.created]
+        for status in rejected:
+            logger.warning(f"Measure {requests[status.index]} rejected: {status.error}")
+
+
+def _size(batch: List[Union[Write, _Group]]) -> int:
+    return sum(len(item.items) if isinstance(item, _Group) else 1 for item in batch)
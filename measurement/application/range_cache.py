@@ -0,0 +1,126 @@
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy.engine import Row
+
+from measurement.domain.model.aggregate import Measure
+from measurement.domain.model.value_object import MeasureType
+from pydantic import BaseModel
+
+
+class RangeKey(NamedTuple):
+    query: str
+    measure_type: MeasureType
+    detail: Optional[str]
+    start: datetime
+    end: datetime
+    max_points: Optional[int] = None
+    bucket: Optional[int] = None
+
+    def covers(self, measure_type: MeasureType, detail: str, first: datetime, last: datetime) -> bool:
+        # Sin detalle (o "Todos") la consulta incluye todos los detalles del tipo
+        same_detail = not self.detail or self.detail == "Todos" or self.detail == detail
+        return self.measure_type == measure_type and same_detail and self.start <= last and first <= self.end
+
+
+class RangeCacheStats(BaseModel):
+    hits: int
+    misses: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class MeasurementRangeCache:
+    """
+    LRU of query results over closed windows, bounded by the estimated size of
+    the cached results. Inserts drop every window they land in.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Cambia en cada invalidacion: un resultado leido antes no se guarda
+        self.version = 0
+        self._entries: "OrderedDict[RangeKey, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: RangeKey) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: RangeKey, value: Sequence, version: int):
+        size = estimate_size(value)
+        with self._lock:
+            if version != self.version or size > self.max_bytes:
+                return
+            self._discard(key)
+            self._entries[key] = (value, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+
+    def invalidate(self, measures: List[Measure]):
+        spans = {}
+        for measure in measures:
+            series = (measure.measure_type, measure.detail or "")
+            first, last = spans.get(series, (measure.created_at, measure.created_at))
+            spans[series] = (min(first, measure.created_at), max(last, measure.created_at))
+
+        with self._lock:
+            self.version += 1
+            stale = [
+                key for key in self._entries
+                if any(key.covers(measure_type, detail, first, last) for (measure_type, detail), (first, last) in spans.items())
+            ]
+            for key in stale:
+                self._discard(key)
+
+    def stats(self) -> RangeCacheStats:
+        with self._lock:
+            return RangeCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                entries=len(self._entries),
+                size_bytes=self.size_bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def _discard(self, key: RangeKey):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[1]
+
+
+def estimate_size(items: Sequence) -> int:
+    """
+    Approximate memory held by a result, extrapolated from its first item.
+    """
+    size = sys.getsizeof(items)
+    if not items:
+        return size
+
+    sample = items[0]
+    if isinstance(sample, Row):
+        values = sample._tuple()
+        item_size = sys.getsizeof(values)
+    elif hasattr(sample, "__dict__"):
+        values = vars(sample).values()
+        item_size = sys.getsizeof(sample) + sys.getsizeof(vars(sample))
+    else:
+        values = ()
+        item_size = sys.getsizeof(sample)
+    item_size += sum(sys.getsizeof(value) for value in values)
+    return size + item_size * len(items)
@@ -0,0 +1,56 @@
+from threading import Lock
+from typing import Callable, ContextManager, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from measurement.domain.model.aggregate import Sensor
+from measurement.domain.model.value_object import MeasureType, Unit
+from measurement.infra.repository import SensorRepository
+
+
+class SensorRegistry:
+    """
+    In-memory index measure_type -> (sensor, unit), loaded on first use and
+    dropped by the sensor commands whenever a sensor is created or deleted.
+    """
+
+    def __init__(self, repo: SensorRepository, db_session: Callable[[], ContextManager[Session]]):
+        self.repo = repo
+        self.db_session = db_session
+        self._entries: Optional[Dict[str, Tuple[Sensor, Unit]]] = None
+        self.revision = 0
+        self._lock = Lock()
+
+    def get_sensor(self, measure_type: MeasureType) -> Optional[Sensor]:
+        entry = self._get_entries().get(measure_type.value)
+        return entry[0] if entry else None
+
+    def get_unit(self, measure_type: MeasureType) -> Optional[Unit]:
+        entry = self._get_entries().get(measure_type.value)
+        return entry[1] if entry else None
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+            self.revision += 1
+
+    def _get_entries(self) -> Dict[str, Tuple[Sensor, Unit]]:
+        entries = self._entries
+        if entries is not None:
+            return entries
+
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            return self._entries
+
+    def _load(self) -> Dict[str, Tuple[Sensor, Unit]]:
+        with self.db_session() as session:
+            sensors = sorted(self.repo.get_all(session=session), key=lambda s: s.id)
+
+        entries = {}
+        for sensor in sensors:
+            for spec in sensor.measurement_specs:
+                # Como find_sensor_by_measure_type: gana el primer sensor configurado
+                entries.setdefault(spec.measure_type, (sensor, spec.unit))
+        return entries
@@ -1,15 +1,25 @@
-from typing import Callable, ContextManager, List, Optional
+from itertools import groupby
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
-from measurement.domain.model.aggregate import Measure
-from measurement.domain.model.value_object import MeasureType
+import numpy as np
+
+from measurement.domain.model.aggregate import Measure, LatestMeasure, MeasureBucket, MeasureSeries, MeasureStats
+from measurement.domain.model.value_object import MeasureType, RollupResolution
 from measurement.infra.api.device_api_service import MeasurementDeviceApiService
 from measurement.infra.repository import MeasurementRepository
 from measurement.infra.api.device_repository import DeviceMeasureRepository, DeviceMeasure
 from measurement.domain.model.services.measurement_service import (
-    CreateMeasurementRequest, MeasurementService
+    CreateMeasurementRequest, CreateMeasurementStatus, MeasurementService
 )
+from measurement.domain.model.services.downsampling_service import downsample, downsample_rollups
+from measurement.domain.model.services.statistics_service import stats_by_detail, stats_from_aggregates
+from measurement.application.range_cache import MeasurementRangeCache, RangeCacheStats, RangeKey
+from shared_kernel.infra.database.connection import after_commit
+from shared_kernel.infra.live_feed import LiveFeed
+from shared_kernel.infra.revision import Revision
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -19,6 +29,29 @@ class GetMeasurementRequest(BaseModel):
     start_date: datetime
     end_date: datetime
     detail: Optional[str] = None
+    max_points: Optional[int] = None
+    bucket: Optional[int] = None
+
+class GetMeasurementPageRequest(BaseModel):
+    measure_type: MeasureType
+    start_date: datetime
+    end_date: datetime
+    detail: Optional[str] = None
+    limit: int = 500
+    after: Optional[Tuple[datetime, int]] = None
+
+class GetMeasurementStatsRequest(BaseModel):
+    measure_type: MeasureType
+    start_date: datetime
+    end_date: datetime
+    details: Optional[List[str]] = None
+    percentiles: Optional[List[float]] = None
+
+class GetMeasurementSeriesRequest(BaseModel):
+    # (measure_type, detail); detail None incluye todos los detalles del tipo
+    series: List[Tuple[MeasureType, Optional[str]]]
+    start_date: datetime
+    end_date: datetime
 
 class GetMeasurementByTimeDeltaRequest(BaseModel):
     measure_type: MeasureType
@@ -26,11 +59,75 @@ class GetMeasurementByTimeDeltaRequest(BaseModel):
     detail: Optional[str] = None
 
 class MeasurementQueryUseCase:
-    def __init__(self, repo: MeasurementRepository, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(
+            self,
+            repo: MeasurementRepository,
+            cache: MeasurementRangeCache,
+            revision: Revision,
+            db_session: Callable[[], ContextManager[Session]]
+        ):
         self.repo = repo
+        self.cache = cache
+        self.revision = revision
         self.db_session = db_session
 
-    def get_measures(self, request: GetMeasurementRequest) -> List[Measure]:
+    def get_measures(self, request: GetMeasurementRequest) -> List[Union[Measure, MeasureBucket]]:
+        return self._cached("measures", request, lambda: self._find_measures(request))
+
+    def get_measure_rows(self, request: GetMeasurementRequest) -> List[Row]:
+        return self._cached("rows", request, lambda: self._find_measure_rows(request))
+
+    def get_data_version(self) -> int:
+        # Contador en memoria, avanza con cada escritura confirmada: un 304 no toca la base
+        return self.revision.value
+
+    def get_cache_stats(self) -> RangeCacheStats:
+        return self.cache.stats()
+
+    def _cached(self, query: str, request: GetMeasurementRequest, load: Callable[[], List]) -> List:
+        # Solo ventanas cerradas: el rango termina al final del dia de end_date
+        end = request.end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+        if end.tzinfo is not None or end >= datetime.now():
+            return load()
+
+        key = RangeKey(
+            query=query,
+            measure_type=request.measure_type,
+            detail=request.detail,
+            start=request.start_date,
+            end=end,
+            max_points=request.max_points,
+            bucket=request.bucket
+        )
+        result = self.cache.get(key)
+        if result is None:
+            version = self.cache.version
+            result = load()
+            self.cache.put(key, result, version=version)
+        return result
+
+    def _find_measures(self, request: GetMeasurementRequest) -> List[Union[Measure, MeasureBucket]]:
+        end_date = request.end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+        resolution = RollupResolution.coarsest_for(
+            window_seconds=(end_date - request.start_date).total_seconds(),
+            max_points=request.max_points,
+            bucket=request.bucket
+        )
+        # Los rollups solo son exactos si el inicio cae en un bucket; uno mas fino sigue sirviendo
+        aligned = RollupResolution.aligned_to(request.start_date)
+        if resolution and aligned:
+            resolution = min(resolution, aligned, key=lambda r: r.seconds)
+            with self.db_session() as session:
+                rollups = self.repo.find_rollups(
+                    session=session,
+                    resolution=resolution,
+                    start_date=request.start_date,
+                    end_date=end_date,
+                    measure_type=request.measure_type,
+                    detail=request.detail
+                )
+            return downsample_rollups(rollups, max_points=request.max_points, bucket=request.bucket)
+
         with self.db_session() as session:
             measures: List[Measure] = self.repo.find_by_sensor_type_detail_and_date_range(
                 session=session,
@@ -39,11 +136,133 @@ class MeasurementQueryUseCase:
                 measure_type=request.measure_type,
                 detail= request.detail
             )
-            return measures
+        if request.max_points or request.bucket:
+            return downsample(measures, max_points=request.max_points, bucket=request.bucket)
+        return measures
+
+    def _find_measure_rows(self, request: GetMeasurementRequest) -> List[Row]:
+        with self.db_session() as session:
+            return self.repo.find_rows_by_sensor_type_detail_and_date_range(
+                session=session,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                measure_type=request.measure_type,
+                detail=request.detail
+            )
+
+    def get_stats(self, request: GetMeasurementStatsRequest) -> List[MeasureStats]:
+        end_date = request.end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+        details = None if not request.details or "Todos" in request.details else request.details
+
+        if request.percentiles:
+            # Los percentiles necesitan los valores: una sola lectura ordenada por detalle
+            with self.db_session() as session:
+                rows = self.repo.find_values_by_detail(
+                    session=session,
+                    measure_type=request.measure_type,
+                    start_date=request.start_date,
+                    end_date=end_date,
+                    details=details
+                )
+            return stats_by_detail(
+                request.measure_type,
+                np.array([r.detail for r in rows], dtype=object),
+                np.fromiter((r.value for r in rows), dtype=float, count=len(rows)),
+                request.percentiles
+            )
+
+        # Sin percentiles alcanza con agregados; los rollups son exactos si el inicio cae en un bucket
+        resolution = RollupResolution.aligned_to(request.start_date)
+        with self.db_session() as session:
+            if resolution:
+                rows = self.repo.aggregate_rollups_by_detail(
+                    session=session,
+                    resolution=resolution,
+                    measure_type=request.measure_type,
+                    start_date=request.start_date,
+                    end_date=end_date,
+                    details=details
+                )
+            else:
+                rows = self.repo.aggregate_by_detail(
+                    session=session,
+                    measure_type=request.measure_type,
+                    start_date=request.start_date,
+                    end_date=end_date,
+                    details=details
+                )
+        return [
+            stats_from_aggregates(
+                request.measure_type, r.detail, r.samples, r.min_value, r.max_value, r.sum_value, r.sum_squares
+            )
+            for r in rows if r.samples
+        ]
+
+    def get_series(self, request: GetMeasurementSeriesRequest) -> List[MeasureSeries]:
+        with self.db_session() as session:
+            rows = self.repo.find_rows_by_series(
+                session=session,
+                series=request.series,
+                start_date=request.start_date,
+                end_date=request.end_date
+            )
+
+        found: Dict[Tuple[str, str], MeasureSeries] = {}
+        for (measure_type, detail), group in groupby(rows, key=lambda r: (r.measure_type, r.detail)):
+            group = list(group)
+            found[(measure_type, detail)] = MeasureSeries(
+                measure_type=MeasureType(measure_type),
+                detail=detail,
+                timestamps=[r.created_at for r in group],
+                values=[r.value for r in group]
+            )
+
+        # En el orden pedido; una serie explicita sin datos sale con arreglos vacios
+        result: Dict[Tuple[str, str], MeasureSeries] = {}
+        for measure_type, detail in request.series:
+            if detail is None:
+                for key, series in found.items():
+                    if key[0] == measure_type.value:
+                        result.setdefault(key, series)
+            else:
+                # 'TIPO:' pide la serie sin detalle, que se lee como None
+                key = (measure_type.value, detail or None)
+                result.setdefault(key, found.get(key) or MeasureSeries(
+                    measure_type=measure_type, detail=detail or None, timestamps=[], values=[]
+                ))
+        return list(result.values())
+
+    def get_measures_page(self, request: GetMeasurementPageRequest) -> Tuple[List[Measure], Optional[Tuple[datetime, int]]]:
+        with self.db_session() as session:
+            measures: List[Measure] = self.repo.find_page(
+                session=session,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                measure_type=request.measure_type,
+                detail=request.detail,
+                limit=request.limit + 1,
+                after=request.after
+            )
+        # Se pide una fila extra solo para saber si existe una pagina siguiente
+        if len(measures) <= request.limit:
+            return measures, None
+        page = measures[:request.limit]
+        return page, (page[-1].created_at, page[-1].id)
+
+    def export_measures(self, request: GetMeasurementRequest) -> Iterator[Sequence[Row]]:
+        # La sesion se mantiene abierta mientras el consumidor recorre el cursor
+        with self.db_session() as session:
+            yield from self.repo.stream_by_sensor_type_detail_and_date_range(
+                session=session,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                measure_type=request.measure_type,
+                detail=request.detail
+            )
         
-    def get_last_measures(self) -> List[Measure]:
+    def get_last_measures(self) -> List[LatestMeasure]:
         with self.db_session() as session:
-            measures: List[Measure] = self.repo.find_latest_records_for_all_measure_types(session=session)
+            measures: List[LatestMeasure] = self.repo.find_latest_records_for_all_measure_types(session=session)
             return measures
         
     def get_measure_by_time_delta(self, request: GetMeasurementByTimeDeltaRequest) -> Measure:
@@ -57,16 +276,72 @@ class MeasurementQueryUseCase:
             return measures
 
 
+def publish_measures(feed: LiveFeed, measures: List[Measure]):
+    for measure in measures:
+        feed.publish("measure", measure.measure_type, measure.detail or "", {
+            "id": measure.id,
+            "measure_type": measure.measure_type,
+            "detail": measure.detail,
+            "value": measure.value,
+            "created_at": measure.created_at.isoformat(),
+        })
+
+
 class CreateMeasurementCommand:
-    def __init__(self, service: MeasurementService, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(
+            self,
+            service: MeasurementService,
+            cache: MeasurementRangeCache,
+            feed: LiveFeed,
+            revision: Revision,
+            db_session: Callable[[], ContextManager[Session]]
+        ):
         self.service = service
+        self.cache = cache
+        self.feed = feed
+        self.revision = revision
         self.db_session = db_session
 
     def execute(self, request: CreateMeasurementRequest) -> Measure:
         with self.db_session() as session:
             measure = self.service.create_measure(session=session, request=request)
             session.commit()
-            return measure
+        after_commit(lambda: self._published([measure]))
+        return measure
+
+    def _published(self, measures: List[Measure]):
+        self.cache.invalidate(measures)
+        self.revision.bump()
+        publish_measures(self.feed, measures)
+
+
+class CreateMeasurementListCommand:
+    def __init__(
+            self,
+            service: MeasurementService,
+            cache: MeasurementRangeCache,
+            feed: LiveFeed,
+            revision: Revision,
+            db_session: Callable[[], ContextManager[Session]]
+        ):
+        self.service = service
+        self.cache = cache
+        self.feed = feed
+        self.revision = revision
+        self.db_session = db_session
+
+    def execute(self, requests: List[CreateMeasurementRequest]) -> List[CreateMeasurementStatus]:
+        with self.db_session() as session:
+            measures, statuses = self.service.create_measures(session=session, requests=requests)
+            session.commit()
+        # Dentro de una unidad de trabajo, recien cuando el ciclo confirma
+        after_commit(lambda: self._published(measures))
+        return statuses
+
+    def _published(self, measures: List[Measure]):
+        self.cache.invalidate(measures)
+        self.revision.bump()
+        publish_measures(self.feed, measures)
 
 
 class DeviceMeasurementQueryUseCase:
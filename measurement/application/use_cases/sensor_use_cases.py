@@ -1,10 +1,11 @@
-from typing import Callable, ContextManager
+from typing import Callable, ContextManager, Optional
 
 from sqlalchemy.orm import Session
 
 from measurement.domain.model.aggregate import Measure, Sensor
-from measurement.domain.model.value_object import MeasureType
+from measurement.domain.model.value_object import MeasureType, Unit
 from measurement.infra.repository import SensorRepository
+from measurement.application.sensor_registry import SensorRegistry
 from measurement.domain.model.services.sensor_service import (
     CreateSensorRequest,
     SensorService
@@ -19,27 +20,31 @@ class GetSensorByIdRequest(BaseModel):
 
 
 class DeleteSensorCommand:
-    def __init__(self, service: SensorService, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(self, service: SensorService, registry: SensorRegistry, db_session: Callable[[], ContextManager[Session]]):
         self.service = service
+        self.registry = registry
         self.db_session = db_session
 
     def execute(self, request: GetSensorByIdRequest) -> Measure:
         with self.db_session() as session:
             measure = self.service.delete_sensor(session=session, request=request)
             session.commit()
-            return measure
+        self.registry.invalidate()
+        return measure
 
 
 class CreateSensorCommand:
-    def __init__(self, service: SensorService, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(self, service: SensorService, registry: SensorRegistry, db_session: Callable[[], ContextManager[Session]]):
         self.service = service
+        self.registry = registry
         self.db_session = db_session
 
     def execute(self, request: CreateSensorRequest) -> Measure:
         with self.db_session() as session:
             measure = self.service.create_sensor(session=session, request=request)
             session.commit()
-            return measure
+        self.registry.invalidate()
+        return measure
 
 
 class GetSensorRequest(BaseModel):
@@ -47,14 +52,19 @@ class GetSensorRequest(BaseModel):
 
 
 class SensorQueryUseCase:
-    def __init__(self, repo: SensorRepository, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(self, repo: SensorRepository, registry: SensorRegistry, db_session: Callable[[], ContextManager[Session]]):
         self.repo = repo
+        self.registry = registry
         self.db_session = db_session
 
-    def get_sensor(self, request: GetSensorRequest):
-        with self.db_session() as session:
-            sensor: Sensor = self.repo.find_sensor_by_measure_type(session=session, measure_type=request.measure_type)
-            return sensor
+    def get_sensor(self, request: GetSensorRequest) -> Optional[Sensor]:
+        return self.registry.get_sensor(measure_type=request.measure_type)
+
+    def get_unit(self, request: GetSensorRequest) -> Optional[Unit]:
+        return self.registry.get_unit(measure_type=request.measure_type)
+
+    def get_revision(self) -> int:
+        return self.registry.revision
         
     def get_all_sensor(self):
         with self.db_session() as session:
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from measurement.domain.model.value_object import MeasureType, Unit, SensorType
+from measurement.domain.model.value_object import MeasureType, Unit, SensorType, RollupResolution
 from shared_kernel.domain.entity import AggregateRoot, Aggregate
 
 
@@ -28,6 +28,59 @@ class Measure(AggregateRoot):
         )
 
 
+dataclass(eq=False)
+class LatestMeasure():
+    measure_type: MeasureType
+    detail: Optional[str]
+    value: float
+    created_at: datetime
+
+
+dataclass(eq=False)
+class MeasureRollup():
+    resolution: RollupResolution
+    measure_type: MeasureType
+    detail: Optional[str]
+    bucket_start: datetime
+    samples: int
+    min_value: float
+    max_value: float
+    sum_value: float
+    sum_squares: float
+
+
+@dataclass(frozen=True)
+class MeasureBucket:
+    measure_type: MeasureType
+    detail: Optional[str]
+    created_at: datetime
+    value: float
+    min_value: float
+    max_value: float
+    count: int
+    id: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class MeasureStats:
+    measure_type: MeasureType
+    detail: Optional[str]
+    count: int
+    min_value: float
+    max_value: float
+    mean: float
+    std: float
+    percentiles: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class MeasureSeries:
+    measure_type: MeasureType
+    detail: Optional[str]
+    timestamps: List[datetime]
+    values: List[float]
+
+
 # Sensor
 dataclass(eq=False)
 class MeasurementSpec(Aggregate):
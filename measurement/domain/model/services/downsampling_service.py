@@ -0,0 +1,155 @@
+from collections import defaultdict
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from measurement.domain.model.aggregate import Measure, MeasureBucket, MeasureRollup
+
+
+def to_epoch_seconds(timestamps: List) -> np.ndarray:
+    return np.array(timestamps, dtype="datetime64[us]").astype(np.int64) / 1e6
+
+
+def from_epoch_seconds(seconds: np.ndarray) -> List:
+    return np.round(seconds * 1e6).astype(np.int64).astype("datetime64[us]").astype(object).tolist()
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indexes of the `threshold` points (x sorted) that best keep the shape.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    edges = np.append((np.arange(threshold - 1) * every).astype(np.int64) + 1, n)
+
+    # Promedio de cada bucket en O(1) usando sumas acumuladas
+    cumulative_x = np.concatenate(([0.0], np.cumsum(x)))
+    cumulative_y = np.concatenate(([0.0], np.cumsum(y)))
+    sizes = edges[1:] - edges[:-1]
+    average_x = (cumulative_x[edges[1:]] - cumulative_x[edges[:-1]]) / sizes
+    average_y = (cumulative_y[edges[1:]] - cumulative_y[edges[:-1]]) / sizes
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        areas = np.abs(
+            (x[a] - average_x[i + 1]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (average_y[i + 1] - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def bucket_aggregate(
+        x: np.ndarray,
+        y: np.ndarray,
+        width: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Groups sorted points in buckets of `width` seconds aligned to the epoch.
+    Returns (bucket_start, mean, min, max, count) per non empty bucket.
+    """
+    if len(x) == 0:
+        empty = np.empty(0)
+        return empty, empty, empty, empty, empty.astype(np.int64)
+
+    keys = np.floor(x / width).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(x)])
+    sums = np.add.reduceat(y, starts)
+    return (
+        keys[starts] * width,
+        sums / counts,
+        np.minimum.reduceat(y, starts),
+        np.maximum.reduceat(y, starts),
+        counts,
+    )
+
+
+def downsample(
+        measures: List[Measure],
+        max_points: Optional[int] = None,
+        bucket: Optional[int] = None
+    ) -> List[Union[Measure, MeasureBucket]]:
+    """
+    Reduces every detail of the range independently. `bucket` (seconds) aggregates
+    min/max/avg per bucket, `max_points` keeps at most that many points per detail with LTTB.
+    """
+    groups = defaultdict(list)
+    for measure in measures:
+        groups[measure.detail].append(measure)
+
+    result = []
+    for detail, group in groups.items():
+        x = to_epoch_seconds([m.created_at for m in group])
+        y = np.fromiter((m.value for m in group), dtype=float, count=len(group))
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+
+        if bucket:
+            starts, means, mins, maxs, counts = bucket_aggregate(x, y, bucket)
+            result.extend(_to_buckets(group[0].measure_type, detail, starts, means, mins, maxs, counts, max_points))
+        else:
+            result.extend(group[order[i]] for i in lttb_indices(x, y, max_points))
+
+    result.sort(key=lambda m: m.created_at)
+    return result
+
+
+def downsample_rollups(
+        rollups: List[MeasureRollup],
+        max_points: Optional[int] = None,
+        bucket: Optional[int] = None
+    ) -> List[MeasureBucket]:
+    """
+    Same contract as `downsample` but over precomputed rollups (sorted by bucket_start),
+    merging them into wider buckets when `bucket` is coarser than their resolution.
+    """
+    groups = defaultdict(list)
+    for rollup in rollups:
+        groups[rollup.detail].append(rollup)
+
+    result = []
+    for detail, group in groups.items():
+        starts = to_epoch_seconds([r.bucket_start for r in group])
+        counts = np.fromiter((r.samples for r in group), dtype=np.int64, count=len(group))
+        mins = np.fromiter((r.min_value for r in group), dtype=float, count=len(group))
+        maxs = np.fromiter((r.max_value for r in group), dtype=float, count=len(group))
+        sums = np.fromiter((r.sum_value for r in group), dtype=float, count=len(group))
+
+        if bucket:
+            keys = np.floor(starts / bucket).astype(np.int64)
+            edges = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            starts = keys[edges] * bucket
+            counts = np.add.reduceat(counts, edges)
+            mins = np.minimum.reduceat(mins, edges)
+            maxs = np.maximum.reduceat(maxs, edges)
+            sums = np.add.reduceat(sums, edges)
+
+        result.extend(_to_buckets(group[0].measure_type, detail, starts, sums / counts, mins, maxs, counts, max_points))
+
+    result.sort(key=lambda m: m.created_at)
+    return result
+
+
+def _to_buckets(measure_type, detail, starts, means, mins, maxs, counts, max_points) -> List[MeasureBucket]:
+    keep = lttb_indices(starts, means, max_points) if max_points else np.arange(len(starts))
+    created_at = from_epoch_seconds(starts[keep])
+    return [
+        MeasureBucket(
+            measure_type=measure_type,
+            detail=detail,
+            created_at=created_at[k],
+            value=float(means[i]),
+            min_value=float(mins[i]),
+            max_value=float(maxs[i]),
+            count=int(counts[i]),
+        )
+        for k, i in enumerate(keep)
+    ]
@@ -1,5 +1,6 @@
+import math
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
@@ -17,6 +18,12 @@ class CreateMeasurementRequest(BaseModel):
     date_time: Optional[datetime] = None
 
 
+class CreateMeasurementStatus(BaseModel):
+    index: int
+    created: bool
+    error: Optional[str] = None
+
+
 class MeasurementService:
     def __init__(self, repo: MeasurementRepository):
         self.repo = repo
@@ -29,4 +36,32 @@ class MeasurementService:
             created_at=request.date_time
         ) 
         self.repo.add(instance=measure, session=session)
+        self.repo.upsert_latest(instances=[measure], session=session)
+        self.repo.upsert_rollups(instances=[measure], session=session)
         return measure
+
+    def create_measures(
+            self,
+            session: Session,
+            requests: List[CreateMeasurementRequest]
+        ) -> Tuple[List[Measure], List[CreateMeasurementStatus]]:
+        measures = []
+        statuses = []
+        for index, request in enumerate(requests):
+            # SQLite guarda NaN como NULL y haria fallar todo el lote
+            if not math.isfinite(request.value):
+                statuses.append(CreateMeasurementStatus(index=index, created=False, error="Value must be a finite number"))
+                continue
+            measures.append(Measure.create(
+                value= request.value,
+                measure_type= request.measure_type,
+                detail= request.detail,
+                created_at=request.date_time
+            ))
+            statuses.append(CreateMeasurementStatus(index=index, created=True))
+
+        if measures:
+            self.repo.add_all(instances=measures, session=session)
+            self.repo.upsert_latest(instances=measures, session=session)
+            self.repo.upsert_rollups(instances=measures, session=session)
+        return measures, statuses
@@ -0,0 +1,77 @@
+import math
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from measurement.domain.model.aggregate import MeasureStats
+from measurement.domain.model.value_object import MeasureType
+
+
+def percentile_key(percentile: float) -> str:
+    return f"p{percentile:g}"
+
+
+def stats_from_aggregates(
+        measure_type: MeasureType,
+        detail: Optional[str],
+        count: int,
+        min_value: float,
+        max_value: float,
+        sum_value: float,
+        sum_squares: float
+    ) -> MeasureStats:
+    """
+    Population statistics from SQL / rollup aggregates (count, min, max, sum, sum of squares).
+    """
+    mean = sum_value / count
+    # Redondeo: la varianza por sumas puede quedar apenas por debajo de 0
+    variance = max(sum_squares / count - mean * mean, 0.0)
+    return MeasureStats(
+        measure_type=measure_type,
+        detail=detail,
+        count=count,
+        min_value=min_value,
+        max_value=max_value,
+        mean=mean,
+        std=math.sqrt(variance),
+    )
+
+
+def stats_from_values(
+        measure_type: MeasureType,
+        detail: Optional[str],
+        values: np.ndarray,
+        percentiles: Optional[Sequence[float]] = None
+    ) -> MeasureStats:
+    percentiles = list(percentiles or [])
+    results = np.percentile(values, percentiles) if percentiles else []
+    return MeasureStats(
+        measure_type=measure_type,
+        detail=detail,
+        count=len(values),
+        min_value=float(values.min()),
+        max_value=float(values.max()),
+        mean=float(values.mean()),
+        std=float(values.std()),
+        percentiles={percentile_key(p): float(r) for p, r in zip(percentiles, results)},
+    )
+
+
+def stats_by_detail(
+        measure_type: MeasureType,
+        details: np.ndarray,
+        values: np.ndarray,
+        percentiles: Optional[Sequence[float]] = None
+    ) -> List[MeasureStats]:
+    """
+    Statistics of every detail from parallel arrays sorted by detail.
+    """
+    if len(values) == 0:
+        return []
+
+    starts = np.flatnonzero(np.r_[True, details[1:] != details[:-1]])
+    ends = np.r_[starts[1:], len(values)]
+    return [
+        stats_from_values(measure_type, details[start], values[start:end], percentiles)
+        for start, end in zip(starts, ends)
+    ]
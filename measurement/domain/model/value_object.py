@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from shared_kernel.domain.value_object import ValueObject
 import enum
 
@@ -98,3 +99,53 @@ class SensorType(ValueObject, str, enum.Enum):
                 MeasureType.TOOL_VOLTAGE
             ]
         return []
+
+
+class RollupResolution(ValueObject, str, enum.Enum):
+    MINUTE = "MINUTE"
+    HOUR = "HOUR"
+    DAY = "DAY"
+
+    @property
+    def seconds(self) -> int:
+        if self == RollupResolution.MINUTE:
+            return 60
+        elif self == RollupResolution.HOUR:
+            return 3600
+        return 86400
+
+    def truncate(self, value: datetime) -> datetime:
+        if self == RollupResolution.MINUTE:
+            return value.replace(second=0, microsecond=0)
+        elif self == RollupResolution.HOUR:
+            return value.replace(minute=0, second=0, microsecond=0)
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def coarsest_for(
+            cls,
+            window_seconds: float,
+            max_points: Optional[int] = None,
+            bucket: Optional[int] = None
+        ) -> Optional[RollupResolution]:
+        """
+        Coarsest resolution that still gives the requested detail: a `bucket` must be a
+        multiple of it, otherwise the window must hold at least `max_points` buckets.
+        """
+        for resolution in (cls.DAY, cls.HOUR, cls.MINUTE):
+            if bucket:
+                if bucket % resolution.seconds == 0:
+                    return resolution
+            elif max_points and window_seconds / max_points >= resolution.seconds:
+                return resolution
+        return None
+
+    @classmethod
+    def aligned_to(cls, value: datetime) -> Optional[RollupResolution]:
+        """
+        Coarsest resolution with a bucket starting exactly at `value`.
+        """
+        for resolution in (cls.DAY, cls.HOUR, cls.MINUTE):
+            if resolution.truncate(value) == value:
+                return resolution
+        return None
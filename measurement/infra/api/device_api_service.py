@@ -7,6 +7,10 @@ from measurement.domain.model.value_object import SensorType
 from shared_kernel.infra import logger
 from measurement.infra.api.response import MeasureDeviceResponse
 
+class DeviceCommunicationError(Exception):
+    pass
+
+
 def retry_request(max_retries=3, delay=2):
     def decorator(func):
         @wraps(func)
@@ -22,7 +26,7 @@ def retry_request(max_retries=3, delay=2):
                         time.sleep(delay)
                     else:
                         logger.logger.error(f"Max retries reached for {func.__name__}. Raising exception.")
-                        raise Exception(f"Failed to fetch data after {max_retries} attempts.") from e
+                        raise DeviceCommunicationError(f"Failed to fetch data after {max_retries} attempts.") from e
         return wrapper
     return decorator
 
@@ -4,25 +4,45 @@ from measurement.infra.repository import MeasurementRepository, SensorRepository
 from measurement.application.use_cases.measurement_use_cases import (
     MeasurementQueryUseCase,
     CreateMeasurementCommand,
+    CreateMeasurementListCommand,
 )
 
 from measurement.application.use_cases.sensor_use_cases import (
     SensorQueryUseCase, DeleteSensorCommand, CreateSensorCommand
 )
 
+from measurement.application.range_cache import MeasurementRangeCache
+from measurement.application.sensor_registry import SensorRegistry
 from measurement.domain.model.services.measurement_service import MeasurementService
 from measurement.domain.model.services.sensor_service import SensorService
 
 from shared_kernel.infra.database.connection import get_db_session
+from shared_kernel.infra.live_feed import LiveFeed
+from shared_kernel.infra.revision import Revision
+from shared_kernel.infra.fastapi.config import settings
 
 
 class MeasurementContainer(containers.DeclarativeContainer):
     # Measurement
     repo = providers.Factory(MeasurementRepository)
 
+    # Compartido con los comandos de escritura (tambien los del worker), que lo invalidan
+    range_cache = providers.Singleton(
+        MeasurementRangeCache,
+        max_bytes=settings.MEASUREMENT_CACHE_MAX_BYTES,
+    )
+
+    # Difusion en vivo de medidas y alarmas; la comparten alarming y el worker
+    live_feed = providers.Singleton(LiveFeed)
+
+    # Version de los datos de medidas para los ETag; la avanzan los comandos al confirmar
+    measurement_revision = providers.Singleton(Revision)
+
     query = providers.Factory(
         MeasurementQueryUseCase,
         repo=repo,
+        cache=range_cache,
+        revision=measurement_revision,
         db_session=get_db_session,
     )
 
@@ -34,12 +54,31 @@ class MeasurementContainer(containers.DeclarativeContainer):
     create_measurement_command = providers.Factory(
         CreateMeasurementCommand,
         service=service,
+        cache=range_cache,
+        feed=live_feed,
+        revision=measurement_revision,
+        db_session=get_db_session,
+    )
+
+    create_measurement_list_command = providers.Factory(
+        CreateMeasurementListCommand,
+        service=service,
+        cache=range_cache,
+        feed=live_feed,
+        revision=measurement_revision,
         db_session=get_db_session,
     )
 
     # Sensor
     sensor_repo = providers.Factory(SensorRepository)
 
+    # Un solo registro por proceso, invalidado por los comandos de sensor
+    sensor_registry = providers.Singleton(
+        SensorRegistry,
+        repo=sensor_repo,
+        db_session=get_db_session,
+    )
+
     sensor_service = providers.Factory(
         SensorService,
         repo=sensor_repo
@@ -48,17 +87,20 @@ class MeasurementContainer(containers.DeclarativeContainer):
     sensor_query = providers.Factory(
         SensorQueryUseCase,
         repo=sensor_repo,
+        registry=sensor_registry,
         db_session=get_db_session,
     )
 
     delete_sensor_command = providers.Factory(
         DeleteSensorCommand,
         service=sensor_service,
+        registry=sensor_registry,
         db_session=get_db_session,
     )
 
     create_sensor_command = providers.Factory(
         CreateSensorCommand,
         service=sensor_service,
+        registry=sensor_registry,
         db_session=get_db_session,
     )
\ No newline at end of file
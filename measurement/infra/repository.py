@@ -1,13 +1,23 @@
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session, Query, joinedload
 
 from datetime import datetime, timedelta
-from measurement.domain.model.aggregate import Measure, MeasureType, Sensor, MeasurementSpec
+from measurement.domain.model.aggregate import Measure, LatestMeasure, MeasureRollup, MeasureType, Sensor, MeasurementSpec
+from measurement.domain.model.value_object import RollupResolution
 
+from shared_kernel.infra.database.orm import (
+    latest_measures_table, measure_rollups_table, measures_table, series_table
+)
 from shared_kernel.infra.database.repository import RDBRepository
 
-from sqlalchemy import func, and_
-from sqlalchemy.orm import aliased
+from sqlalchemy import Integer, Select, func, or_, select, tuple_, type_coerce
+from sqlalchemy.dialects.sqlite import insert
+
+# Medidas con su serie resuelta: las consultas filtran por series y recorren (series_id, created_at)
+measures_with_series = measures_table.join(series_table, measures_table.c.series_id == series_table.c.id)
+rollups_with_series = measure_rollups_table.join(series_table, measure_rollups_table.c.series_id == series_table.c.id)
+
 
 class MeasurementRepository(RDBRepository):
 
@@ -25,57 +35,357 @@ class MeasurementRepository(RDBRepository):
 
         return query.all()
 
+    @staticmethod
+    def find_page(
+            session: Session,
+            measure_type: MeasureType,
+            start_date: datetime,
+            end_date: datetime,
+            detail,
+            limit: int,
+            after: Optional[Tuple[datetime, int]] = None
+        ) -> List[Measure]:
+        # Rango semiabierto [start_date, end_date), sin redondear end_date
+        query = session.query(Measure).filter(
+            Measure.measure_type == measure_type,
+            Measure.created_at >= start_date,
+            Measure.created_at < end_date,
+        )
+
+        if detail and detail != "Todos":
+            query = query.filter(Measure.detail == detail)
+
+        if after:
+            # Tupla simple: los parametros toman el tipo de cada columna (created_at en milisegundos)
+            query = query.filter(tuple_(Measure.created_at, Measure.id) > tuple(after))
+
+        return query.order_by(Measure.created_at, Measure.id).limit(limit).all()
+
+    @staticmethod
+    def find_rows_by_sensor_type_detail_and_date_range(
+            session: Session,
+            measure_type: MeasureType,
+            start_date: datetime,
+            end_date: datetime,
+            detail
+        ) -> List[Row]:
+        # Tuplas planas: sin hidratar entidades del ORM ni sus composites
+        statement = MeasurementRepository._range_statement(measure_type, start_date, end_date, detail)
+        return session.execute(statement).all()
+
+    @staticmethod
+    def stream_by_sensor_type_detail_and_date_range(
+            session: Session,
+            measure_type: MeasureType,
+            start_date: datetime,
+            end_date: datetime,
+            detail,
+            batch_size: int = 1000
+        ) -> Iterator[Sequence[Row]]:
+        statement = MeasurementRepository._range_statement(measure_type, start_date, end_date, detail)
+        statement = statement.execution_options(yield_per=batch_size)
+        return session.execute(statement).partitions()
+
+    @staticmethod
+    def stream_epoch_values(
+            session: Session,
+            measure_type: MeasureType,
+            detail: Optional[str],
+            start_date: datetime,
+            end_date: datetime,
+            batch_size: int = 50000
+        ) -> Iterator[Sequence[Row]]:
+        """
+        (created_at in epoch ms, value) of one series in [start_date, end_date), in time
+        order and in batches. created_at is read raw, without building datetimes.
+        """
+        columns = measures_table.c
+        statement = select(type_coerce(columns.created_at, Integer), columns.value).select_from(
+            measures_with_series
+        ).where(
+            series_table.c.measure_type == measure_type,
+            series_table.c.detail == (detail or ""),
+            columns.created_at >= start_date,
+            columns.created_at < end_date,
+        ).order_by(columns.created_at, columns.id)
+        return session.execute(statement.execution_options(yield_per=batch_size)).partitions()
+
+    @staticmethod
+    def _range_statement(measure_type: MeasureType, start_date: datetime, end_date: datetime, detail) -> Select:
+        end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+        columns = measures_table.c
+        statement = select(
+            columns.id, columns.created_at, series_table.c.measure_type, series_table.c.detail, columns.value
+        ).select_from(measures_with_series).where(
+            series_table.c.measure_type == measure_type,
+            columns.created_at >= start_date,
+            columns.created_at <= end_date,
+        )
+
+        if detail and detail != "Todos":
+            statement = statement.where(series_table.c.detail == detail)
+
+        return statement.order_by(columns.created_at, columns.id)
+
+    @staticmethod
+    def find_rows_by_series(
+            session: Session,
+            series: List[Tuple[MeasureType, Optional[str]]],
+            start_date: datetime,
+            end_date: datetime
+        ) -> List[Row]:
+        """
+        (measure_type, detail, created_at, value) of every requested series, in one
+        scan ordered by series and time. A series without detail covers the whole type.
+        """
+        end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+        columns = measures_table.c
+        keys = series_table.c
+        conditions = [
+            keys.measure_type == measure_type if detail is None else tuple_(keys.measure_type, keys.detail) == (measure_type, detail)
+            for measure_type, detail in series
+        ]
+
+        statement = select(keys.measure_type, keys.detail, columns.created_at, columns.value).select_from(
+            measures_with_series
+        ).where(
+            or_(*conditions),
+            columns.created_at >= start_date,
+            columns.created_at <= end_date,
+        )
+        return session.execute(statement.order_by(keys.measure_type, keys.detail, columns.created_at)).all()
+
+    @staticmethod
+    def aggregate_by_detail(
+            session: Session,
+            measure_type: MeasureType,
+            start_date: datetime,
+            end_date: datetime,
+            details: Optional[List[str]] = None
+        ) -> List[Row]:
+        columns = measures_table.c
+        detail = series_table.c.detail
+        statement = select(
+            detail,
+            func.count(columns.value).label("samples"),
+            func.min(columns.value).label("min_value"),
+            func.max(columns.value).label("max_value"),
+            func.sum(columns.value).label("sum_value"),
+            func.sum(columns.value * columns.value).label("sum_squares"),
+        ).select_from(measures_with_series).where(
+            series_table.c.measure_type == measure_type,
+            columns.created_at >= start_date,
+            columns.created_at <= end_date,
+        )
+
+        if details:
+            statement = statement.where(detail.in_(details))
+
+        return session.execute(statement.group_by(detail).order_by(detail)).all()
+
+    @staticmethod
+    def aggregate_rollups_by_detail(
+            session: Session,
+            resolution: RollupResolution,
+            measure_type: MeasureType,
+            start_date: datetime,
+            end_date: datetime,
+            details: Optional[List[str]] = None
+        ) -> List[Row]:
+        columns = measure_rollups_table.c
+        detail = series_table.c.detail
+        statement = select(
+            detail,
+            func.sum(columns.samples).label("samples"),
+            func.min(columns.min_value).label("min_value"),
+            func.max(columns.max_value).label("max_value"),
+            func.sum(columns.sum_value).label("sum_value"),
+            func.sum(columns.sum_squares).label("sum_squares"),
+        ).select_from(rollups_with_series).where(
+            columns.resolution == resolution,
+            series_table.c.measure_type == measure_type,
+            columns.bucket_start >= start_date,
+            columns.bucket_start <= end_date,
+        )
+
+        if details:
+            statement = statement.where(detail.in_(details))
+
+        return session.execute(statement.group_by(detail).order_by(detail)).all()
+
+    @staticmethod
+    def find_values_by_detail(
+            session: Session,
+            measure_type: MeasureType,
+            start_date: datetime,
+            end_date: datetime,
+            details: Optional[List[str]] = None
+        ) -> List[Row]:
+        columns = measures_table.c
+        detail = series_table.c.detail
+        statement = select(detail, columns.value).select_from(measures_with_series).where(
+            series_table.c.measure_type == measure_type,
+            columns.created_at >= start_date,
+            columns.created_at <= end_date,
+        )
+
+        if details:
+            statement = statement.where(detail.in_(details))
+
+        return session.execute(statement.order_by(detail)).all()
+
     @staticmethod
     def find_by_time_delta(session: Session, measure_type: MeasureType, minutes_ago: int, detail):
         time_limit = datetime.now() - timedelta(minutes=minutes_ago)
         return (
             session.query(Measure)
-            .filter(Measure.measure_type == measure_type, Measure.detail == detail ,Measure.created_at <= time_limit)
+            .filter(Measure.measure_type == measure_type, Measure.detail == (detail or ""), Measure.created_at <= time_limit)
             .order_by(Measure.created_at.desc())
             .first()
         )
 
     @staticmethod
-    def find_latest_records_for_all_measure_types(session: Session):
-        MeasureAlias = aliased(Measure)
+    def find_latest_records_for_all_measure_types(session: Session) -> List[LatestMeasure]:
+        return session.query(LatestMeasure).all()
 
-        measure_types = session.query(Measure.measure_type).distinct().all()
+    @staticmethod
+    def upsert_latest(session: Session, instances: List[Measure]):
+        # Solo la medida mas reciente de cada serie del lote; series_id lo fija add/add_all
+        latest = {}
+        for instance in instances:
+            key = instance.series_id
+            if key not in latest or instance.created_at >= latest[key].created_at:
+                latest[key] = instance
 
-        latest_records = []
+        statement = insert(latest_measures_table)
+        # Una insercion con fecha anterior no reemplaza el ultimo valor conocido
+        statement = statement.on_conflict_do_update(
+            index_elements=[latest_measures_table.c.series_id],
+            set_={
+                "value": statement.excluded.value,
+                "created_at": statement.excluded.created_at,
+            },
+            where=statement.excluded.created_at >= latest_measures_table.c.created_at,
+        )
+        session.execute(statement, [
+            {
+                "series_id": series_id,
+                "value": instance.value,
+                "created_at": instance.created_at,
+            }
+            for series_id, instance in latest.items()
+        ])
 
-        for measure_type in measure_types:
-            measure_type_value = measure_type[0]
+    @staticmethod
+    def find_rollups(
+            session: Session,
+            resolution: RollupResolution,
+            measure_type: MeasureType,
+            start_date: datetime,
+            end_date: datetime,
+            detail
+        ) -> List[MeasureRollup]:
+        query = session.query(MeasureRollup).filter(
+            MeasureRollup.resolution == resolution,
+            MeasureRollup.measure_type == measure_type,
+            MeasureRollup.bucket_start >= start_date,
+            MeasureRollup.bucket_start <= end_date,
+        )
 
-            details = session.query(Measure.detail).filter(
-                Measure.measure_type == measure_type_value
-            ).distinct().all()
+        if detail and detail != "Todos":
+            query = query.filter(MeasureRollup.detail == detail)
 
-            for detail in details:
-                detail_value = detail[0]
+        return query.order_by(MeasureRollup.bucket_start).all()
 
-                latest_record = session.query(Measure).filter(
-                    and_(
-                        Measure.measure_type == measure_type_value,
-                        Measure.detail == detail_value,
-                        Measure.created_at == session.query(
-                            func.max(MeasureAlias.created_at)
-                        ).filter(
-                            and_(
-                                MeasureAlias.measure_type == measure_type_value,
-                                MeasureAlias.detail == detail_value
-                            )
-                        )
-                    )
-                ).one_or_none()
+    @staticmethod
+    def upsert_rollups(session: Session, instances: List[Measure]):
+        # Se agrega primero en memoria: una fila por bucket afectado del lote
+        buckets = {}
+        for instance in instances:
+            for resolution in RollupResolution:
+                key = (resolution, instance.series_id, resolution.truncate(instance.created_at))
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = [1, instance.value, instance.value, instance.value, instance.value * instance.value]
+                else:
+                    bucket[0] += 1
+                    bucket[1] = min(bucket[1], instance.value)
+                    bucket[2] = max(bucket[2], instance.value)
+                    bucket[3] += instance.value
+                    bucket[4] += instance.value * instance.value
 
-                if latest_record:
-                    latest_records.append(latest_record)
+        statement = insert(measure_rollups_table)
+        columns = measure_rollups_table.c
+        statement = statement.on_conflict_do_update(
+            index_elements=[columns.resolution, columns.series_id, columns.bucket_start],
+            set_={
+                "samples": columns.samples + statement.excluded.samples,
+                "min_value": func.min(columns.min_value, statement.excluded.min_value),
+                "max_value": func.max(columns.max_value, statement.excluded.max_value),
+                "sum_value": columns.sum_value + statement.excluded.sum_value,
+                "sum_squares": columns.sum_squares + statement.excluded.sum_squares,
+            },
+        )
+        session.execute(statement, [
+            {
+                "resolution": resolution,
+                "series_id": series_id,
+                "bucket_start": bucket_start,
+                "samples": samples,
+                "min_value": min_value,
+                "max_value": max_value,
+                "sum_value": sum_value,
+                "sum_squares": sum_squares,
+            }
+            for (resolution, series_id, bucket_start), (samples, min_value, max_value, sum_value, sum_squares)
+            in buckets.items()
+        ])
+
+    @staticmethod
+    def find_series_ids(session: Session, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """
+        Id of every (measure_type, detail) in `keys`, creating the missing series.
+        """
+        keys = set(keys)
+        columns = series_table.c
+        statement = insert(series_table).on_conflict_do_nothing(
+            index_elements=[columns.measure_type, columns.detail]
+        )
+        session.execute(statement, [{"measure_type": m, "detail": d} for m, d in keys])
+
+        rows = session.execute(
+            select(columns.id, columns.measure_type, columns.detail).where(
+                tuple_(columns.measure_type, columns.detail).in_(keys)
+            )
+        )
+        return {(r.measure_type, r.detail or ""): r.id for r in rows}
+
+    @staticmethod
+    def add_all(session: Session, instances: List[Measure]):
+        keys = [(instance.measure_type, instance.detail or "") for instance in instances]
+        series_ids = MeasurementRepository.find_series_ids(session=session, keys=keys)
+        for key, instance in zip(keys, instances):
+            instance.series_id = series_ids[key]
+        session.execute(insert(measures_table), [
+            {
+                "series_id": instance.series_id,
+                "created_at": instance.created_at,
+                "value": instance.value,
+            }
+            for instance in instances
+        ])
+        return instances
 
-        return latest_records
-    
     @staticmethod
     def add(session: Session, instance: Measure):
-        session.add(instance)
+        key = (instance.measure_type, instance.detail or "")
+        instance.series_id = MeasurementRepository.find_series_ids(session=session, keys=[key])[key]
+        result = session.execute(insert(measures_table).values(
+            series_id=instance.series_id,
+            created_at=instance.created_at,
+            value=instance.value,
+        ))
+        instance.id = result.inserted_primary_key[0]
         return instance
     
     
@@ -1,3 +1,4 @@
+import enum
 from pydantic import BaseModel
 from typing import List
 
@@ -9,4 +10,8 @@ class UpdateMeasurementSpecDTO(BaseModel):
 
 class UpdateSensorDTO(BaseModel):
     sensor_id: int
-    measurement_specs: List[UpdateMeasurementSpecDTO]
\ No newline at end of file
+    measurement_specs: List[UpdateMeasurementSpecDTO]
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
@@ -1,20 +1,26 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from pydantic import BaseModel
 
 from measurement.domain.model.value_object import MeasureType, SensorType, Unit
+from measurement.domain.model.services.measurement_service import CreateMeasurementStatus
+from measurement.application.range_cache import RangeCacheStats
 from shared_kernel.presentation.response import BaseResponse
 import enum
 
 
 class MeasurementSchema(BaseModel):
-    id: int
+    id: Optional[int] = None
     value: float
     created_at: datetime
     measure_type: MeasureType
     unit: Optional[str] = None
     detail: Optional[str] = None
+    # Solo presentes cuando el rango se agrupa por bucket
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    count: Optional[int] = None
 
     class Config:
         orm_mode = True
@@ -24,6 +30,29 @@ class MeasurementSchema(BaseModel):
         }
 
 
+class MeasurementStatsSchema(BaseModel):
+    measure_type: MeasureType
+    detail: Optional[str] = None
+    unit: Optional[str] = None
+    count: int
+    min_value: float
+    max_value: float
+    mean: float
+    std: float
+    percentiles: Dict[str, float] = {}
+
+    class Config:
+        from_attributes=True
+
+
+class MeasurementSeriesSchema(BaseModel):
+    measure_type: MeasureType
+    detail: Optional[str] = None
+    unit: Optional[str] = None
+    timestamps: List[datetime]
+    values: List[float]
+
+
 class SensorTypeResponse(BaseResponse):
     result:  List[SensorType]
 
@@ -65,6 +94,22 @@ class SensorResponse(BaseResponse):
 class MeasurementResponse(BaseResponse):
     result: List[MeasurementSchema] = None
 
+class MeasurementPageResponse(BaseResponse):
+    result: List[MeasurementSchema]
+    next_cursor: Optional[str] = None
+
+class MeasurementListResponse(BaseResponse):
+    result: List[CreateMeasurementStatus]
+
+class MeasurementStatsResponse(BaseResponse):
+    result: List[MeasurementStatsSchema]
+
+class MeasurementSeriesResponse(BaseResponse):
+    result: List[MeasurementSeriesSchema]
+
+class RangeCacheStatsResponse(BaseResponse):
+    result: RangeCacheStats
+
 class MeasurementResponse2(BaseResponse):
     result: Optional[MeasurementSchema] = None
 
@@ -1,29 +1,43 @@
+import asyncio
+import csv
+import io
+import json
 import random
-from typing import Any
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, Sequence, Tuple
+from typing import List, Optional, Union
 from datetime import datetime
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocket, WebSocketDisconnect, WebSocketException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Row
 
 from measurement.domain.model.services.measurement_service import CreateMeasurementRequest
 from measurement.domain.model.services.sensor_service import CreateSensorRequest
 from measurement.domain.model.value_object import MeasureType, SensorType, Unit
-from measurement.domain.model.aggregate import Measure, Sensor
+from measurement.domain.model.aggregate import Measure, MeasureBucket, MeasureSeries, Sensor
+from measurement.presentation.request import ExportFormat
 from measurement.presentation.response import (
-    MeasurementResponse, MeasurementResponse2, MeasurementSchema,
+    MeasurementResponse, MeasurementResponse2, MeasurementSchema, MeasurementPageResponse, MeasurementListResponse,
+    MeasurementStatsResponse, MeasurementStatsSchema, MeasurementSeriesResponse, RangeCacheStatsResponse,
     LastMeasurementResponse, LastMeasurementSchema,
     SensorResponse, SensorSchema, MeasurementSpecSchema,
     SensorTypeResponse, SensorsResponse, MeasureTypeResponse,
     UnitResponse, UnitSchema, get_last_measurement_id
 )
 from measurement.application.use_cases.measurement_use_cases import (
-    MeasurementQueryUseCase, GetMeasurementRequest, GetMeasurementByTimeDeltaRequest,
-    CreateMeasurementCommand,
+    MeasurementQueryUseCase, GetMeasurementRequest, GetMeasurementByTimeDeltaRequest, GetMeasurementPageRequest,
+    GetMeasurementStatsRequest, GetMeasurementSeriesRequest,
+    CreateMeasurementCommand, CreateMeasurementListCommand,
 )
 from measurement.application.use_cases.sensor_use_cases import (
     CreateSensorCommand, GetSensorByIdRequest, SensorQueryUseCase, GetSensorRequest, DeleteSensorCommand
 )
 from shared_kernel.infra.container import AppContainer
+from shared_kernel.infra.live_feed import LiveFeed, LiveSubscription
+from shared_kernel.presentation.cursor import decode_cursor, encode_cursor
+from shared_kernel.presentation.conditional import (
+    conditional_response, precompute, precomputed_response, version_etag
+)
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/measurement", tags=['measurement'])
@@ -31,7 +45,7 @@ router = APIRouter(prefix="/measurement", tags=['measurement'])
 # Mapper functions
 
 
-def map_measurements_to_schema(measurements: List[Measure], unit: UnitSchema) -> List[MeasurementSchema]:
+def map_measurements_to_schema(measurements: List[Union[Measure, MeasureBucket]], unit: UnitSchema) -> List[MeasurementSchema]:
     measurements_schema = [
         MeasurementSchema.from_orm(m)
         for m in measurements
@@ -59,6 +73,129 @@ def map_sensor_to_schema(sensor: Sensor) -> SensorSchema:
 def map_unit_schemas(units: List[Unit]) -> List[UnitSchema]:
     return [UnitSchema(name=u.name, value=u) for u in units]
 
+
+def find_unit(sensor_query: SensorQueryUseCase, measure_type: MeasureType) -> Optional[str]:
+    return sensor_query.get_unit(GetSensorRequest(measure_type=measure_type))
+
+
+EXPORT_COLUMNS = ["id", "created_at", "measure_type", "detail", "value", "unit"]
+
+
+def stream_csv(batches: Iterator[Sequence[Row]], unit: Optional[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    unit_value = unit or ""
+    for batch in batches:
+        writer.writerows(
+            (r.id, r.created_at.isoformat(), r.measure_type, r.detail, r.value, unit_value)
+            for r in batch
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def stream_ndjson(batches: Iterator[Sequence[Row]], unit: Optional[str]) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(
+            json.dumps({
+                "id": r.id,
+                "created_at": r.created_at.isoformat(),
+                "measure_type": r.measure_type,
+                "detail": r.detail,
+                "value": r.value,
+                "unit": unit,
+            }) + "\n"
+            for r in batch
+        )
+
+
+def encode_measurement_rows(rows: Sequence[Row], unit: Optional[str]) -> bytes:
+    """
+    Same JSON body as MeasurementResponse, built from (id, created_at, measure_type, detail, value) rows.
+    """
+    return json.dumps({
+        "detail": "ok",
+        "result": [
+            {
+                "id": r[0],
+                "value": r[4],
+                "created_at": r[1].isoformat(),
+                "measure_type": r[2],
+                "unit": unit,
+                "detail": r[3],
+                "min_value": None,
+                "max_value": None,
+                "count": None,
+            }
+            for r in rows
+        ],
+    }, separators=(",", ":")).encode()
+
+
+def parse_series_key(key: str) -> Tuple[MeasureType, Optional[str]]:
+    """
+    'PRESSURE:Pi' -> (PRESSURE, 'Pi'); 'TOOL_CURRENT:' is the empty detail and a
+    bare 'VIBRATION' selects every detail of the type.
+    """
+    measure_type, separator, detail = key.partition(":")
+    try:
+        return MeasureType(measure_type), detail if separator else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid series {key}")
+
+
+def encode_measurement_series(series: List[MeasureSeries], units: Dict[MeasureType, Optional[str]]) -> bytes:
+    return json.dumps({
+        "detail": "ok",
+        "result": [
+            {
+                "measure_type": s.measure_type.value,
+                "detail": s.detail,
+                "unit": units[s.measure_type],
+                "timestamps": [t.isoformat() for t in s.timestamps],
+                "values": s.values,
+            }
+            for s in series
+        ],
+    }, separators=(",", ":")).encode()
+
+
+LIVE_KEEPALIVE_SECONDS = 15
+
+
+def live_kinds(alarms: bool) -> Tuple[str, ...]:
+    return ("measure", "alarm") if alarms else ("measure",)
+
+
+async def stream_live_events(feed: LiveFeed, subscription: LiveSubscription) -> AsyncIterator[str]:
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), timeout=LIVE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Comentario SSE: mantiene abierta la conexion a traves de proxies
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {message.kind}\ndata: {message.data}\n\n"
+    finally:
+        feed.unsubscribe(subscription)
+
+
+# Catalogos fijos: se serializan una sola vez al importar el modulo
+UNITS_BY_MEASURE_TYPE = {
+    measure_type: precompute(UnitResponse(detail="ok", result=map_unit_schemas(MeasureType.get_units(measure_type))))
+    for measure_type in MeasureType
+}
+SENSOR_TYPES = precompute(SensorTypeResponse(detail="ok", result=list(SensorType)))
+MEASURE_TYPES_BY_SENSOR = {
+    sensor_type: precompute(MeasureTypeResponse(detail="ok", result=SensorType.get_measure_types(sensor_type)))
+    for sensor_type in SensorType
+}
+MEASURE_TYPES = precompute(MeasureTypeResponse(detail="ok", result=list(MeasureType)))
+
 # API routes
 
 
@@ -91,6 +228,9 @@ def get_measurements(
     start_date: datetime,
     end_date: datetime,
     detail: Optional[str] = None,
+    max_points: Optional[int] = Query(None, ge=3, description="Reduce each detail to at most this many points (LTTB)"),
+    bucket: Optional[int] = Query(None, ge=1, description="Aggregate min/max/avg in buckets of this many seconds"),
+    if_none_match: Optional[str] = Header(None),
     measurement_query: MeasurementQueryUseCase = Depends(
         Provide[AppContainer.measurement.query]),
     sensor_query: SensorQueryUseCase = Depends(
@@ -100,59 +240,240 @@ def get_measurements(
         measure_type=measure_type,
         start_date=start_date,
         end_date=end_date,
-        detail=detail
-    )
-    sensor_response = sensor_query.get_sensor(
-        GetSensorRequest(measure_type=measure_type)
+        detail=detail,
+        max_points=max_points,
+        bucket=bucket
     )
-    unit = next(
-        (s.unit for s in sensor_response.measurement_specs if s.measure_type == measure_type),
-        None
-    ) if sensor_response else None
-    unit_schema = None
-    if unit:
-        unit_schema = UnitSchema(
-            name=unit,
-            value=unit
+    etag = version_etag("range", request, measurement_query.get_data_version(), sensor_query.get_revision())
+
+    def build():
+        unit = find_unit(sensor_query, measure_type)
+        if not max_points and not bucket:
+            # Rango crudo: filas del Core serializadas directo, sin ORM ni Pydantic por fila
+            rows = measurement_query.get_measure_rows(request=request)
+            return encode_measurement_rows(rows, unit)
+
+        unit_schema = None
+        if unit:
+            unit_schema = UnitSchema(
+                name=unit,
+                value=unit
+            )
+        measurements = measurement_query.get_measures(request=request)
+        return MeasurementResponse(
+            detail="ok",
+            result=map_measurements_to_schema(measurements, unit=unit_schema)
         )
-    measurements = measurement_query.get_measures(request=request)
-    return MeasurementResponse(
+
+    return conditional_response(if_none_match, build, etag=etag)
+
+
+@router.get("/stats")
+@inject
+def get_measurement_stats(
+    measure_type: MeasureType,
+    start_date: datetime,
+    end_date: datetime,
+    details: Optional[List[str]] = Query(None, description="Details to summarize, every detail when omitted"),
+    percentiles: Optional[List[float]] = Query(None, description="Percentiles (0-100) computed from the raw values"),
+    measurement_query: MeasurementQueryUseCase = Depends(
+        Provide[AppContainer.measurement.query]),
+    sensor_query: SensorQueryUseCase = Depends(
+        Provide[AppContainer.measurement.sensor_query]),
+) -> MeasurementStatsResponse:
+    if percentiles and any(not 0 <= p <= 100 for p in percentiles):
+        raise HTTPException(status_code=400, detail="Percentiles must be between 0 and 100")
+
+    stats = measurement_query.get_stats(GetMeasurementStatsRequest(
+        measure_type=measure_type,
+        start_date=start_date,
+        end_date=end_date,
+        details=details,
+        percentiles=percentiles
+    ))
+    unit = find_unit(sensor_query, measure_type)
+    result = [MeasurementStatsSchema.from_orm(s) for s in stats]
+    for schema in result:
+        schema.unit = unit
+    return MeasurementStatsResponse(detail="ok", result=result)
+
+
+@router.get("/series")
+@inject
+def get_measurement_series(
+    start_date: datetime,
+    end_date: datetime,
+    series: List[str] = Query(..., description="MEASURE_TYPE:detail pairs, a bare MEASURE_TYPE includes every detail"),
+    if_none_match: Optional[str] = Header(None),
+    measurement_query: MeasurementQueryUseCase = Depends(
+        Provide[AppContainer.measurement.query]),
+    sensor_query: SensorQueryUseCase = Depends(
+        Provide[AppContainer.measurement.sensor_query]),
+) -> MeasurementSeriesResponse:
+    request = GetMeasurementSeriesRequest(
+        series=[parse_series_key(key) for key in series],
+        start_date=start_date,
+        end_date=end_date
+    )
+    etag = version_etag("series", request, measurement_query.get_data_version(), sensor_query.get_revision())
+
+    def build():
+        result = measurement_query.get_series(request=request)
+        units = {s.measure_type: find_unit(sensor_query, s.measure_type) for s in result}
+        return encode_measurement_series(result, units)
+
+    return conditional_response(if_none_match, build, etag=etag)
+
+
+@router.get("/live")
+@inject
+async def get_live_measurements(
+    series: Optional[List[str]] = Query(None, description="MEASURE_TYPE:detail pairs to follow, every series when omitted"),
+    alarms: bool = True,
+    feed: LiveFeed = Depends(Provide[AppContainer.measurement.live_feed]),
+) -> StreamingResponse:
+    keys = [parse_series_key(key) for key in series or []]
+    subscription = feed.subscribe(keys, kinds=live_kinds(alarms))
+    return StreamingResponse(
+        stream_live_events(feed, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/live/ws")
+@inject
+async def live_measurements_ws(
+    websocket: WebSocket,
+    series: Optional[List[str]] = Query(None),
+    alarms: bool = True,
+    feed: LiveFeed = Depends(Provide[AppContainer.measurement.live_feed]),
+):
+    try:
+        keys = [parse_series_key(key) for key in series or []]
+    except HTTPException as e:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+
+    await websocket.accept()
+    subscription = feed.subscribe(keys, kinds=live_kinds(alarms))
+
+    async def forward():
+        while True:
+            message = await subscription.get()
+            await websocket.send_text(message.data)
+
+    sender = asyncio.create_task(forward())
+    try:
+        # El cliente no envia nada: solo se espera el cierre
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        feed.unsubscribe(subscription)
+
+
+@router.get("/page")
+@inject
+def get_measurements_page(
+    measure_type: MeasureType,
+    start_date: datetime,
+    end_date: datetime,
+    detail: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    measurement_query: MeasurementQueryUseCase = Depends(
+        Provide[AppContainer.measurement.query]),
+    sensor_query: SensorQueryUseCase = Depends(
+        Provide[AppContainer.measurement.sensor_query]),
+) -> MeasurementPageResponse:
+    request = GetMeasurementPageRequest(
+        measure_type=measure_type,
+        start_date=start_date,
+        end_date=end_date,
+        detail=detail,
+        limit=limit,
+        after=decode_cursor(cursor) if cursor else None
+    )
+    unit = find_unit(sensor_query, measure_type)
+    measurements, next_key = measurement_query.get_measures_page(request=request)
+    return MeasurementPageResponse(
         detail="ok",
-        result=map_measurements_to_schema(measurements, unit=unit_schema)
+        result=map_measurements_to_schema(measurements, unit=UnitSchema(name=unit, value=unit) if unit else None),
+        next_cursor=encode_cursor(next_key) if next_key else None
     )
 
 
+@router.get("/export")
+@inject
+def export_measurements(
+    measure_type: MeasureType,
+    start_date: datetime,
+    end_date: datetime,
+    detail: Optional[str] = None,
+    format: ExportFormat = ExportFormat.CSV,
+    measurement_query: MeasurementQueryUseCase = Depends(
+        Provide[AppContainer.measurement.query]),
+    sensor_query: SensorQueryUseCase = Depends(
+        Provide[AppContainer.measurement.sensor_query]),
+) -> StreamingResponse:
+    request = GetMeasurementRequest(
+        measure_type=measure_type,
+        start_date=start_date,
+        end_date=end_date,
+        detail=detail
+    )
+    unit = find_unit(sensor_query, measure_type)
+    batches = measurement_query.export_measures(request=request)
+    filename = f"{measure_type.value}_{start_date:%Y%m%d}_{end_date:%Y%m%d}.{format.value}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if format == ExportFormat.NDJSON:
+        return StreamingResponse(stream_ndjson(batches, unit), media_type="application/x-ndjson", headers=headers)
+    return StreamingResponse(stream_csv(batches, unit), media_type="text/csv", headers=headers)
+
+
+@router.get("/cacheStats")
+@inject
+def get_cache_stats(
+    measurement_query: MeasurementQueryUseCase = Depends(
+        Provide[AppContainer.measurement.query]),
+) -> RangeCacheStatsResponse:
+    return RangeCacheStatsResponse(detail="ok", result=measurement_query.get_cache_stats())
+
+
 @router.get("/last")
 @inject
 def get_last_measurements(
+    if_none_match: Optional[str] = Header(None),
     measurement_query: MeasurementQueryUseCase = Depends(
         Provide[AppContainer.measurement.query]),
     sensor_query: SensorQueryUseCase = Depends(
         Provide[AppContainer.measurement.sensor_query]),
 ) -> LastMeasurementResponse:
-    measurements = measurement_query.get_last_measures()
-    response_list = []
+    etag = version_etag("last", measurement_query.get_data_version(), sensor_query.get_revision())
 
-    for m in measurements:
-        sensor_response = sensor_query.get_sensor(
-            GetSensorRequest(measure_type=m.measure_type)
-        )
-        unit = next(
-            (s.unit for s in sensor_response.measurement_specs if s.measure_type == m.measure_type),
-            None
-        ) if sensor_response else None
+    def build():
+        measurements = measurement_query.get_last_measures()
+        response_list = []
 
-        response_list.append(LastMeasurementSchema(
-            id=get_last_measurement_id(
-                measure_type=m.measure_type, detail=m.detail),
-            value=m.value,
-            created_at=m.created_at,
-            measure_type=m.measure_type,
-            detail=m.detail,
-            unit=unit
-        ))
+        for m in measurements:
+            unit = find_unit(sensor_query, m.measure_type)
 
-    return LastMeasurementResponse(detail="ok", result=response_list)
+            response_list.append(LastMeasurementSchema(
+                id=get_last_measurement_id(
+                    measure_type=m.measure_type, detail=m.detail),
+                value=m.value,
+                created_at=m.created_at,
+                measure_type=m.measure_type,
+                detail=m.detail,
+                unit=unit
+            ))
+
+        return LastMeasurementResponse(detail="ok", result=response_list)
+
+    return conditional_response(if_none_match, build, etag=etag)
 
 
 @router.post("/")
@@ -173,21 +494,17 @@ class MeasuresListSchema(BaseModel):
 @inject
 def post_measurement_list(
     request: MeasuresListSchema,
-    command: CreateMeasurementCommand = Depends(
-        Provide[AppContainer.measurement.create_measurement_command]),
-) -> None:
-    for measure in request.measures:
-        command.execute(request=measure)
+    command: CreateMeasurementListCommand = Depends(
+        Provide[AppContainer.measurement.create_measurement_list_command]),
+) -> MeasurementListResponse:
+    statuses = command.execute(requests=request.measures)
+    return MeasurementListResponse(detail="ok", result=statuses)
 
 
 @router.get("/units")
 @inject
-def get_units(measure_type: MeasureType) -> UnitResponse:
-    units = MeasureType.get_units(measure_type)
-    return UnitResponse(
-        detail="ok",
-        result=map_unit_schemas(units)
-    )
+def get_units(measure_type: MeasureType, if_none_match: Optional[str] = Header(None)) -> UnitResponse:
+    return precomputed_response(if_none_match, UNITS_BY_MEASURE_TYPE[measure_type])
 
 
 @router.get("/unitsConfiguredByMeasureType")
@@ -217,20 +534,20 @@ def get_unit_configured_by_measure_type(query: SensorQueryUseCase, measure_type:
 
 @router.get("/sensorTypes")
 @inject
-def get_sensor_types() -> SensorTypeResponse:
-    return SensorTypeResponse(detail="ok", result=list(SensorType))
+def get_sensor_types(if_none_match: Optional[str] = Header(None)) -> SensorTypeResponse:
+    return precomputed_response(if_none_match, SENSOR_TYPES)
 
 
 @router.get("/measureTypesBySensor")
 @inject
-def get_measure_types_by_sensor(sensor_type: SensorType) -> MeasureTypeResponse:
-    return MeasureTypeResponse(detail="ok", result=SensorType.get_measure_types(sensor_type))
+def get_measure_types_by_sensor(sensor_type: SensorType, if_none_match: Optional[str] = Header(None)) -> MeasureTypeResponse:
+    return precomputed_response(if_none_match, MEASURE_TYPES_BY_SENSOR[sensor_type])
 
 
 @router.get("/measureTypes")
 @inject
-def get_measure_types() -> MeasureTypeResponse:
-    return MeasureTypeResponse(detail="ok", result=list(MeasureType))
+def get_measure_types(if_none_match: Optional[str] = Header(None)) -> MeasureTypeResponse:
+    return precomputed_response(if_none_match, MEASURE_TYPES)
 
 
 @router.post("/sensor")
@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header
 
 from shared_kernel.infra.container import AppContainer
+from shared_kernel.presentation.conditional import conditional_response
 
 from option.application.use_case import OptionsQueryUseCase
 from option.presentation.response import OptionResponse, OptionSchema
@@ -17,10 +18,15 @@ router = APIRouter(
 @router.get("/")
 @inject
 def get_alarms_definition(
+    if_none_match: Optional[str] = Header(None),
     query: OptionsQueryUseCase = Depends(Provide[AppContainer.option.query]),
 ) -> OptionResponse:
-    opts: List[Option] = query.get_options()
-    return OptionResponse(
-        detail="ok",
-        result=[OptionSchema.from_orm(ad) for ad in opts]
-    )
+    def build():
+        opts: List[Option] = query.get_options()
+        return OptionResponse(
+            detail="ok",
+            result=[OptionSchema.from_orm(ad) for ad in opts]
+        )
+
+    # Las opciones no viven en la base: el ETag sale del propio contenido
+    return conditional_response(if_none_match, build)
@@ -18,8 +18,22 @@ class AppContainer(containers.DeclarativeContainer):
         ]
     )
 
-    alarm = providers.Container(AlarmContainer)
-    configuration = providers.Container(ConfigurationContainer)
     measurement = providers.Container(MeasurementContainer)
-    worker = providers.Container(WorkerContainer)
+    alarm = providers.Container(
+        AlarmContainer,
+        live_feed=measurement.live_feed,
+    )
+    configuration = providers.Container(
+        ConfigurationContainer,
+        notification_dispatcher=alarm.notification_dispatcher,
+    )
+    worker = providers.Container(
+        WorkerContainer,
+        measurement_range_cache=measurement.range_cache,
+        measurement_revision=measurement.measurement_revision,
+        alarm_definition_revision=alarm.alarm_definition_revision,
+        alarm_rule_index=alarm.alarm_rule_index,
+        live_feed=measurement.live_feed,
+        notification_dispatcher=alarm.notification_dispatcher,
+    )
     option = providers.Container(OptionContainer)
\ No newline at end of file
@@ -1,10 +1,14 @@
 from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, List, Optional, Tuple
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy_utils import create_database, database_exists
 
 from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.infra.logger import logger
 
 
 def get_engine():
@@ -20,10 +24,70 @@ engine = get_engine()
 SessionFactory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
+class _UnitOfWork:
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.callbacks: List[Tuple[Callable[[], None], Optional[Callable[[], None]]]] = []
+
+    def finish(self, committed: bool):
+        for on_commit, on_rollback in self.callbacks:
+            callback = on_commit if committed else on_rollback
+            if callback is None:
+                continue
+            try:
+                callback()
+            except Exception:
+                logger.exception("Unit of work callback failed")
+
+
+_current_unit_of_work: ContextVar[Optional[_UnitOfWork]] = ContextVar("unit_of_work", default=None)
+
+
 @contextmanager
 def get_db_session():
-    db = SessionFactory()
+    unit = _current_unit_of_work.get()
+    if unit is not None:
+        # Dentro de una unidad de trabajo session.commit() solo hace flush; confirma unit_of_work()
+        db = SessionFactory(bind=unit.connection, join_transaction_mode="rollback_only")
+    else:
+        db = SessionFactory()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Every session opened with get_db_session in this context (thread or asyncio task)
+    shares one transaction, committed once on exit and rolled back as a whole if the
+    block raises. Nested calls join the outer one.
+    """
+    if _current_unit_of_work.get() is not None:
+        yield
+        return
+
+    with engine.connect() as connection:
+        unit = _UnitOfWork(connection)
+        token = _current_unit_of_work.set(unit)
+        committed = False
+        try:
+            with connection.begin():
+                yield
+            committed = True
+        finally:
+            _current_unit_of_work.reset(token)
+            unit.finish(committed)
+
+
+def after_commit(on_commit: Callable[[], None], on_rollback: Optional[Callable[[], None]] = None):
+    """
+    Runs `on_commit` once the current unit of work commits (`on_rollback` if it fails),
+    or right away when there is none.
+    """
+    unit = _current_unit_of_work.get()
+    if unit is None:
+        on_commit()
+        return
+    unit.callbacks.append((on_commit, on_rollback))
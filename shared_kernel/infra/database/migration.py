@@ -0,0 +1,240 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from shared_kernel.infra.database.connection import engine
+from measurement.domain.model.value_object import RollupResolution
+from shared_kernel.infra.database.orm import (
+    latest_measures_table, measure_rollups_table, measures_table, series_table, alarms_table, events_table,
+    event_cursor_table, alarms_definition_table
+)
+from shared_kernel.infra.logger import logger
+
+
+def run_migrations():
+    """
+    Bring an existing database file up to date with the tables defined in the ORM.
+    Every step is idempotent so it can run on each startup.
+    """
+    with engine.begin() as connection:
+        converted = _convert_measures_to_series(connection)
+        _drop_series_unit(connection)
+        _create_latest_measures(connection)
+        _create_measure_rollups(connection)
+        _create_event_log(connection)
+        _create_event_cursor(connection)
+        _add_alarm_definition_hysteresis(connection)
+        _create_indexes(connection)
+
+    if converted:
+        # Devuelve al disco el espacio de la tabla anterior; no puede correr dentro de una transaccion
+        logger.info("Vacuuming database")
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.exec_driver_sql("VACUUM")
+
+
+def _convert_measures_to_series(connection: Connection) -> bool:
+    """
+    Rewrites a measures table with TEXT measure_type/detail/created_at columns into
+    series + measures(series_id, epoch milliseconds, value), keeping the measure ids.
+    Returns whether the old table was dropped.
+    """
+    if not inspect(connection).has_table(series_table.name):
+        logger.info("Creating table series")
+        series_table.create(connection)
+
+    if not inspect(connection).has_table(measures_table.name):
+        measures_table.create(connection)
+        return False
+    columns = {column["name"] for column in inspect(connection).get_columns(measures_table.name)}
+    if "series_id" in columns:
+        return False
+
+    logger.info("Converting measures to the series layout")
+    connection.execute(text("""
+        INSERT OR IGNORE INTO series (measure_type, detail)
+        SELECT DISTINCT measure_type, COALESCE(detail, '') FROM measures
+    """))
+
+    connection.execute(text("ALTER TABLE measures RENAME TO measures_legacy"))
+    measures_table.create(connection)
+    # 'YYYY-MM-DD HH:MM:SS.ffffff' -> milisegundos, con la misma hora de pared que guardaba el texto
+    connection.execute(text("""
+        INSERT INTO measures (id, series_id, created_at, value)
+        SELECT
+            m.id,
+            s.id,
+            CAST(strftime('%s', m.created_at) AS INTEGER) * 1000 + CAST(substr(m.created_at || '000', 21, 3) AS INTEGER),
+            m.value
+        FROM measures_legacy m
+        JOIN series s ON s.measure_type = m.measure_type AND s.detail = COALESCE(m.detail, '')
+        WHERE m.created_at IS NOT NULL AND m.value IS NOT NULL
+    """))
+    skipped = connection.execute(text(
+        "SELECT COUNT(*) FROM measures_legacy WHERE created_at IS NULL OR value IS NULL"
+    )).scalar()
+    if skipped:
+        # No entran en el nuevo formato: se guardan aparte y las borra un operador
+        connection.execute(text("""
+            CREATE TABLE measures_rejected AS
+            SELECT * FROM measures_legacy WHERE created_at IS NULL OR value IS NULL
+        """))
+        logger.warning(
+            f"{skipped} measures without created_at or value were moved to measures_rejected; "
+            "drop that table once they are reviewed"
+        )
+
+    legacy = connection.execute(text("SELECT COUNT(*) FROM measures_legacy")).scalar()
+    converted = connection.execute(text("SELECT COUNT(*) FROM measures")).scalar()
+    if converted + skipped != legacy:
+        logger.warning(
+            f"Converted {converted} of {legacy} measures ({skipped} rejected); "
+            "keeping measures_legacy until an operator drops it"
+        )
+        return False
+    connection.execute(text("DROP TABLE measures_legacy"))
+    return True
+
+
+def _drop_series_unit(connection: Connection):
+    # La unidad se lee siempre de measurement_specs; la copia en series no se usaba
+    columns = {column["name"] for column in inspect(connection).get_columns(series_table.name)}
+    if "unit" in columns:
+        logger.info("Dropping series.unit")
+        connection.execute(text("ALTER TABLE series DROP COLUMN unit"))
+
+
+def _keyed_by_series(connection: Connection, table_name: str) -> bool:
+    """
+    Whether a derived table exists with the series_id layout. One keyed by TEXT
+    (measure_type, detail) is dropped, so it is rebuilt from the measures.
+    """
+    if not inspect(connection).has_table(table_name):
+        return False
+    columns = {column["name"] for column in inspect(connection).get_columns(table_name)}
+    if "series_id" in columns:
+        return True
+
+    logger.info(f"Dropping {table_name} keyed by (measure_type, detail)")
+    connection.execute(text(f"DROP TABLE {table_name}"))
+    return False
+
+
+def _create_latest_measures(connection: Connection):
+    if _keyed_by_series(connection, latest_measures_table.name):
+        return
+
+    logger.info("Creating table latest_measures")
+    latest_measures_table.create(connection)
+
+    connection.execute(text(f"""
+        INSERT INTO latest_measures (series_id, value, created_at)
+        SELECT series_id, value, {_DATETIME_TEXT.format(column="created_at")}
+        FROM (
+            SELECT
+                series_id,
+                value,
+                created_at,
+                ROW_NUMBER() OVER (PARTITION BY series_id ORDER BY created_at DESC, id DESC) AS rn
+            FROM measures
+        )
+        WHERE rn = 1
+    """))
+
+
+# Milisegundos de measures.created_at -> texto DateTime de SQLAlchemy ('YYYY-MM-DD HH:MM:SS.ffffff')
+_DATETIME_TEXT = "strftime('%Y-%m-%d %H:%M:%S', {column} / 1000, 'unixepoch') || printf('.%06d', {column} % 1000 * 1000)"
+
+
+def _create_measure_rollups(connection: Connection):
+    if _keyed_by_series(connection, measure_rollups_table.name):
+        return
+
+    logger.info("Creating table measure_rollups")
+    measure_rollups_table.create(connection)
+
+    backfill_measure_rollups(connection)
+
+
+def backfill_measure_rollups(connection: Connection):
+    """
+    Rebuilds every rollup resolution from the raw measures table.
+    """
+    connection.execute(measure_rollups_table.delete())
+    for resolution in RollupResolution:
+        logger.info(f"Backfilling {resolution.value} rollups")
+        connection.execute(
+            text(f"""
+                INSERT INTO measure_rollups (
+                    resolution, series_id, bucket_start,
+                    samples, min_value, max_value, sum_value, sum_squares
+                )
+                SELECT
+                    :resolution, series_id, {_DATETIME_TEXT.format(column="bucket_ms")},
+                    samples, min_value, max_value, sum_value, sum_squares
+                FROM (
+                    SELECT
+                        series_id,
+                        created_at / :bucket_ms * :bucket_ms AS bucket_ms,
+                        COUNT(*) AS samples,
+                        MIN(value) AS min_value,
+                        MAX(value) AS max_value,
+                        SUM(value) AS sum_value,
+                        SUM(value * value) AS sum_squares
+                    FROM measures
+                    GROUP BY series_id, created_at / :bucket_ms
+                )
+            """),
+            {"resolution": resolution.value, "bucket_ms": resolution.seconds * 1000}
+        )
+
+
+def _create_event_log(connection: Connection):
+    if not inspect(connection).has_table(events_table.name):
+        logger.info("Creating table events")
+        events_table.create(connection)
+        return
+
+    columns = {column["name"] for column in inspect(connection).get_columns(events_table.name)}
+    if "created_at" not in columns:
+        logger.info("Adding events.created_at")
+        connection.execute(text("ALTER TABLE events ADD COLUMN created_at DATETIME"))
+
+
+def _create_event_cursor(connection: Connection):
+    if inspect(connection).has_table(event_cursor_table.name):
+        return
+
+    logger.info("Creating table event_cursor")
+    event_cursor_table.create(connection)
+    # Antes los eventos se borraban al consumirlos: todo lo que queda esta pendiente
+    connection.execute(text("""
+        INSERT INTO event_cursor (id, acknowledged_id)
+        SELECT 1, COALESCE(MIN(id) - 1, 0) FROM events
+    """))
+
+
+def _add_alarm_definition_hysteresis(connection: Connection):
+    if not inspect(connection).has_table(alarms_definition_table.name):
+        return
+
+    columns = {column["name"] for column in inspect(connection).get_columns(alarms_definition_table.name)}
+    for name, ddl in (("hysteresis", "REAL NOT NULL DEFAULT 0"), ("cooldown", "INTEGER NOT NULL DEFAULT 0")):
+        if name not in columns:
+            logger.info(f"Adding alarm_definitions.{name}")
+            connection.execute(text(f"ALTER TABLE alarm_definitions ADD COLUMN {name} {ddl}"))
+
+
+def _create_indexes(connection: Connection):
+    for table in (measures_table, alarms_table):
+        if not inspect(connection).has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspect(connection).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                logger.info(f"Creating index {index.name}")
+                index.create(connection)
+
+
+if __name__ == "__main__":
+    with engine.begin() as connection:
+        backfill_measure_rollups(connection)
@@ -1,15 +1,17 @@
+from datetime import datetime, timedelta
+
 from sqlalchemy import (
     Table, Column, MetaData,
     DateTime, Text, Integer, Float, String, Boolean,
-    UniqueConstraint, ForeignKey
+    UniqueConstraint, ForeignKey, PrimaryKeyConstraint, Index, TypeDecorator
 )
 from sqlalchemy.orm import registry, composite, relationship
 
 from alarming.domain.model.value_object import AlarmType
 from configuration.domain.model.value_object import TreatmentAs
 from alarming.domain.model.aggregate import Alarm, AlarmDefinition
-from measurement.domain.model.aggregate import Measure, Sensor, MeasurementSpec
-from measurement.domain.model.value_object import SensorType, MeasureType, Unit
+from measurement.domain.model.aggregate import Measure, LatestMeasure, MeasureRollup, Sensor, MeasurementSpec
+from measurement.domain.model.value_object import SensorType, MeasureType, Unit, RollupResolution
 from configuration.domain.model.aggregate import Configuration
 from worker.domain.model.aggregate import StepDefinition, WorkerFlowStatus, Event
 from worker.domain.model.value_object import PositionType
@@ -17,17 +19,87 @@ from worker.domain.model.value_object import PositionType
 metadata = MetaData()
 mapper_registry = registry()
 
+
+class EpochMillis(TypeDecorator):
+    """
+    Naive datetime stored as integer milliseconds since 1970-01-01 (same wall clock, no zone).
+    """
+    impl = Integer
+    cache_ok = True
+
+    EPOCH = datetime(1970, 1, 1)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if value.tzinfo is not None:
+            # Las medidas se guardan con la hora local del equipo
+            value = value.astimezone().replace(tzinfo=None)
+        return (value - self.EPOCH) // timedelta(milliseconds=1)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self.EPOCH + timedelta(milliseconds=value)
+
+
+class SeriesDetail(TypeDecorator):
+    """
+    Series detail stored as '' when there is none, so it can be part of a key; read back as None.
+    """
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return "" if value is None else value
+
+    def process_result_value(self, value, dialect):
+        return value or None
+
+
 # Tablas
 
+# Una fila por serie (measure_type, detail); measures solo guarda su id
+series_table = Table(
+    "series",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("measure_type", String, nullable=False),
+    Column("detail", SeriesDetail, nullable=False),
+    UniqueConstraint("measure_type", "detail", name="uix_series_key"),
+)
+
 measures_table = Table(
     "measures",
     metadata,
     Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("series_id", Integer, ForeignKey("series.id"), nullable=False),
+    Column("created_at", EpochMillis, nullable=False),
     Column("value", Float, nullable=False),
-    Column("measure_type", String, nullable=False),
-    Column("detail", String, nullable=False),
-    Column("created_at", DateTime, nullable=True),
-    UniqueConstraint("id", name="uix_measure_number"),
+    Index("ix_measures_series_created_at", "series_id", "created_at"),
+)
+
+# Ultimo valor por serie, actualizado en cada insercion
+latest_measures_table = Table(
+    "latest_measures",
+    metadata,
+    Column("series_id", Integer, ForeignKey("series.id"), nullable=False),
+    Column("value", Float, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    PrimaryKeyConstraint("series_id", name="pk_latest_measures"),
+)
+
+# Agregados por (resolucion, serie, bucket), actualizados en cada insercion
+measure_rollups_table = Table(
+    "measure_rollups",
+    metadata,
+    Column("resolution", String, nullable=False),
+    Column("series_id", Integer, ForeignKey("series.id"), nullable=False),
+    Column("bucket_start", DateTime, nullable=False),
+    Column("samples", Integer, nullable=False),
+    Column("min_value", Float, nullable=False),
+    Column("max_value", Float, nullable=False),
+    Column("sum_value", Float, nullable=False),
+    Column("sum_squares", Float, nullable=False),
+    PrimaryKeyConstraint("resolution", "series_id", "bucket_start", name="pk_measure_rollups"),
 )
 
 alarms_table = Table(
@@ -39,6 +111,8 @@ alarms_table = Table(
     Column("measure_type", String, nullable=False),
     Column("alarm_type", String, nullable=False),
     Column("created_at", DateTime, nullable=True),
+    Index("ix_alarms_created_at", "created_at"),
+    Index("ix_alarms_measure_type_created_at", "measure_type", "created_at"),
 )
 
 alarms_definition_table = Table(
@@ -53,6 +127,9 @@ alarms_definition_table = Table(
     Column("created_at", DateTime, nullable=False),
     Column("updated_at", DateTime, nullable=True),
     Column("enabled", Boolean, nullable=False),
+    # Banda de histeresis para normalizar y segundos minimos entre disparos
+    Column("hysteresis", Float, nullable=False, server_default="0"),
+    Column("cooldown", Integer, nullable=False, server_default="0"),
 )
 
 configuration_table = Table(
@@ -104,6 +181,7 @@ worker_flow_status_table = Table(
     Column("position", String, nullable=False),
 )
 
+# Registro de solo insercion: AUTOINCREMENT garantiza ids crecientes que nunca se reutilizan
 events_table = Table(
     "events",
     metadata,
@@ -112,6 +190,16 @@ events_table = Table(
     Column("description", String, nullable=False),
     Column("measure_type", String, nullable=True),
     Column("alarm_type", String, nullable=True),
+    Column("created_at", DateTime, nullable=True),
+    sqlite_autoincrement=True,
+)
+
+# Cursor de GET/DELETE /worker/ws: una sola fila, sobrevive a los reinicios
+event_cursor_table = Table(
+    "event_cursor",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("acknowledged_id", Integer, nullable=False),
 )
 
 # Inicialización de mapeos
@@ -121,11 +209,34 @@ def init_orm_mappers():
     Initialize ORM mappings.
     """
     
+    # Solo lectura: las medidas se insertan con Core a traves de MeasurementRepository
     mapper_registry.map_imperatively(
         Measure,
-        measures_table,
+        measures_table.join(series_table, measures_table.c.series_id == series_table.c.id),
+        properties={
+            "id": measures_table.c.id,
+            "series_id": [measures_table.c.series_id, series_table.c.id],
+            "measure_type_value": composite(MeasureType.from_value, series_table.c.measure_type),
+        },
+    )
+
+    # Solo lectura, como Measure: measure_type y detail salen de la serie
+    mapper_registry.map_imperatively(
+        LatestMeasure,
+        latest_measures_table.join(series_table, latest_measures_table.c.series_id == series_table.c.id),
+        properties={
+            "series_id": [latest_measures_table.c.series_id, series_table.c.id],
+            "measure_type_value": composite(MeasureType.from_value, series_table.c.measure_type),
+        }
+    )
+
+    mapper_registry.map_imperatively(
+        MeasureRollup,
+        measure_rollups_table.join(series_table, measure_rollups_table.c.series_id == series_table.c.id),
         properties={
-            "measure_type_value": composite(MeasureType.from_value, measures_table.c.measure_type),
+            "series_id": [measure_rollups_table.c.series_id, series_table.c.id],
+            "resolution_value": composite(RollupResolution.from_value, measure_rollups_table.c.resolution),
+            "measure_type_value": composite(MeasureType.from_value, series_table.c.measure_type),
         }
     )
 
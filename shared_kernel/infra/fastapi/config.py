@@ -1,4 +1,4 @@
-from typing import ClassVar
+from typing import ClassVar, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -9,6 +9,11 @@ class Settings(BaseSettings):
 
     SQLALCHEMY_DATABASE_URL: ClassVar[str] = f"{DRIVER}:///{DATABASE}"
 
+    MEASUREMENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    ALARM_WINDOW_SIZE: int = 500
+    # Receptor local de notificaciones de alarma (opcional)
+    NOTIFICATION_WEBHOOK_URL: Optional[str] = None
+
     class Config:
         env_file = ".env"
 
@@ -1,5 +1,8 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from measurement.presentation import rest as measurement_api
 from configuration.presentation import rest as configuration_api
@@ -9,10 +12,21 @@ from option.presentation import rest as option_api
 
 from shared_kernel.infra.container import AppContainer
 from shared_kernel.infra.database.orm import init_orm_mappers
+from shared_kernel.infra.database.migration import run_migrations
 
 app_container = AppContainer()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Escribe las medidas pendientes antes de cerrar
+    app_container.worker.measurement_queue().stop()
+    app_container.alarm.notification_dispatcher().stop()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Measurement Worker",
     contact={
         "name": "Gigawatt SAS",
@@ -32,6 +46,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Comprime las respuestas grandes (rangos de medidas, exportaciones)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(measurement_api.router)
 app.include_router(configuration_api.router)
 app.include_router(alarming_api.router)
@@ -39,6 +56,7 @@ app.include_router(worker_api.router)
 app.include_router(option_api.router)
 
 init_orm_mappers()
+run_migrations()
 
 @app.get("/")
 def health_check():
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from threading import Lock
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class LiveMessage(NamedTuple):
+    kind: str
+    measure_type: str
+    detail: Optional[str]
+    data: str
+
+
+class LiveSubscription:
+    """
+    Messages for one client. `series` holds (measure_type, detail) keys, detail None
+    matching every detail of the type; an empty list receives everything.
+    """
+
+    def __init__(
+            self,
+            loop: asyncio.AbstractEventLoop,
+            series: List[Tuple[str, Optional[str]]],
+            kinds: Tuple[str, ...],
+            max_pending: int
+        ):
+        self.loop = loop
+        self.series = series
+        self.kinds = kinds
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.dropped = 0
+
+    def accepts(self, message: LiveMessage) -> bool:
+        if message.kind not in self.kinds:
+            return False
+        if not self.series:
+            return True
+        # Un mensaje sin detalle (alarmas) le llega a cualquier serie de su tipo
+        return any(
+            measure_type == message.measure_type
+            and (detail is None or message.detail is None or detail == message.detail)
+            for measure_type, detail in self.series
+        )
+
+    async def get(self) -> LiveMessage:
+        return await self.queue.get()
+
+    def _offer(self, message: LiveMessage):
+        # Cliente lento: se descarta lo mas viejo para no frenar a los demas
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+
+class LiveFeed:
+    """
+    In-process fan-out of freshly committed measures and alarms. Publishers are the
+    write commands (any thread); subscribers are async endpoints, each with its own queue.
+    """
+
+    def __init__(self, max_pending: int = 1000):
+        self.max_pending = max_pending
+        self._subscriptions: List[LiveSubscription] = []
+        self._lock = Lock()
+
+    def subscribe(self, series: List[Tuple[str, Optional[str]]], kinds: Tuple[str, ...]) -> LiveSubscription:
+        """
+        Must be called from the event loop that will consume the subscription.
+        """
+        subscription = LiveSubscription(
+            loop=asyncio.get_running_loop(),
+            series=[(str(getattr(m, "value", m)), d) for m, d in series],
+            kinds=kinds,
+            max_pending=self.max_pending
+        )
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LiveSubscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def publish(self, kind: str, measure_type: Any, detail: Optional[str], payload: Dict[str, Any]):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        if not subscriptions:
+            return
+
+        # Se serializa una sola vez para todos los suscriptores
+        message = LiveMessage(
+            kind=kind,
+            measure_type=str(getattr(measure_type, "value", measure_type)),
+            detail=detail,
+            data=json.dumps({"type": kind, **payload}, default=str, separators=(",", ":"))
+        )
+        for subscription in subscriptions:
+            if subscription.accepts(message):
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._offer, message)
+                except RuntimeError:
+                    # El loop del suscriptor ya se cerro
+                    self.unsubscribe(subscription)
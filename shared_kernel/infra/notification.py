@@ -0,0 +1,166 @@
+import abc
+from queue import Full, Queue
+from threading import Lock, Thread
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import pygame
+
+from shared_kernel.infra import rest_template
+from shared_kernel.infra.logger import logger
+
+
+_STOP = object()
+
+
+class Notification(NamedTuple):
+    title: str
+    description: str
+    sound_path: Optional[str] = None
+    data: Dict[str, Any] = {}
+
+
+class NotificationSink(abc.ABC):
+    name: str = "sink"
+
+    @abc.abstractmethod
+    def send(self, notification: Notification):
+        pass
+
+    def preload(self, sound_paths: Iterable[str]):
+        pass
+
+
+class SoundSink(NotificationSink):
+    """
+    Plays the notification's sound. The mixer is initialized once and each file is
+    decoded once; every call runs on the sink's own thread.
+    """
+    name = "sound"
+
+    def __init__(self):
+        self._sounds: Dict[str, pygame.mixer.Sound] = {}
+        self._initialized = False
+
+    def send(self, notification: Notification):
+        if not notification.sound_path:
+            return
+        sound = self._load(notification.sound_path)
+        if sound is not None:
+            logger.info(f"Playing {notification.sound_path}")
+            # Vuelve enseguida: el mixer reproduce en su propio hilo
+            sound.play()
+
+    def preload(self, sound_paths: Iterable[str]):
+        for sound_path in sound_paths:
+            self._load(sound_path)
+
+    def _load(self, sound_path: str) -> Optional[pygame.mixer.Sound]:
+        if sound_path in self._sounds:
+            return self._sounds[sound_path]
+        try:
+            if not self._initialized:
+                pygame.mixer.init()
+                self._initialized = True
+            sound = pygame.mixer.Sound(sound_path)
+        except Exception:
+            logger.exception(f"Could not load sound {sound_path}")
+            sound = None
+        # Un archivo que no carga tampoco se reintenta en cada alarma
+        self._sounds[sound_path] = sound
+        return sound
+
+
+class LogSink(NotificationSink):
+    name = "log"
+
+    def send(self, notification: Notification):
+        logger.warning(f"{notification.title}: {notification.description} {notification.data}")
+
+
+class WebhookSink(NotificationSink):
+    name = "webhook"
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def send(self, notification: Notification):
+        rest_template.post(self.url, data={
+            "title": notification.title,
+            "description": notification.description,
+            **notification.data,
+        })
+
+
+class NotificationDispatcher:
+    """
+    Fans each notification out to its sinks without blocking the caller: every sink
+    has its own bounded queue and thread, so a slow sink only delays itself. When a
+    queue is full the notification is dropped for that sink and logged.
+    """
+
+    def __init__(self, sinks: List[NotificationSink], max_pending: int = 100):
+        self.sinks = sinks
+        self.max_pending = max_pending
+        self._queues: List[Queue] = []
+        self._threads: List[Thread] = []
+        self._lock = Lock()
+
+    @classmethod
+    def with_default_sinks(cls, webhook_url: Optional[str] = None) -> "NotificationDispatcher":
+        sinks = [SoundSink(), LogSink()]
+        if webhook_url:
+            sinks.append(WebhookSink(webhook_url))
+        return cls(sinks=sinks)
+
+    def notify(self, notification: Notification):
+        self._offer(("send", notification))
+
+    def preload(self, sound_paths: Iterable[str]):
+        """
+        Decodes the given sounds ahead of the first alarm that uses them.
+        """
+        self._offer(("preload", tuple(sound_paths)))
+
+    def stop(self):
+        with self._lock:
+            for queue in self._queues:
+                queue.put(_STOP)
+            for thread in self._threads:
+                thread.join()
+            self._queues, self._threads = [], []
+
+    def _offer(self, item):
+        self._ensure_started()
+        for sink, queue in zip(self.sinks, self._queues):
+            try:
+                queue.put_nowait(item)
+            except Full:
+                logger.warning(f"Notification sink {sink.name} is behind, dropping {item[0]}")
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for sink in self.sinks:
+                queue = Queue(maxsize=self.max_pending)
+                thread = Thread(target=self._run, args=(sink, queue), name=f"notification-{sink.name}", daemon=True)
+                thread.start()
+                self._queues.append(queue)
+                self._threads.append(thread)
+
+    @staticmethod
+    def _run(sink: NotificationSink, queue: Queue):
+        while True:
+            item = queue.get()
+            if item is _STOP:
+                return
+            action, payload = item
+            try:
+                if action == "preload":
+                    sink.preload(payload)
+                else:
+                    sink.send(payload)
+            except Exception:
+                logger.exception(f"Notification sink {sink.name} failed")
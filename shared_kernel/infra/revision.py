@@ -0,0 +1,16 @@
+from threading import Lock
+
+
+class Revision:
+    """
+    In-process change counter, bumped by the commands that modify a resource.
+    """
+
+    def __init__(self):
+        self.value = 0
+        self._lock = Lock()
+
+    def bump(self) -> int:
+        with self._lock:
+            self.value += 1
+            return self.value
@@ -0,0 +1,76 @@
+import hashlib
+import uuid
+from typing import Callable, NamedTuple, Optional, Union
+
+from fastapi import Response
+from pydantic import BaseModel
+
+# Los contadores en memoria vuelven a cero al reiniciar: el ETag incluye el arranque
+_BOOT_ID = uuid.uuid4().hex
+
+CACHE_CONTROL = "no-cache"
+
+
+class PrecomputedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def version_etag(*parts) -> str:
+    """
+    ETag for a response that only changes when one of `parts` (data versions, query params) does.
+    """
+    return make_etag(_BOOT_ID, *parts)
+
+
+def precompute(response: BaseModel) -> PrecomputedResponse:
+    body = response.model_dump_json().encode()
+    return PrecomputedResponse(body=body, etag=make_etag(body))
+
+
+def is_not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # Comparacion debil: W/"x" y "x" representan la misma version
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def conditional_response(
+        if_none_match: Optional[str],
+        build: Callable[[], Union[bytes, BaseModel]],
+        etag: Optional[str] = None
+    ) -> Response:
+    """
+    304 when the client already holds `etag`, otherwise the JSON body from `build`.
+    Without `etag` the body is built first and hashed.
+    """
+    if etag and is_not_modified(if_none_match, etag):
+        return not_modified_response(etag)
+
+    body = build()
+    if isinstance(body, BaseModel):
+        body = body.model_dump_json().encode()
+    if etag is None:
+        etag = make_etag(body)
+        if is_not_modified(if_none_match, etag):
+            return not_modified_response(etag)
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+def precomputed_response(if_none_match: Optional[str], precomputed: PrecomputedResponse) -> Response:
+    return conditional_response(if_none_match, lambda: precomputed.body, etag=precomputed.etag)
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
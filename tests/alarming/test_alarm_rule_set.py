@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+from alarming.application.alarm_rule_index import AlarmRule, AlarmRuleSet
+from alarming.domain.model.alarm_state import AlarmStateTracker
+from alarming.domain.model.rolling_window import SeriesWindows
+from alarming.domain.model.value_object import AlarmType, AlarmTypeFactory
+
+
+def _rule(id, alarm_type, config_value, measure_type="PRESSURE", detail=None, hysteresis=0.0, cooldown=0):
+    definition = SimpleNamespace(
+        id=id,
+        alarm_type=alarm_type,
+        config_value=config_value,
+        measure_type=measure_type,
+        measure_detail=detail,
+        hysteresis=hysteresis,
+        cooldown=cooldown,
+        sound_path=f"{id}.wav",
+    )
+    return AlarmRule(definition=definition, evaluator=AlarmTypeFactory.get_alarm(alarm_type))
+
+
+def _ids(alarms):
+    return sorted(alarm.definition.id for alarm in alarms)
+
+
+def test_evaluates_every_alarm_type_in_one_pass():
+    rule_set = AlarmRuleSet([
+        _rule(1, AlarmType.GREATER_THAN, 10.0),
+        _rule(2, AlarmType.LOWER_THAN, 0.0, measure_type="TEMPERATURE"),
+        _rule(3, AlarmType.DESVEST, 2.0, detail="Pi"),
+        _rule(4, AlarmType.GREATER_THAN, 100.0),
+    ])
+    history = SeriesWindows(size=10)
+    history.push("PRESSURE", None, 11.0)
+    history.push("TEMPERATURE", None, -1.0)
+    history.push("PRESSURE", "Pi", 5.0)
+    history.push("PRESSURE", "Pi", 8.0)
+
+    evaluation = rule_set.evaluate(
+        history, [("PRESSURE", None), ("TEMPERATURE", None), ("PRESSURE", "Pi")], AlarmStateTracker(), now=0
+    )
+
+    assert _ids(evaluation.raised) == [1, 2, 3]
+    assert evaluation.cleared == []
+    assert {alarm.definition.id: alarm.measure_value for alarm in evaluation.raised} == {1: 11.0, 2: -1.0, 3: 8.0}
+
+
+def test_series_not_read_this_cycle_keep_their_state():
+    rule_set = AlarmRuleSet([_rule(1, AlarmType.GREATER_THAN, 10.0)])
+    history = SeriesWindows(size=10)
+    states = AlarmStateTracker()
+    history.push("PRESSURE", None, 11.0)
+    rule_set.evaluate(history, [("PRESSURE", None)], states, now=0)
+
+    history.push("PRESSURE", None, 1.0)
+    evaluation = rule_set.evaluate(history, [("TEMPERATURE", None)], states, now=1)
+
+    assert evaluation.raised == [] and evaluation.cleared == []
+
+
+def test_hysteresis_band_delays_the_clear():
+    rule_set = AlarmRuleSet([
+        _rule(1, AlarmType.GREATER_THAN, 10.0, hysteresis=2.0),
+        _rule(2, AlarmType.LOWER_THAN, 0.0, measure_type="TEMPERATURE", hysteresis=1.0),
+    ])
+    history = SeriesWindows(size=1)
+    states = AlarmStateTracker()
+    series = [("PRESSURE", None), ("TEMPERATURE", None)]
+
+    def cycle(pressure, temperature, now):
+        history.push("PRESSURE", None, pressure)
+        history.push("TEMPERATURE", None, temperature)
+        return rule_set.evaluate(history, series, states, now=now)
+
+    assert _ids(cycle(11.0, -0.5, now=0).raised) == [1, 2]
+    # Dentro de la banda: 10 - 2 < 9 y 0.5 < 0 + 1
+    evaluation = cycle(9.0, 0.5, now=1)
+    assert evaluation.raised == [] and evaluation.cleared == []
+    assert _ids(cycle(7.9, 1.1, now=2).cleared) == [1, 2]
+
+
+def test_cooldown_suppresses_a_storm():
+    rule_set = AlarmRuleSet([_rule(1, AlarmType.GREATER_THAN, 10.0, cooldown=30)])
+    history = SeriesWindows(size=1)
+    states = AlarmStateTracker()
+    raised = []
+    for now, value in enumerate([11.0, 9.0, 11.0, 9.0, 11.0] + [11.0] * 30):
+        history.push("PRESSURE", None, value)
+        raised += [now for _ in rule_set.evaluate(history, [("PRESSURE", None)], states, now=now).raised]
+
+    assert raised == [0, 30]
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from alarming.domain.model.alarm_state import AlarmStateTracker, AlarmTransition
+
+
+def _definition(id=1, cooldown=0):
+    return SimpleNamespace(id=id, cooldown=cooldown)
+
+
+def test_raises_once_while_active():
+    tracker = AlarmStateTracker()
+    definition = _definition()
+
+    assert tracker.transition(definition, raising=True, holding=True, now=0) is AlarmTransition.RAISED
+    assert tracker.transition(definition, raising=True, holding=True, now=1) is None
+    assert tracker.transition(definition, raising=True, holding=True, now=2) is None
+
+
+def test_holds_inside_hysteresis_band_and_clears_past_it():
+    tracker = AlarmStateTracker()
+    definition = _definition()
+    tracker.transition(definition, raising=True, holding=True, now=0)
+
+    # Ya no supera el umbral pero sigue dentro de la banda
+    assert tracker.transition(definition, raising=False, holding=True, now=1) is None
+    assert tracker.transition(definition, raising=False, holding=False, now=2) is AlarmTransition.CLEARED
+    assert tracker.transition(definition, raising=False, holding=False, now=3) is None
+
+
+def test_cooldown_blocks_a_new_raise():
+    tracker = AlarmStateTracker()
+    definition = _definition(cooldown=60)
+    tracker.transition(definition, raising=True, holding=True, now=0)
+    tracker.transition(definition, raising=False, holding=False, now=10)
+
+    assert tracker.transition(definition, raising=True, holding=True, now=30) is None
+    assert tracker.transition(definition, raising=True, holding=True, now=60) is AlarmTransition.RAISED
+
+
+def test_definitions_are_tracked_apart():
+    tracker = AlarmStateTracker()
+    first, second = _definition(id=1), _definition(id=2)
+
+    assert tracker.transition(first, raising=True, holding=True, now=0) is AlarmTransition.RAISED
+    assert tracker.transition(second, raising=True, holding=True, now=0) is AlarmTransition.RAISED
+    assert tracker.transition(first, raising=False, holding=False, now=1) is AlarmTransition.CLEARED
+    assert tracker.transition(second, raising=True, holding=True, now=1) is None
@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+import pytest
+
+from alarming.domain.model.rolling_window import RollingWindow, SeriesWindows
+
+
+def test_empty_window_has_no_statistics():
+    window = RollingWindow(3)
+
+    assert len(window) == 0
+    assert (window.last, window.min, window.max, window.mean, window.std) == (None, None, None, None, None)
+
+
+def test_rejects_empty_size():
+    with pytest.raises(ValueError):
+        RollingWindow(0)
+
+
+def test_matches_numpy_over_the_last_values():
+    rng = random.Random(7)
+    window = RollingWindow(50)
+    values = []
+    for _ in range(1000):
+        # Repetidos y saltos grandes para ejercitar las colas de min/max
+        value = rng.choice([rng.uniform(-1e3, 1e3), 5.0, 5.0])
+        window.push(value)
+        values.append(value)
+
+        expected = np.array(values[-50:])
+        assert len(window) == len(expected)
+        assert window.last == value
+        assert window.min == expected.min()
+        assert window.max == expected.max()
+        assert window.mean == pytest.approx(expected.mean(), abs=1e-6)
+        assert window.std == pytest.approx(expected.std(), abs=1e-6)
+
+
+def test_constant_series_has_zero_variance():
+    window = RollingWindow(4)
+    for _ in range(20):
+        window.push(0.1)
+
+    assert window.variance == 0.0
+    assert window.mean == pytest.approx(0.1)
+
+
+def test_series_windows_are_keyed_by_type_and_detail():
+    windows = SeriesWindows(size=2)
+    windows.push("PRESSURE", None, 1.0)
+    windows.push("PRESSURE", "", 2.0)
+    windows.push("PRESSURE", "Pi", 3.0)
+
+    assert windows.get("PRESSURE", None).max == 2.0
+    assert len(windows.get("PRESSURE", "")) == 2
+    assert windows.get("PRESSURE", "Pi").last == 3.0
+    assert windows.get("TEMPERATURE", None) is None
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy import create_engine
+
+from shared_kernel.infra.database import connection, migration
+from shared_kernel.infra.database.orm import init_orm_mappers, mapper_registry, metadata
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """
+    Empty SQLite file migrated like the real one; get_db_session and unit_of_work use it.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'measurements.db'}")
+    original = connection.engine
+    monkeypatch.setattr(connection, "engine", engine)
+    monkeypatch.setattr(migration, "engine", engine)
+    connection.SessionFactory.configure(bind=engine)
+    if not mapper_registry.mappers:
+        init_orm_mappers()
+
+    migration.run_migrations()
+    metadata.create_all(engine)
+    yield engine
+
+    connection.SessionFactory.configure(bind=original)
+    engine.dispose()
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from measurement.application.ingestion_queue import MeasurementIngestionQueue, MeasurementWriteError
+from measurement.application.range_cache import MeasurementRangeCache
+from measurement.application.use_cases.measurement_use_cases import CreateMeasurementListCommand
+from measurement.domain.model.services.measurement_service import CreateMeasurementRequest, MeasurementService
+from measurement.domain.model.value_object import MeasureType
+from measurement.infra.repository import MeasurementRepository
+from shared_kernel.infra.database.connection import get_db_session
+from shared_kernel.infra.live_feed import LiveFeed
+from shared_kernel.infra.revision import Revision
+from worker.application.event_log import EventLog
+from worker.application.use_cases.event_use_case import CreateEventCommand, CreateEventCommandRequest
+from worker.infra.repository import EventRepository
+
+START = datetime(2024, 3, 1, 12)
+
+
+@pytest.fixture
+def revision():
+    return Revision()
+
+
+@pytest.fixture
+def queue(database, revision):
+    command = CreateMeasurementListCommand(
+        service=MeasurementService(MeasurementRepository()),
+        cache=MeasurementRangeCache(max_bytes=1 << 20),
+        feed=LiveFeed(),
+        revision=revision,
+        db_session=get_db_session,
+    )
+    queue = MeasurementIngestionQueue(command, batch_size=50, flush_interval=0.05, max_retries=2, retry_delay=0)
+    yield queue
+    queue.stop()
+
+
+def _request(i):
+    return CreateMeasurementRequest(value=float(i), measure_type=MeasureType.PRESSURE, date_time=START + timedelta(seconds=i))
+
+
+def _count(database, table):
+    with database.connect() as connection:
+        return connection.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+def _write_event(title):
+    log = EventLog(repo=EventRepository(), db_session=get_db_session)
+    command = CreateEventCommand(repo=EventRepository(), log=log, db_session=get_db_session)
+    return lambda: command.execute(CreateEventCommandRequest(title=title, description=""))
+
+
+def test_put_requires_a_date(queue):
+    with pytest.raises(ValueError):
+        queue.put(CreateMeasurementRequest(value=1.0, measure_type=MeasureType.PRESSURE))
+
+
+def test_writes_measures_in_batches(queue, database, revision):
+    for i in range(120):
+        queue.put(_request(i))
+    queue.flush()
+
+    assert _count(database, "measures") == 120
+    assert _count(database, "latest_measures") == 1
+    # Una confirmacion por lote, no por medida
+    assert 1 <= revision.value <= 120 // 50 + 2
+
+
+def test_group_commits_measures_and_deferred_writes_together(queue, database, revision):
+    with queue.group():
+        queue.put(_request(0))
+        queue.put(_request(1))
+        queue.defer(_write_event("cycle"))
+    queue.flush()
+
+    assert _count(database, "measures") == 2
+    assert _count(database, "events") == 1
+    assert revision.value == 1
+
+
+def test_group_that_raises_enqueues_nothing(queue, database):
+    with pytest.raises(RuntimeError):
+        with queue.group():
+            queue.put(_request(0))
+            raise RuntimeError("cycle failed")
+    queue.flush()
+
+    assert _count(database, "measures") == 0
+
+
+def test_failed_batch_rolls_back_and_is_surfaced(queue, database, revision):
+    attempts = []
+
+    def fail():
+        attempts.append(1)
+        raise RuntimeError("disk full")
+
+    with queue.group():
+        queue.put(_request(0))
+        queue.defer(_write_event("cycle"))
+        queue.defer(fail)
+
+    with pytest.raises(MeasurementWriteError) as error:
+        queue.flush()
+
+    assert isinstance(error.value.__cause__, RuntimeError)
+    assert len(attempts) == queue.max_retries
+    # Ni medidas ni eventos del ciclo, y nada publicado
+    assert _count(database, "measures") == 0
+    assert _count(database, "events") == 0
+    assert revision.value == 0
+
+    # El error se informa una vez y la cola sigue escribiendo
+    queue.put(_request(1))
+    queue.flush()
+    assert _count(database, "measures") == 1
+
+
+def test_retried_batch_is_written_once(queue, database):
+    attempts = []
+
+    def fail_once():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("database is locked")
+
+    with queue.group():
+        queue.put(_request(0))
+        queue.defer(fail_once)
+    queue.flush()
+
+    assert len(attempts) == 2
+    assert _count(database, "measures") == 1
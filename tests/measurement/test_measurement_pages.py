@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from measurement.domain.model.services.measurement_service import CreateMeasurementRequest, MeasurementService
+from measurement.domain.model.value_object import MeasureType
+from measurement.infra.repository import MeasurementRepository
+from shared_kernel.infra.database.connection import get_db_session
+
+START = datetime(2024, 3, 1, 23, 59, 30)
+
+
+def _store(values, detail=None, step=timedelta(seconds=7), start=START):
+    service = MeasurementService(MeasurementRepository())
+    requests = [
+        CreateMeasurementRequest(value=value, measure_type=MeasureType.PRESSURE, detail=detail, date_time=start + step * i)
+        for i, value in enumerate(values)
+    ]
+    with get_db_session() as session:
+        service.create_measures(session=session, requests=requests)
+        session.commit()
+
+
+def test_pages_walk_the_range_once_in_order(database):
+    # Varias medidas con la misma fecha: el id desempata
+    _store([float(i) for i in range(25)], step=timedelta(seconds=0))
+    _store([float(i) for i in range(25, 40)], start=START + timedelta(seconds=1))
+    # Sin detalle la consulta incluye todos los detalles del tipo
+    _store([99.0], detail="Pi", start=START + timedelta(minutes=10))
+
+    seen = []
+    after = None
+    with get_db_session() as session:
+        while True:
+            page = MeasurementRepository.find_page(
+                session=session,
+                measure_type=MeasureType.PRESSURE,
+                start_date=START,
+                end_date=START + timedelta(days=1),
+                detail=None,
+                limit=7,
+                after=after,
+            )
+            if not page:
+                break
+            seen += page
+            after = (page[-1].created_at, page[-1].id)
+
+    assert [m.value for m in seen] == [float(i) for i in range(40)] + [99.0]
+    assert len({m.id for m in seen}) == len(seen)
+    assert [(m.created_at, m.id) for m in seen] == sorted((m.created_at, m.id) for m in seen)
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+from measurement.domain.model.services.measurement_service import CreateMeasurementRequest, MeasurementService
+from measurement.domain.model.value_object import MeasureType, RollupResolution
+from measurement.infra.repository import MeasurementRepository
+from shared_kernel.infra.database.connection import get_db_session
+from shared_kernel.infra.database.migration import backfill_measure_rollups
+from shared_kernel.infra.database.orm import measure_rollups_table
+
+START = datetime(2024, 3, 1, 23, 59, 30)
+
+
+def _store(values, detail=None, step=timedelta(seconds=7), start=START):
+    service = MeasurementService(MeasurementRepository())
+    requests = [
+        CreateMeasurementRequest(value=value, measure_type=MeasureType.PRESSURE, detail=detail, date_time=start + step * i)
+        for i, value in enumerate(values)
+    ]
+    with get_db_session() as session:
+        measures, _ = service.create_measures(session=session, requests=requests)
+        session.commit()
+    return measures
+
+
+def _rollups(engine):
+    columns = measure_rollups_table.c
+    with engine.connect() as connection:
+        return connection.execute(measure_rollups_table.select().order_by(
+            columns.resolution, columns.series_id, columns.bucket_start
+        )).all()
+
+
+def test_incremental_rollups_match_the_backfill(database):
+    # Cruza minutos, horas y el cambio de dia, en lotes separados y con dos detalles
+    _store([float(i % 13) for i in range(30)])
+    _store([float(i % 5) - 2.5 for i in range(30)], detail="Pi")
+    _store([100.0], start=START + timedelta(seconds=61))
+    incremental = _rollups(database)
+
+    with database.begin() as connection:
+        backfill_measure_rollups(connection)
+
+    assert incremental == _rollups(database)
+
+
+def test_rollups_are_aligned_to_their_resolution(database):
+    _store([1.0, 2.0, 3.0], step=timedelta(seconds=20))
+
+    with get_db_session() as session:
+        for resolution in RollupResolution:
+            rollups = MeasurementRepository.find_rollups(
+                session=session,
+                resolution=resolution,
+                measure_type=MeasureType.PRESSURE,
+                start_date=datetime(2024, 3, 1),
+                end_date=datetime(2024, 3, 3),
+                detail=None,
+            )
+            starts = [rollup.bucket_start for rollup in rollups]
+            assert starts == sorted({resolution.truncate(START + timedelta(seconds=20 * i)) for i in range(3)})
+            assert sum(rollup.samples for rollup in rollups) == 3
+            assert all(rollup.measure_type == MeasureType.PRESSURE and rollup.detail is None for rollup in rollups)
+
+
+def test_latest_measure_per_series(database):
+    _store([1.0, 2.0])
+    _store([5.0], detail="Pi")
+    # Una medida con fecha anterior no reemplaza la ultima
+    _store([9.0], start=START - timedelta(days=1))
+
+    with get_db_session() as session:
+        latest = MeasurementRepository.find_latest_records_for_all_measure_types(session=session)
+
+    assert sorted((m.detail or "", m.value) for m in latest) == [("", 2.0), ("Pi", 5.0)]
+
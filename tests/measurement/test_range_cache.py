@@ -0,0 +1,81 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from measurement.application.range_cache import MeasurementRangeCache, RangeKey, estimate_size
+from measurement.domain.model.value_object import MeasureType
+
+
+def _key(start_day, end_day, measure_type=MeasureType.PRESSURE, detail=None, query="range"):
+    return RangeKey(query, measure_type, detail, datetime(2024, 1, start_day), datetime(2024, 1, end_day))
+
+
+def _measure(day, measure_type=MeasureType.PRESSURE, detail=None):
+    return SimpleNamespace(measure_type=measure_type, detail=detail, created_at=datetime(2024, 1, day, 12))
+
+
+def _result(points=10):
+    return [SimpleNamespace(value=float(i)) for i in range(points)]
+
+
+def test_get_returns_what_was_put_and_counts_hits():
+    cache = MeasurementRangeCache(max_bytes=1 << 20)
+    result = _result()
+
+    assert cache.get(_key(1, 2)) is None
+    cache.put(_key(1, 2), result, cache.version)
+
+    assert cache.get(_key(1, 2)) is result
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.size_bytes == estimate_size(result)
+
+
+def test_evicts_least_recently_used_past_max_bytes():
+    size = estimate_size(_result())
+    cache = MeasurementRangeCache(max_bytes=size * 2)
+    cache.put(_key(1, 2), _result(), cache.version)
+    cache.put(_key(2, 3), _result(), cache.version)
+    cache.get(_key(1, 2))
+
+    cache.put(_key(3, 4), _result(), cache.version)
+
+    assert cache.get(_key(2, 3)) is None
+    assert cache.get(_key(1, 2)) is not None
+    assert cache.get(_key(3, 4)) is not None
+    assert cache.stats().size_bytes <= cache.max_bytes
+
+
+def test_does_not_keep_a_result_larger_than_the_cache():
+    cache = MeasurementRangeCache(max_bytes=10)
+    cache.put(_key(1, 2), _result(), cache.version)
+
+    assert cache.stats().entries == 0
+
+
+def test_insert_drops_only_the_windows_it_lands_in():
+    cache = MeasurementRangeCache(max_bytes=1 << 20)
+    keys = {
+        "covering": _key(1, 5),
+        "before": _key(1, 2),
+        "other_type": _key(1, 5, measure_type=MeasureType.TEMPERATURE),
+        "other_detail": _key(1, 5, detail="Po"),
+        "same_detail": _key(1, 5, detail="Pi"),
+        "all_details": _key(1, 5, detail="Todos"),
+    }
+    for key in keys.values():
+        cache.put(key, _result(), cache.version)
+
+    cache.invalidate([_measure(3, detail="Pi"), _measure(4, detail="Pi")])
+
+    kept = {name for name, key in keys.items() if cache.get(key) is not None}
+    assert kept == {"before", "other_type", "other_detail"}
+
+
+def test_result_read_before_an_invalidation_is_not_stored():
+    cache = MeasurementRangeCache(max_bytes=1 << 20)
+    version = cache.version
+
+    cache.invalidate([_measure(3)])
+    cache.put(_key(1, 5), _result(), version)
+
+    assert cache.get(_key(1, 5)) is None
@@ -0,0 +1,113 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from shared_kernel.infra.database import migration
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'measurements.db'}")
+    monkeypatch.setattr(migration, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def _execute(engine, *statements):
+    with engine.begin() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def _rows(engine, statement):
+    with engine.connect() as connection:
+        return connection.execute(text(statement)).all()
+
+
+def _columns(engine, table):
+    return {column["name"] for column in inspect(engine).get_columns(table)}
+
+
+def test_converts_text_measures_to_series(engine):
+    _execute(
+        engine,
+        "CREATE TABLE measures (id INTEGER PRIMARY KEY, measure_type TEXT, detail TEXT, created_at TEXT, value REAL)",
+        "INSERT INTO measures VALUES (3, 'PRESSURE', 'Pi', '2024-05-01 10:00:00.250000', 1.5)",
+        "INSERT INTO measures VALUES (7, 'PRESSURE', 'Pi', '2024-05-01 10:00:30', 2.5)",
+        "INSERT INTO measures VALUES (9, 'TEMPERATURE', NULL, '2024-05-01 11:00:00', 20.0)",
+        "INSERT INTO measures VALUES (12, 'TEMPERATURE', NULL, NULL, 21.0)",
+    )
+
+    migration.run_migrations()
+
+    series = {(r.measure_type, r.detail): r.id for r in _rows(engine, "SELECT id, measure_type, detail FROM series")}
+    assert set(series) == {("PRESSURE", "Pi"), ("TEMPERATURE", "")}
+    assert "unit" not in _columns(engine, "series")
+
+    epoch = datetime(1970, 1, 1)
+    millis = int((datetime(2024, 5, 1, 10) - epoch).total_seconds()) * 1000
+    assert _rows(engine, "SELECT id, series_id, created_at, value FROM measures ORDER BY id") == [
+        (3, series[("PRESSURE", "Pi")], millis + 250, 1.5),
+        (7, series[("PRESSURE", "Pi")], millis + 30000, 2.5),
+        (9, series[("TEMPERATURE", "")], millis + 3600000, 20.0),
+    ]
+    assert [r.id for r in _rows(engine, "SELECT id FROM measures_rejected")] == [12]
+    assert not inspect(engine).has_table("measures_legacy")
+
+    assert _rows(engine, "SELECT series_id, value, created_at FROM latest_measures ORDER BY series_id") == sorted([
+        (series[("PRESSURE", "Pi")], 2.5, "2024-05-01 10:00:30.000000"),
+        (series[("TEMPERATURE", "")], 20.0, "2024-05-01 11:00:00.000000"),
+    ])
+    assert _rows(engine, """
+        SELECT series_id, bucket_start, samples, min_value, max_value, sum_value
+        FROM measure_rollups WHERE resolution = 'HOUR' ORDER BY series_id
+    """) == sorted([
+        (series[("PRESSURE", "Pi")], "2024-05-01 10:00:00.000000", 2, 1.5, 2.5, 4.0),
+        (series[("TEMPERATURE", "")], "2024-05-01 11:00:00.000000", 1, 20.0, 20.0, 20.0),
+    ])
+
+
+def test_rebuilds_derived_tables_keyed_by_measure_type(engine):
+    _execute(
+        engine,
+        "CREATE TABLE series (id INTEGER PRIMARY KEY, measure_type TEXT NOT NULL, detail TEXT NOT NULL, unit TEXT, "
+        "CONSTRAINT uix_series_key UNIQUE (measure_type, detail))",
+        "CREATE TABLE measures (id INTEGER PRIMARY KEY, series_id INTEGER NOT NULL, created_at INTEGER NOT NULL, value REAL NOT NULL)",
+        "CREATE TABLE latest_measures (measure_type TEXT, detail TEXT, value REAL, created_at DATETIME, "
+        "PRIMARY KEY (measure_type, detail))",
+        "CREATE TABLE measure_rollups (resolution TEXT, measure_type TEXT, detail TEXT, bucket_start DATETIME, "
+        "samples INTEGER, min_value REAL, max_value REAL, sum_value REAL, sum_squares REAL, "
+        "PRIMARY KEY (resolution, measure_type, detail, bucket_start))",
+        "INSERT INTO series VALUES (1, 'PRESSURE', 'Pi', 'bar')",
+        "INSERT INTO measures VALUES (1, 1, 60000, 4.0)",
+        "INSERT INTO latest_measures VALUES ('PRESSURE', 'Pi', 4.0, '1970-01-01 00:01:00.000000')",
+    )
+
+    migration.run_migrations()
+
+    assert "unit" not in _columns(engine, "series")
+    assert _columns(engine, "latest_measures") == {"series_id", "value", "created_at"}
+    assert "measure_type" not in _columns(engine, "measure_rollups")
+    assert _rows(engine, "SELECT series_id, value FROM latest_measures") == [(1, 4.0)]
+    assert _rows(engine, "SELECT resolution, series_id, samples FROM measure_rollups ORDER BY resolution") == [
+        ("DAY", 1, 1), ("HOUR", 1, 1), ("MINUTE", 1, 1)
+    ]
+
+
+def test_is_idempotent(engine):
+    migration.run_migrations()
+    _execute(
+        engine,
+        "INSERT INTO series (id, measure_type, detail) VALUES (1, 'PRESSURE', '')",
+        "INSERT INTO measures (series_id, created_at, value) VALUES (1, 0, 1.0)",
+        "INSERT INTO latest_measures (series_id, value, created_at) VALUES (1, 1.0, '1970-01-01 00:00:00.000000')",
+        "UPDATE event_cursor SET acknowledged_id = 5",
+    )
+
+    migration.run_migrations()
+
+    assert _rows(engine, "SELECT series_id, value FROM latest_measures") == [(1, 1.0)]
+    # Las tablas ya migradas no se reconstruyen: el rollup vacio sigue vacio
+    assert _rows(engine, "SELECT COUNT(*) FROM measure_rollups") == [(0,)]
+    assert _rows(engine, "SELECT acknowledged_id FROM event_cursor") == [(5,)]
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+import pytest
+
+from shared_kernel.infra.database.connection import get_db_session, unit_of_work
+from worker.application.event_log import EventLog
+from worker.application.use_cases.event_use_case import CreateEventCommand, CreateEventCommandRequest
+from worker.infra.repository import EventRepository
+
+
+def _log(capacity=500):
+    return EventLog(repo=EventRepository(), db_session=get_db_session, capacity=capacity)
+
+
+def _write(log, title):
+    command = CreateEventCommand(repo=EventRepository(), log=log, db_session=get_db_session)
+    return command.execute(CreateEventCommandRequest(title=title, description=""))
+
+
+def test_acknowledged_cursor_survives_a_restart(database):
+    log = _log()
+    events = [_write(log, f"event {i}") for i in range(3)]
+
+    assert log.first_pending().id == events[0].id
+    assert log.acknowledge().id == events[0].id
+    assert log.acknowledge().id == events[1].id
+
+    restarted = _log()
+    assert restarted.first_pending().id == events[2].id
+    assert restarted.last_id == events[2].id
+
+
+def test_cursor_older_than_the_buffer_reads_the_database(database):
+    log = _log(capacity=2)
+    ids = [_write(log, f"event {i}").id for i in range(5)]
+
+    assert [e.id for e in log.after(0, limit=10)] == ids
+    assert [e.id for e in log.after(ids[1], limit=2)] == ids[2:4]
+    assert [e.id for e in _log(capacity=2).after(ids[0], limit=10)] == ids[1:]
+
+
+def test_rolled_back_event_is_never_published(database):
+    log = _log()
+    first = _write(log, "kept")
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            _write(log, "rolled back")
+            raise RuntimeError("cycle failed")
+
+    # El lock de escritura se libero: la siguiente escritura no se bloquea
+    second = _write(log, "next")
+    assert [e.title for e in log.after(0, limit=10)] == ["kept", "next"]
+    assert [e.title for e in _log().after(first.id - 1, limit=10)] == ["kept", "next"]
+    assert second.id > first.id
+
+
+def test_long_poll_wakes_on_a_new_event(database):
+    log = _log()
+    last_id = _write(log, "before").id
+
+    async def poll():
+        writer = threading.Timer(0.1, _write, args=(log, "after"))
+        writer.start()
+        try:
+            return await log.wait_after(last_id, limit=10, timeout=5)
+        finally:
+            writer.join()
+
+    events = asyncio.run(poll())
+    assert [e.title for e in events] == ["after"]
+
+
+def test_long_poll_times_out_empty(database):
+    log = _log()
+    last_id = _write(log, "before").id
+
+    assert asyncio.run(log.wait_after(last_id, limit=10, timeout=0.05)) == []
@@ -0,0 +1,136 @@
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from measurement.infra.api.device_api_service import DeviceCommunicationError, retry_request
+from worker.application.services.worker_flow_service import WorkerFlowService
+from worker.domain.model.value_object import PositionType
+
+
+class FakeWorkerService:
+    """
+    Records what the poll loop asks for; cycles and writes only go to lists.
+    """
+
+    def __init__(self, times=2, get_measure=None, verify_alarm_levels=None):
+        self.step = SimpleNamespace(period=0, lead=0, get_times_to_be_executed=lambda: times)
+        self.cycles = []
+        self.writes = []
+        self.flushes = 0
+        self._get_measure = get_measure or (lambda step: ["measure"])
+        self._verify_alarm_levels = verify_alarm_levels or (lambda measures, history: None)
+
+    def flush_writes(self):
+        self.flushes += 1
+
+    def stop_measure(self):
+        pass
+
+    def register_event(self, *args):
+        self.writes.append(("event", args))
+
+    def get_step_definition_from_position(self, position):
+        return [self.step]
+
+    def new_measure_history(self):
+        return object()
+
+    def preload_alarm_sounds(self):
+        pass
+
+    def get_measure(self, step):
+        return self._get_measure(step)
+
+    @contextmanager
+    def write_cycle(self):
+        cycle = []
+        self.cycles.append(cycle)
+        yield
+
+    def register_measures(self, measures, history):
+        self.cycles[-1].append(("measures", measures))
+
+    def verify_alarm_levels(self, measures, history):
+        self._verify_alarm_levels(measures, history)
+        self.cycles[-1].append(("alarms", measures))
+
+    def write_behind(self, work):
+        self.writes.append(("status", work))
+
+    def get_next_position(self, position):
+        return PositionType.SECOND
+
+
+def _flow(worker_service):
+    status = SimpleNamespace(position=PositionType.FIRST.value, times_executed=0)
+    return WorkerFlowService(
+        worker_service=worker_service,
+        worker_flow_status_query=SimpleNamespace(get_worker_flow_status=lambda: status),
+        worker_flow_status_command=SimpleNamespace(execute=lambda request: None),
+    )
+
+
+def test_cycles_are_written_behind():
+    worker_service = FakeWorkerService(times=2)
+
+    asyncio.run(_flow(worker_service).handle())
+
+    assert worker_service.flushes == 1
+    assert worker_service.cycles == [[("measures", ["measure"]), ("alarms", ["measure"])]] * 2
+    # Un estado por ciclo y el del paso siguiente, todos encolados
+    assert [kind for kind, _ in worker_service.writes] == ["status"] * 3
+
+
+def test_device_error_stops_the_step_with_its_cause():
+    cause = DeviceCommunicationError("timeout")
+
+    def get_measure(step):
+        raise cause
+
+    worker_service = FakeWorkerService(get_measure=get_measure)
+
+    with pytest.raises(DeviceCommunicationError) as error:
+        asyncio.run(_flow(worker_service).handle())
+
+    assert error.value.__cause__ is cause
+    assert worker_service.cycles == []
+    assert worker_service.writes == []
+
+
+def test_other_errors_propagate_unchanged():
+    def verify_alarm_levels(measures, history):
+        raise ZeroDivisionError()
+
+    worker_service = FakeWorkerService(verify_alarm_levels=verify_alarm_levels)
+
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(_flow(worker_service).handle())
+
+    assert worker_service.writes == []
+
+
+def test_retry_request_raises_device_error_after_the_last_attempt():
+    calls = []
+
+    @retry_request(max_retries=3, delay=0)
+    def read():
+        calls.append(1)
+        raise requests.ConnectionError("unreachable")
+
+    with pytest.raises(DeviceCommunicationError) as error:
+        read()
+
+    assert len(calls) == 3
+    assert isinstance(error.value.__cause__, requests.ConnectionError)
+
+
+def test_retry_request_does_not_wrap_other_errors():
+    @retry_request(max_retries=3, delay=0)
+    def read():
+        raise KeyError("value")
+
+    with pytest.raises(KeyError):
+        read()
@@ -0,0 +1,165 @@
+import asyncio
+from collections import deque
+from threading import Lock, RLock
+from typing import Callable, ContextManager, Deque, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from worker.domain.model.aggregate import Event
+from worker.infra.repository import EventRepository
+from shared_kernel.infra.database.connection import after_commit
+
+
+class EventLog:
+    """
+    Ring buffer of the most recent events in front of the append-only events table.
+    Long-polling readers wait here for ids after their cursor; older cursors are
+    served from the database.
+    """
+
+    def __init__(self, repo: EventRepository, db_session: Callable[[], ContextManager[Session]], capacity: int = 500):
+        self.repo = repo
+        self.db_session = db_session
+        self._events: Deque[Event] = deque(maxlen=capacity)
+        self._last_id: Optional[int] = None
+        # Cursor del consumo antiguo GET/DELETE /worker/ws, guardado en event_cursor
+        self._acknowledged_id: Optional[int] = None
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+        self._lock = Lock()
+        self._load_lock = Lock()
+        # Reentrante: una unidad de trabajo puede escribir varios eventos antes de confirmar
+        self._write_lock = RLock()
+
+    @property
+    def last_id(self) -> int:
+        self._ensure_loaded()
+        return self._last_id
+
+    def write(self, persist: Callable[[], Event]) -> Event:
+        """
+        Runs `persist` (insert + commit) and appends the event it returns once it is
+        committed. Writers go one at a time, holding the lock until that commit, so ids
+        reach the log in commit order and no reader cursor skips one.
+        """
+        self._ensure_loaded()
+        self._write_lock.acquire()
+        try:
+            event = persist()
+        except BaseException:
+            self._write_lock.release()
+            raise
+
+        def append():
+            try:
+                self._append(event)
+            finally:
+                self._write_lock.release()
+
+        # Dentro de una unidad de trabajo se publica al confirmar el ciclo; si falla, no existio
+        after_commit(append, on_rollback=self._write_lock.release)
+        return event
+
+    def _append(self, event: Event):
+        with self._lock:
+            self._events.append(event)
+            self._last_id = event.id
+            waiters, self._waiters = self._waiters, set()
+
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # El loop del lector ya se cerro
+                pass
+
+    def after(self, after_id: int, limit: int) -> List[Event]:
+        self._ensure_loaded()
+        events = self._recent_after(after_id, limit)
+        if events is not None:
+            return events
+        return self._find_after(after_id, limit)
+
+    async def load(self):
+        """
+        Loads the recent events from the database on first use, off the event loop.
+        """
+        if self._last_id is None:
+            await asyncio.to_thread(self._ensure_loaded)
+
+    def _recent_after(self, after_id: int, limit: int) -> Optional[List[Event]]:
+        # None si el cursor es anterior al buffer y hay que ir a la base
+        with self._lock:
+            if not self._events or after_id >= self._events[0].id - 1:
+                return [e for e in self._events if e.id > after_id][:limit]
+        return None
+
+    def _find_after(self, after_id: int, limit: int) -> List[Event]:
+        with self.db_session() as session:
+            return self.repo.find_after(session=session, after_id=after_id, limit=limit)
+
+    def first_pending(self) -> Optional[Event]:
+        self._ensure_loaded()
+        events = self.after(self._acknowledged_id, limit=1)
+        return events[0] if events else None
+
+    def acknowledge(self) -> Optional[Event]:
+        event = self.first_pending()
+        if event is None:
+            return None
+        with self.db_session() as session:
+            self.repo.acknowledge(session=session, event_id=event.id)
+            session.commit()
+        with self._lock:
+            self._acknowledged_id = max(self._acknowledged_id, event.id)
+        return event
+
+    async def wait_after(self, after_id: int, limit: int, timeout: float) -> List[Event]:
+        """
+        Events with id > `after_id`, waiting up to `timeout` seconds for the first one.
+        Database reads run in a worker thread so the event loop never blocks on them.
+        """
+        await self.load()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            future = loop.create_future()
+            waiter = (loop, future)
+            # Se registra antes de leer para no perder un append entre ambas cosas
+            with self._lock:
+                self._waiters.add(waiter)
+            events = self._recent_after(after_id, limit)
+            if events is None:
+                events = await asyncio.to_thread(self._find_after, after_id, limit)
+            remaining = deadline - loop.time()
+            if events or remaining <= 0:
+                with self._lock:
+                    self._waiters.discard(waiter)
+                return events
+            try:
+                await asyncio.wait_for(future, timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    self._waiters.discard(waiter)
+
+    def _ensure_loaded(self):
+        if self._last_id is not None:
+            return
+        # La lectura no toma _lock: los lectores en memoria no esperan a la base
+        with self._load_lock:
+            if self._last_id is not None:
+                return
+            with self.db_session() as session:
+                recent = self.repo.find_last(session=session, limit=self._events.maxlen)
+                # Lo pendiente antes de un reinicio se sigue entregando por /worker/ws
+                acknowledged_id = self.repo.get_acknowledged_id(session=session)
+            with self._lock:
+                self._events.extend(reversed(recent))
+                self._acknowledged_id = acknowledged_id
+                self._last_id = recent[0].id if recent else 0
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
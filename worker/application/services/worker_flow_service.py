@@ -1,6 +1,6 @@
 import asyncio
-from typing import List
 from measurement.domain.model.value_object import SensorType
+from measurement.infra.api.device_api_service import DeviceCommunicationError
 from worker.application.use_cases.worker_flow_status_use_case import UpdateWorkerFlowStatusRequest, WorkerFlowStatusUpdateCommand, WorkerFlowStatusQueryUseCase
 from worker.domain.model.aggregate import StepDefinition, WorkerFlowStatus
 from worker.domain.model.services.worker_service import WorkerService
@@ -20,7 +20,8 @@ class WorkerFlowService():
         self.worker_flow_status_command = worker_flow_status_command
         
     async def handle(self):
-        
+        # El estado se lee de la base: antes se escribe lo encolado, fuera del loop
+        await asyncio.to_thread(self.worker_service.flush_writes)
         status: WorkerFlowStatus = self.worker_flow_status_query.get_worker_flow_status()
 
         position = PositionType.from_value(status.position)
@@ -32,7 +33,8 @@ class WorkerFlowService():
         data = self.worker_service.get_step_definition_from_position(position)
         if data:
             step = data[0]
-            measure_history: List[float] = []
+            measure_history = self.worker_service.new_measure_history()
+            self.worker_service.preload_alarm_sounds()
             
             times_to_be_executed = step.get_times_to_be_executed()
             times_executed = status.times_executed
@@ -42,24 +44,25 @@ class WorkerFlowService():
             while times_executed < times_to_be_executed:
                 try:
                     measures = self.worker_service.get_measure(step)
-
-                    logger.logger.info('Saving measure and verifying alarm level')
-                    for measure in measures:
-                        self.worker_service.register_measure(measure, measure_history)
-                        self.worker_service.verify_alarm_level(measure, measure_history)
-
-                    logger.logger.info('End measure and verifying alarm level')
-
-                    await self._lead_period(step)
-
-                    self._prepare_next_iteration(position, times_executed)
-                    times_executed += 1
-                except:
+                except DeviceCommunicationError as e:
                     logger.logger.error(
                         "!!!!!!!!!!!!!!! Can't reach device to get measures for position: [%s]!!!!!!!!!!!!!!!", 
                         position
                     )
-                    raise Exception("Communication lost with the device.")
+                    raise DeviceCommunicationError("Communication lost with the device.") from e
+
+                logger.logger.info('Saving measure and verifying alarm level')
+                # Medidas, alarmas, eventos y estado del ciclo: se escriben en segundo plano,
+                # en una sola transaccion, sin esperar al commit
+                with self.worker_service.write_cycle():
+                    self.worker_service.register_measures(measures, measure_history)
+                    self.worker_service.verify_alarm_levels(measures, measure_history)
+                    self._prepare_next_iteration(position, times_executed)
+
+                logger.logger.info('End measure and verifying alarm level')
+
+                await self._lead_period(step)
+                times_executed += 1
 
             await self._lead_final(step)
         else:
@@ -71,7 +74,7 @@ class WorkerFlowService():
             logger.logger.info("*************** Sending stop signal ****************")
             self.worker_service.stop_measure()
         except Exception:
-            self.worker_service._register_event(
+            self.worker_service.register_event(
                 "ATENCION",
                 "Error de comunicacion durante la orden de detención de sensor",
                 None,
@@ -93,12 +96,12 @@ class WorkerFlowService():
 
     def _register_status(self, position, times_executed: int):
         logger.logger.info(f"Saving status in DB: {position}")
-        self.worker_flow_status_command.execute(
-            UpdateWorkerFlowStatusRequest(
-                position=position,
-                times_executed=times_executed
-            )
+        request = UpdateWorkerFlowStatusRequest(
+            position=position,
+            times_executed=times_executed
         )
+        # Detras de las medidas del ciclo, en el hilo escritor
+        self.worker_service.write_behind(lambda: self.worker_flow_status_command.execute(request))
 
     async def _lead_period(self, step: StepDefinition):
         logger.logger.info(f'Awaiting {step.period} seconds defined in period')
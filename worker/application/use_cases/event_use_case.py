@@ -1,4 +1,4 @@
-from typing import Callable, ContextManager, Optional
+from typing import Callable, ContextManager, List, Optional
 
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
@@ -7,18 +7,23 @@ from alarming.domain.model.value_object import AlarmType
 from measurement.domain.model.value_object import MeasureType
 from worker.domain.model.aggregate import Event
 
+from worker.application.event_log import EventLog
 from worker.infra.repository import EventRepository
 
 
 class EventQueryUseCase:
-    def __init__(self, repo: EventRepository, db_session: Callable[[], ContextManager[Session]]):
-        self.repo = repo
-        self.db_session = db_session
+    def __init__(self, log: EventLog):
+        self.log = log
+
+    def get(self) -> Optional[Event]:
+        return self.log.first_pending()
+
+    async def get_last_id(self) -> int:
+        await self.log.load()
+        return self.log.last_id
 
-    def get(self) -> Event:
-        with self.db_session() as session:
-            value = self.repo.get_first(session)
-            return value
+    async def wait_after(self, after_id: int, limit: int, timeout: float) -> List[Event]:
+        return await self.log.wait_after(after_id=after_id, limit=limit, timeout=timeout)
 
 
 class CreateEventCommandRequest(BaseModel):
@@ -29,27 +34,24 @@ class CreateEventCommandRequest(BaseModel):
 
 
 class DeleteEventCommand:
-    def __init__(self, repo: EventRepository, db_session: Callable[[], ContextManager[Session]]):
-        self.repo = repo
-        self.db_session = db_session
+    def __init__(self, log: EventLog):
+        self.log = log
 
-    def execute(self) -> Event:
-        with self.db_session() as session:
-            event_saved = self.repo.get_first(session=session)
-            self.repo.delete(session, event_saved)
-            session.commit()
+    def execute(self) -> Optional[Event]:
+        # El registro no se borra: solo avanza el cursor de /worker/ws
+        return self.log.acknowledge()
 
 
 class CreateEventCommand:
-    def __init__(self, repo: EventRepository, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(self, repo: EventRepository, log: EventLog, db_session: Callable[[], ContextManager[Session]]):
         self.repo = repo
+        self.log = log
         self.db_session = db_session
 
     def execute(self, request: CreateEventCommandRequest) -> Event:
-        with self.db_session() as session:
-            event_saved = self.repo.get_first(session=session)
-            if event_saved is None:
-                self.repo.add(
+        def persist() -> Event:
+            with self.db_session() as session:
+                event = self.repo.add(
                     session=session,
                     instance=Event.create(
                         title=request.title,
@@ -59,3 +61,6 @@ class CreateEventCommand:
                     )
                 )
                 session.commit()
+                return event
+
+        return self.log.write(persist)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from datetime import datetime
 from typing import Optional
 from shared_kernel.domain.entity import AggregateRoot
 from dataclasses import dataclass
@@ -8,8 +9,10 @@ from worker.domain.model.value_object import PositionType
 
 dataclass(eq=False)
 class Event():
+    id: int
     title: str
     description: str
+    created_at: datetime
 
     alarm_type: Optional[str] = None
     measure_type: Optional[str] = None
@@ -28,6 +31,7 @@ class Event():
             description=description,
             alarm_type=alarm_type,
             measure_type=measure_type,
+            created_at=datetime.now(),
         )
 
 
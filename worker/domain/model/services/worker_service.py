@@ -1,8 +1,11 @@
-from typing import  List
+import time
+from datetime import datetime
+from typing import  Callable, List
 
-from measurement.infra.api.device_api_service import MeasurementDeviceApiService
+from measurement.infra.api.device_api_service import DeviceCommunicationError, MeasurementDeviceApiService
 from measurement.infra.api.response import DeviceMeasure
-from measurement.application.use_cases.measurement_use_cases import CreateMeasurementCommand, DeviceMeasurementQueryUseCase, CreateMeasurementRequest
+from measurement.application.use_cases.measurement_use_cases import DeviceMeasurementQueryUseCase, CreateMeasurementRequest
+from measurement.application.ingestion_queue import MeasurementIngestionQueue
 
 from worker.application.use_cases.step_definition_use_case import StepDefinitionQueryUseCase
 from worker.application.use_cases.event_use_case import  CreateEventCommandRequest, CreateEventCommand
@@ -10,14 +13,15 @@ from worker.domain.model.aggregate import StepDefinition
 from worker.domain.model.value_object import PositionType
 
 from alarming.application.use_cases.alarm_definition_use_cases import AlarmDefinitionQueryUseCase
-from alarming.application.use_cases.alarm_use_cases import CreateAlarmCommand
-from alarming.domain.model.aggregate import AlarmDefinition
-from alarming.domain.model.value_object import AlarmTypeFactory
+from alarming.application.alarm_rule_index import AlarmEvaluation, TriggeredAlarm
+from alarming.application.use_cases.alarm_use_cases import CreateAlarmListCommand
+from alarming.domain.model.alarm_state import AlarmStateTracker
+from alarming.domain.model.rolling_window import SeriesWindows
 from alarming.domain.model.services import RegisterAlarmRequest
 
-import pygame
-
 from shared_kernel.infra import logger
+from shared_kernel.infra.database.connection import after_commit
+from shared_kernel.infra.notification import Notification, NotificationDispatcher
 
 class NotConfiguredPositionError(Exception):
     pass
@@ -29,17 +33,20 @@ class WorkerService:
         # WORKER
         step_definition_query: StepDefinitionQueryUseCase,
         # MEASUREMENT
-        measurement_command: CreateMeasurementCommand,
+        measurement_queue: MeasurementIngestionQueue,
         measurement_query: DeviceMeasurementQueryUseCase,
         device_api_service: MeasurementDeviceApiService, 
         # ALARM
         alarm_def_query: AlarmDefinitionQueryUseCase,
-        alarm_command: CreateAlarmCommand,
-        event_command: CreateEventCommand
+        alarm_command: CreateAlarmListCommand,
+        event_command: CreateEventCommand,
+        alarm_states: AlarmStateTracker,
+        notifier: NotificationDispatcher,
+        alarm_window_size: int = 500
     ):
         self.step_definition_query = step_definition_query
         # MEASUREMENT
-        self.measurement_command = measurement_command
+        self.measurement_queue = measurement_queue
         self.measurement_query = measurement_query
 
         # DEVICE
@@ -48,6 +55,9 @@ class WorkerService:
         # ALARM
         self.alarm_query = alarm_def_query
         self.alarm_command = alarm_command
+        self.alarm_states = alarm_states
+        self.notifier = notifier
+        self.alarm_window_size = alarm_window_size
         # ALARM
         self.event_command = event_command
 
@@ -61,9 +71,9 @@ class WorkerService:
         logger.logger.info(f"Getting {step.sensor_type} measure from device")
         try:
             return self.measurement_query.get_measures(step.sensor_type)
-        except Exception as e:
+        except DeviceCommunicationError as e:
             logger.logger.exception("An error ocurred retrieving measure for step: %s", step)
-            self._register_event(
+            self.register_event(
                 "ATENCION",
                 f"Error de comunicacion durante lectura del paso: {step.position}",
                 None,
@@ -75,31 +85,53 @@ class WorkerService:
         logger.logger.info(f"Sending stop message...")
         return self.device_api_service.stop()
 
-    def register_measure(self, measure: DeviceMeasure, measure_history: List[float]):
-        measure_history.append(measure.value)
-        self.measurement_command.execute(
-            CreateMeasurementRequest(
-                value=measure.value,
-                measure_type=measure.measure_type,
-                detail= measure.detail
+    def new_measure_history(self) -> SeriesWindows:
+        return SeriesWindows(size=self.alarm_window_size)
+
+    def preload_alarm_sounds(self):
+        # Decodifica los sonidos de las alarmas habilitadas antes del primer disparo
+        self.notifier.preload(self.alarm_query.get_alarm_rule_set().sound_paths)
+
+    def write_cycle(self):
+        # Lo que se encola dentro del bloque se confirma en una sola transaccion
+        return self.measurement_queue.group()
+
+    def write_behind(self, work: Callable[[], None]):
+        # Se escribe en el hilo escritor, junto con las medidas encoladas antes
+        self.measurement_queue.defer(work)
+
+    def flush_writes(self):
+        self.measurement_queue.flush()
+
+    def register_measures(self, measures: List[DeviceMeasure], measure_history: SeriesWindows):
+        date_time = datetime.now()
+        for measure in measures:
+            measure_history.push(measure.measure_type, measure.detail, measure.value)
+            # Se persiste en segundo plano, en lotes
+            self.measurement_queue.put(
+                CreateMeasurementRequest(
+                    value=measure.value,
+                    measure_type=measure.measure_type,
+                    detail= measure.detail,
+                    date_time=date_time
+                )
             )
-        )
 
-    def verify_alarm_level(
+    def verify_alarm_levels(
             self,
-            measure: DeviceMeasure,
-            measure_history: List[float]
+            measures: List[DeviceMeasure],
+            measure_history: SeriesWindows
         ):
-        alarm_definitions = self.alarm_query.get_alarms_definition_by_measure_type(
-            measure_type=measure.measure_type,
-            measure_detail=measure.detail
+        # Todas las reglas contra todas las series leidas en el ciclo, de una vez (en memoria)
+        evaluation = self.alarm_query.get_alarm_rule_set().evaluate(
+            measure_history,
+            series=[(measure.measure_type, measure.detail) for measure in measures],
+            states=self.alarm_states,
+            now=time.monotonic()
         )
-        if alarm_definitions:
-            for alarm_definition in alarm_definitions:
-                if alarm_definition.enabled:
-                    alarm_type = AlarmTypeFactory.get_alarm(alarm_type=alarm_definition.alarm_type)
-                    if alarm_type.check(parametrized_value=alarm_definition.config_value, measures=measure_history):
-                        self._trigger_alarm(alarm_definition=alarm_definition, measure_value= measure.value)
+        # Solo los cambios de estado se registran; una alarma activa no vuelve a disparar
+        if evaluation.raised or evaluation.cleared:
+            self.write_behind(lambda: self._save_evaluation(evaluation))
 
     def get_next_position(self, current_enum: PositionType) -> PositionType:
         enum_members = list(PositionType)
@@ -107,34 +139,53 @@ class WorkerService:
         next_index = (current_index + 1) % len(enum_members)
         return enum_members[next_index]
     
-    def _reproduce(self, sound_path: str):
-        try:
-            logger.logger.info(f'Playing {sound_path}')
-            pygame.mixer.init()
-            pygame.mixer.music.load(sound_path)
-            pygame.mixer.music.play()
-        except:
-            logger.logger.error("Error while playing sound")            
-
-    def _save_alarm(self, alarm_definition: AlarmDefinition, measure_value: float):
+    def _save_alarms(self, triggered: List[TriggeredAlarm]):
         self.alarm_command.execute(
-            request=RegisterAlarmRequest(
-                alarm_type= alarm_definition.alarm_type,
-                value= measure_value,
-                config_value= alarm_definition.config_value,
-                measure_type= alarm_definition.measure_type
-            )
+            requests=[
+                RegisterAlarmRequest(
+                    alarm_type= alarm.definition.alarm_type,
+                    value= alarm.measure_value,
+                    config_value= alarm.definition.config_value,
+                    measure_type= alarm.definition.measure_type
+                )
+                for alarm in triggered
+            ]
         )
 
-    def _trigger_alarm(self, alarm_definition: AlarmDefinition, measure_value: float):
-        self._register_event(
-            "ATENCION",
-            f"Alarma disparada",
-            alarm_definition.measure_type,
-            alarm_definition.alarm_type
-        )
-        self._reproduce(sound_path= alarm_definition.sound_path)
-        self._save_alarm(alarm_definition=alarm_definition, measure_value=measure_value)
+    def _save_evaluation(self, evaluation: AlarmEvaluation):
+        if evaluation.raised:
+            self._trigger_alarms(evaluation.raised)
+        for alarm in evaluation.cleared:
+            self._register_event(
+                "INFO",
+                f"Alarma normalizada",
+                alarm.definition.measure_type,
+                alarm.definition.alarm_type
+            )
+
+    def _trigger_alarms(self, triggered: List[TriggeredAlarm]):
+        for alarm in triggered:
+            self._register_event(
+                "ATENCION",
+                f"Alarma disparada",
+                alarm.definition.measure_type,
+                alarm.definition.alarm_type
+            )
+            # Sonido, log y webhook en sus propios hilos, una vez guardada la alarma
+            notification = Notification(
+                title="Alarma disparada",
+                description=f"{alarm.definition.measure_type} {alarm.definition.measure_detail} {alarm.definition.alarm_type}",
+                sound_path=alarm.definition.sound_path,
+                data={
+                    "measure_type": alarm.definition.measure_type,
+                    "measure_detail": alarm.definition.measure_detail,
+                    "alarm_type": alarm.definition.alarm_type,
+                    "measure_value": alarm.measure_value,
+                    "config_value": alarm.definition.config_value,
+                }
+            )
+            after_commit(lambda notification=notification: self.notifier.notify(notification))
+        self._save_alarms(triggered)
 
     def _register_event(self, title, description, measure_type, alarm_type):
         self.event_command.execute(
@@ -145,3 +196,7 @@ class WorkerService:
                 alarm_type=alarm_type
             )
         )
+
+    def register_event(self, title, description, measure_type, alarm_type):
+        # Desde el loop de sondeo: detras de las escrituras ya encoladas, sin esperar la base
+        self.write_behind(lambda: self._register_event(title, description, measure_type, alarm_type))
@@ -5,15 +5,19 @@ from configuration.infra.repository import ConfigurationRepository
 from configuration.application.use_case import ConfigurationQueryUseCase
 
 # Measurement
-from measurement.application.use_cases.measurement_use_cases import DeviceMeasurementQueryUseCase, CreateMeasurementCommand
+from measurement.application.use_cases.measurement_use_cases import DeviceMeasurementQueryUseCase, CreateMeasurementListCommand
+from measurement.application.ingestion_queue import MeasurementIngestionQueue
+from measurement.application.range_cache import MeasurementRangeCache
 from measurement.infra.api.device_api_service import MeasurementDeviceApiService
 from measurement.infra.api.device_repository import DeviceMeasureRepository
 from measurement.infra.repository import MeasurementRepository
 from measurement.domain.model.services.measurement_service import MeasurementService
 
 # Alarming
+from alarming.application.alarm_rule_index import AlarmRuleIndex
 from alarming.application.use_cases.alarm_definition_use_cases import AlarmDefinitionQueryUseCase
-from alarming.application.use_cases.alarm_use_cases import CreateAlarmCommand
+from alarming.application.use_cases.alarm_use_cases import CreateAlarmListCommand
+from alarming.domain.model.alarm_state import AlarmStateTracker
 from alarming.domain.model.services import AlarmDefinitionService, AlarmService
 from alarming.infra.repository import AlarmDefinitionRepository, AlarmRepository
 
@@ -31,6 +35,7 @@ from worker.application.use_cases.step_definition_use_case import (
     CreateStepDefinitionCommand,
     DeleteStepDefinitionCommand,
 )
+from worker.application.event_log import EventLog
 from worker.application.use_cases.event_use_case import (
     EventQueryUseCase, CreateEventCommand, DeleteEventCommand
 )
@@ -39,6 +44,10 @@ from worker.domain.model.step_definition_service import StepDefinitionService
 from worker.domain.model.services.worker_service import WorkerService
 
 from shared_kernel.infra.database.connection import get_db_session
+from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.infra.live_feed import LiveFeed
+from shared_kernel.infra.notification import NotificationDispatcher
+from shared_kernel.infra.revision import Revision
 
 
 class WorkerContainer(containers.DeclarativeContainer):
@@ -95,17 +104,32 @@ class WorkerContainer(containers.DeclarativeContainer):
         MeasurementService,
         repo=measurement_repo,
     )
-    measurement_command = providers.Factory(
-        CreateMeasurementCommand,
+    measurement_range_cache = providers.Dependency(instance_of=MeasurementRangeCache)
+    live_feed = providers.Dependency(instance_of=LiveFeed)
+    measurement_revision = providers.Dependency(instance_of=Revision)
+    measurement_list_command = providers.Factory(
+        CreateMeasurementListCommand,
         service=measurement_service,
+        cache=measurement_range_cache,
+        feed=live_feed,
+        revision=measurement_revision,
         db_session=get_db_session,
     )
+    # Una sola cola (y un solo hilo escritor) por proceso
+    measurement_queue = providers.Singleton(
+        MeasurementIngestionQueue,
+        command=measurement_list_command,
+    )
 
     # ALARM DEF
     alarm_def_repo = providers.Factory(AlarmDefinitionRepository)
+    alarm_definition_revision = providers.Dependency(instance_of=Revision)
+    alarm_rule_index = providers.Dependency(instance_of=AlarmRuleIndex)
     alarm_def_query = providers.Factory(
         AlarmDefinitionQueryUseCase,
         repo=alarm_def_repo,
+        revision=alarm_definition_revision,
+        rule_index=alarm_rule_index,
         db_session=get_db_session,
     )
     alarm_def_service = providers.Factory(
@@ -120,41 +144,55 @@ class WorkerContainer(containers.DeclarativeContainer):
         repo=alarm_repo
     )
     alarm_command = providers.Factory(
-        CreateAlarmCommand,
+        CreateAlarmListCommand,
         service=alarm_service,
+        feed=live_feed,
         db_session=get_db_session,
     )
 
+    notification_dispatcher = providers.Dependency(instance_of=NotificationDispatcher)
+
+    # Estado activo/normalizado de cada alarma, en memoria del proceso
+    alarm_states = providers.Singleton(AlarmStateTracker)
+
     # EVENT
     event_repository = providers.Factory(
         EventRepository,
     )
-    event_query = providers.Factory(
-        EventQueryUseCase,
+    # Eventos recientes en memoria y lectores en espera, uno por proceso
+    event_log = providers.Singleton(
+        EventLog,
         repo=event_repository,
         db_session=get_db_session,
     )
+    event_query = providers.Factory(
+        EventQueryUseCase,
+        log=event_log,
+    )
     event_command = providers.Factory(
         CreateEventCommand,
         db_session=get_db_session,
-        repo=event_repository
+        repo=event_repository,
+        log=event_log,
     )
     delete_event_command = providers.Factory(
         DeleteEventCommand,
-        db_session=get_db_session,
-        repo=event_repository
+        log=event_log,
     )
 
     # Service
     worker_service = providers.Factory(
         WorkerService,
         step_definition_query= query,
-        measurement_command= measurement_command,
+        measurement_queue= measurement_queue,
         measurement_query= device_query,
         alarm_def_query= alarm_def_query,
         alarm_command= alarm_command,
+        alarm_states= alarm_states,
+        notifier= notification_dispatcher,
         event_command=event_command,
-        device_api_service=measurement_api_service
+        device_api_service=measurement_api_service,
+        alarm_window_size=settings.ALARM_WINDOW_SIZE,
     )
 
     # Worker Flow Status
@@ -1,6 +1,9 @@
 from queue import Queue
+from typing import List
+from shared_kernel.infra.database.orm import event_cursor_table
 from shared_kernel.infra.database.repository import RDBRepository
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from worker.domain.model.aggregate import Event, StepDefinition, WorkerFlowStatus
@@ -11,6 +14,27 @@ class EventRepository(RDBRepository):
     @staticmethod
     def get_first(session: Session):
         return session.query(Event).first()
+
+    @staticmethod
+    def find_after(session: Session, after_id: int, limit: int) -> List[Event]:
+        return session.query(Event).filter(Event.id > after_id).order_by(Event.id).limit(limit).all()
+
+    @staticmethod
+    def find_last(session: Session, limit: int) -> List[Event]:
+        return session.query(Event).order_by(Event.id.desc()).limit(limit).all()
+
+    @staticmethod
+    def get_acknowledged_id(session: Session) -> int:
+        return session.execute(select(event_cursor_table.c.acknowledged_id)).scalar() or 0
+
+    @staticmethod
+    def acknowledge(session: Session, event_id: int):
+        # Solo avanza: un DELETE tardio no devuelve eventos ya entregados
+        session.execute(
+            event_cursor_table.update()
+            .where(event_cursor_table.c.acknowledged_id < event_id)
+            .values(acknowledged_id=event_id)
+        )
     
     @staticmethod
     def add(session: Session, instance: Event):
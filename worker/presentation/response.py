@@ -1,4 +1,5 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -21,4 +22,22 @@ class StepDefinitionSchema(BaseModel):
 
 
 class StepDefinitionResponse(BaseResponse):
-    result: List[StepDefinitionSchema]
\ No newline at end of file
+    result: List[StepDefinitionSchema]
+
+
+class EventSchema(BaseModel):
+    id: int
+    title: str
+    description: str
+    measure_type: Optional[str] = None
+    alarm_type: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes=True
+
+
+class EventsResponse(BaseResponse):
+    result: List[EventSchema]
+    # Cursor para la siguiente consulta (after=last_id)
+    last_id: int
@@ -1,11 +1,12 @@
 from typing import List, Optional
 import asyncio
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from alarming.domain.model.value_object import AlarmType
+from measurement.application.ingestion_queue import MeasurementWriteError
 from measurement.domain.model.value_object import MeasureType
 from worker.application.use_cases.worker_flow_status_use_case import UpdateWorkerFlowStatusRequest, WorkerFlowStatusUpdateCommand, WorkerFlowStatusQueryUseCase
-from worker.presentation.response import StepDefinitionResponse, StepDefinitionSchema
+from worker.presentation.response import EventSchema, EventsResponse, StepDefinitionResponse, StepDefinitionSchema
 from worker.application.use_cases.event_use_case import (
     DeleteEventCommand,
     EventQueryUseCase, CreateEventCommand, CreateEventCommandRequest
@@ -118,13 +119,6 @@ async def stop(
     global worker_service, worker_task
 
     if worker_service:
-        # Cambiar el estado del worker a "detenido"
-        worker_flow_status_command.execute(
-            UpdateWorkerFlowStatusRequest(
-                position=PositionType.FIRST,
-                times_executed=1
-            )
-        )
         service.stop_measure()
 
         # Cancelar la tarea en segundo plano
@@ -135,6 +129,21 @@ async def stop(
             except asyncio.CancelledError:
                 pass
 
+        # Lo que el ciclo dejo encolado se escribe antes, para no pisar el estado "detenido"
+        try:
+            await asyncio.to_thread(service.flush_writes)
+        except MeasurementWriteError:
+            # El hilo escritor ya lo registro; el worker se detiene igual
+            pass
+
+        # Cambiar el estado del worker a "detenido"
+        worker_flow_status_command.execute(
+            UpdateWorkerFlowStatusRequest(
+                position=PositionType.FIRST,
+                times_executed=1
+            )
+        )
+
         worker_service = None
         worker_task = None
 
@@ -168,6 +177,24 @@ async def stop(
         return {"status": "Task not running yet"}
 
 
+@router.get("/events")
+@inject
+async def get_events(
+    after: Optional[int] = Query(None, description="Last event id already seen; only new events when omitted"),
+    timeout: float = Query(25, ge=0, le=60, description="Seconds to wait when there is nothing after the cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    query: EventQueryUseCase = Depends(Provide[AppContainer.worker.event_query]),
+) -> EventsResponse:
+    if after is None:
+        after = await query.get_last_id()
+    events = await query.wait_after(after_id=after, limit=limit, timeout=timeout)
+    return EventsResponse(
+        detail="ok",
+        result=[EventSchema.from_orm(e) for e in events],
+        last_id=events[-1].id if events else after
+    )
+
+
 @router.get("/ws")
 @inject
 def get_event(query: EventQueryUseCase = Depends(Provide[AppContainer.worker.event_query])):